@@ -1,4 +1,3 @@
-import base64
 import cv2
 import numpy as np
 import pyrcareworld.attributes as attr
@@ -32,14 +31,11 @@ class ActiveLightSensorAttr(attr.CameraAttr):
         :rtype: dict
         """
         super().parse_message(data)
-        if "ir_left" in self.data and "ir_right" in self.data:
-            self.data["ir_left"] = base64.b64decode(self.data["ir_left"])
-            self.data["ir_right"] = base64.b64decode(self.data["ir_right"])
-
-            image_left = np.frombuffer(self.data["ir_left"], dtype=np.uint8)
-            image_left = cv2.imdecode(image_left, cv2.IMREAD_COLOR)[..., 2]
-            image_right = np.frombuffer(self.data["ir_right"], dtype=np.uint8)
-            image_right = cv2.imdecode(image_right, cv2.IMREAD_COLOR)[..., 2]
+        self._parse_bytes(data, "ir_left")
+        self._parse_bytes(data, "ir_right")
+        if ("ir_left" in data or "ir_right" in data) and "ir_left" in self.data and "ir_right" in self.data:
+            image_left = self.get_image("ir_left", cv2.IMREAD_COLOR)[..., 2]
+            image_right = self.get_image("ir_right", cv2.IMREAD_COLOR)[..., 2]
             left_extrinsic_matrix = np.array(
                 [
                     [0.0, -1.0, 0.0, -0.0175],
@@ -1,3 +1,9 @@
+import base64
+import cv2
+import numpy as np
+from pyrcareworld.utils.delta_state import StateDelta
+
+
 class BaseAttr:
     """
     Base attribute class, which includes general functions such as
@@ -15,6 +21,7 @@ class BaseAttr:
         self.env = env
         self.id = id
         self.data = data
+        self._images = {}
 
     def parse_message(self, data: dict):
         """
@@ -33,8 +40,39 @@ class BaseAttr:
             - 'local_to_world_matrix': The transformation matrix from local to world coordinates.
             - 'result_local_point': The result of transforming the object from local to world coordinates.
             - 'result_world_point': The result of transforming the object from world to local coordinates.
+            In delta state mode, `data` may be a `StateDelta` holding only the changed keys, which is merged into self.data.
         """
-        self.data = data
+        if isinstance(data, StateDelta):
+            self.data = data.merge(self.data)
+        else:
+            self.data = data
+
+    def _parse_bytes(self, data: dict, key: str):
+        """
+        Turn a base64 string sent by players without raw sensor bytes into bytes. Raw `bytes` are kept as they are.
+
+        :param data: Dictionary containing the message data.
+        :param key: Str, the key of the payload.
+        """
+        if key in data and isinstance(self.data[key], str):
+            self.data[key] = base64.b64decode(self.data[key])
+
+    def get_image(self, key: str, flags: int = cv2.IMREAD_UNCHANGED) -> np.ndarray:
+        """
+        Decode an encoded image of self.data, e.g. `self.data["light"]` of `DigitAttr`.
+        The decoded image is cached until a new payload is received for `key`, so calling this several times per step decodes once.
+
+        :param key: Str, the key of the encoded image in self.data.
+        :param flags: Int, the `cv2.imdecode` flags, e.g. `cv2.IMREAD_COLOR` or `cv2.IMREAD_GRAYSCALE`.
+        :return: np.ndarray, the decoded image.
+        """
+        payload = self.data[key]
+        cached = self._images.get((key, flags))
+        if cached is not None and cached[0] is payload:
+            return cached[1]
+        image = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), flags)
+        self._images[(key, flags)] = (payload, image)
+        return image
 
     def _send_data(self, message: str, *args):
         """
@@ -326,8 +364,16 @@ class BaseAttr:
     def WaitDo(self):
         """
         Wait for the native IK target movement/rotation to complete.
+        With `AsyncRCareWorld`, this returns a coroutine to be awaited.
         """
+        if self.env.is_async:
+            return self._wait_do_async()
 
         self.env._step()
         while not self.data["move_done"] or not self.data["rotate_done"]:
             self.env._step()
+
+    async def _wait_do_async(self):
+        await self.env._step()
+        while not self.data["move_done"] or not self.data["rotate_done"]:
+            await self.env._step()
@@ -1,4 +1,5 @@
-import base64
+import cv2
+import numpy as np
 import pyrcareworld.attributes as attr
 
 class DigitAttr(attr.BaseAttr):
@@ -6,8 +7,8 @@ class DigitAttr(attr.BaseAttr):
     Class for simulating DIGIT tactile sensor.
     https://digit.ml/
     The data stored in self.data is a dictionary containing the following keys:
-        - 'light': Bytes of RGB light image in DIGIT.
-        - 'depth': Bytes of depth image in DIGIT.
+        - 'light': PNG bytes of the RGB light image in DIGIT.
+        - 'depth': PNG bytes of the depth image in DIGIT.
     """
 
     def parse_message(self, data: dict):
@@ -17,13 +18,27 @@ class DigitAttr(attr.BaseAttr):
         :param data: Dictionary containing the message data.
         """
         super().parse_message(data)
-        if "light" in self.data:
-            self.data["light"] = base64.b64decode(self.data["light"])
-        if "depth" in self.data:
-            self.data["depth"] = base64.b64decode(self.data["depth"])
+        self._parse_bytes(data, "light")
+        self._parse_bytes(data, "depth")
 
     def GetData(self):
         """
         Get data from DIGIT.
         """
         self._send_data("GetData")
+
+    def get_light_image(self) -> np.ndarray:
+        """
+        Get the decoded RGB light image, cached until the next `GetData` result.
+
+        :return: np.ndarray, the BGR image of shape (height, width, 3).
+        """
+        return self.get_image("light", cv2.IMREAD_COLOR)
+
+    def get_depth_image(self) -> np.ndarray:
+        """
+        Get the decoded depth image, cached until the next `GetData` result.
+
+        :return: np.ndarray, the grayscale image of shape (height, width).
+        """
+        return self.get_image("depth", cv2.IMREAD_GRAYSCALE)
@@ -1,4 +1,5 @@
-import base64
+import cv2
+import numpy as np
 import pyrcareworld.attributes as attr
 
 class GelSlimAttr(attr.BaseAttr):
@@ -6,8 +7,8 @@ class GelSlimAttr(attr.BaseAttr):
     Class for simulating GelSlim tactile sensor.
     https://arxiv.org/abs/1803.00628
     The data stored in self.data is a dictionary containing the following keys:
-    - 'light': Bytes of RGB light image in GelSlim.
-    - 'depth': Bytes of depth image in GelSlim.
+    - 'light': PNG bytes of the RGB light image in GelSlim.
+    - 'depth': PNG bytes of the depth image in GelSlim.
     """
 
     def parse_message(self, data: dict):
@@ -17,10 +18,8 @@ class GelSlimAttr(attr.BaseAttr):
         :param data: Dictionary containing the message data.
         """
         super().parse_message(data)
-        if "light" in self.data:
-            self.data["light"] = base64.b64decode(self.data["light"])
-        if "depth" in self.data:
-            self.data["depth"] = base64.b64decode(self.data["depth"])
+        self._parse_bytes(data, "light")
+        self._parse_bytes(data, "depth")
 
     def GetData(self):
         """
@@ -28,6 +27,22 @@ class GelSlimAttr(attr.BaseAttr):
         """
         self._send_data("GetData")
 
+    def get_light_image(self) -> np.ndarray:
+        """
+        Get the decoded RGB light image, cached until the next `GetData` result.
+
+        :return: np.ndarray, the BGR image of shape (height, width, 3).
+        """
+        return self.get_image("light", cv2.IMREAD_COLOR)
+
+    def get_depth_image(self) -> np.ndarray:
+        """
+        Get the decoded depth image, cached until the next `GetData` result.
+
+        :return: np.ndarray, the grayscale image of shape (height, width).
+        """
+        return self.get_image("depth", cv2.IMREAD_GRAYSCALE)
+
     def BlurGel(self, radius: int = 5, sigma: float = 2):
         """
         Blur Gel mesh. Simulate smooth deformation.
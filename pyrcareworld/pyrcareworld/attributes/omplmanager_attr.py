@@ -40,7 +40,8 @@ class OmplManagerAttr(attr.BaseAttr):
         :param data: Dictionary containing the message data.
         """
         super().parse_message(data)
-        self.is_collision = data["is_collide"]
+        if "is_collide" in data:
+            self.is_collision = data["is_collide"]
 
     def modify_robot(self, robot_id: int):
         """
@@ -133,7 +134,11 @@ class RFUOMPL:
 
         :param manager: An instance of OmplManagerAttr.
         :param time_unit: The time unit for planning.
+        :raises NotImplementedError: If the environment is an `AsyncRCareWorld`.
         """
+        # OMPL calls `is_state_valid` synchronously while it plans, so the environment cannot be stepped by awaiting.
+        if manager.env.is_async:
+            raise NotImplementedError("RFUOMPL steps the environment from OMPL callbacks, use RCareWorld instead of AsyncRCareWorld")
         self.manager = manager
         self.env = self.manager.env
         self.time_unit = time_unit
@@ -0,0 +1,66 @@
+import struct
+import time
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Compare the per-element float32 array codec with the bulk numpy codec.
+# No Unity player is needed, the communicator is only used for encoding/decoding.
+communicator = RFUniverseCommunicator(proc_type="editor")
+
+
+def legacy_write(datas: bytearray, array: np.ndarray):
+    communicator.write_string(datas, "array")
+    communicator.write_int(datas, len(array.shape))
+    for i in array.shape:
+        communicator.write_int(datas, i)
+    for i in array.reshape(-1):
+        datas.extend(struct.pack("f", float(i)))
+
+
+def legacy_read(datas: bytes) -> np.ndarray:
+    communicator.read_offset = 0
+    communicator.read_string(datas)
+    rank = communicator.read_int(datas)
+    shape = [communicator.read_int(datas) for _ in range(rank)]
+    result = np.ndarray(shape, dtype=np.float32).reshape(-1)
+    for i in range(len(result)):
+        result[i] = communicator.read_float(datas)
+    return result.reshape(shape)
+
+
+def bulk_write(datas: bytearray, array: np.ndarray):
+    communicator.write_object(datas, array)
+
+
+def bulk_read(datas: bytes) -> np.ndarray:
+    communicator.read_offset = 0
+    return communicator.read_object(datas)
+
+
+def measure(fun, *args, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fun(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+print(f"{'elements':>10} {'legacy enc':>12} {'bulk enc':>12} {'speedup':>8} {'legacy dec':>12} {'bulk dec':>12} {'speedup':>8}")
+for count in [16, 256, 4096, 65536, 1048576]:
+    array = np.random.rand(count).astype(np.float32)
+    repeat = max(1, 4096 // count)
+
+    legacy_bytes = bytearray()
+    legacy_write(legacy_bytes, array)
+    bulk_bytes = bytearray()
+    bulk_write(bulk_bytes, array)
+    assert legacy_bytes == bulk_bytes, "bulk encoding is not wire compatible"
+    assert np.array_equal(legacy_read(bytes(bulk_bytes)), bulk_read(bytes(bulk_bytes)))
+
+    legacy_enc = measure(lambda: legacy_write(bytearray(), array), repeat=repeat)
+    bulk_enc = measure(lambda: bulk_write(bytearray(), array), repeat=repeat)
+    legacy_dec = measure(legacy_read, bytes(legacy_bytes), repeat=repeat)
+    bulk_dec = measure(bulk_read, bytes(bulk_bytes), repeat=repeat)
+    print(
+        f"{count:>10} {legacy_enc * 1e3:>10.3f}ms {bulk_enc * 1e3:>10.3f}ms {legacy_enc / bulk_enc:>7.1f}x"
+        f" {legacy_dec * 1e3:>10.3f}ms {bulk_dec * 1e3:>10.3f}ms {legacy_dec / bulk_dec:>7.1f}x"
+    )
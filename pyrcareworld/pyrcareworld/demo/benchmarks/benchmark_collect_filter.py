@@ -0,0 +1,111 @@
+import time
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Compare the cost of one Collect on a 300-object scene (1 ControllerAttr and 299 RigidbodyAttr) when
+# everything is collected, when subscriptions are applied on receive (players without `collect_filter`)
+# and when the player only sends the subscribed objects and keys.
+# No Unity player is needed, the communicators are only used for encoding/decoding.
+JOINTS = 9
+OBJECTS = 300
+
+
+def floats(count: int) -> list:
+    return [float(i) for i in np.random.rand(count)]
+
+
+def base_data(name: str) -> dict:
+    return {
+        "name": name,
+        "position": floats(3),
+        "rotation": floats(3),
+        "quaternion": floats(4),
+        "local_position": floats(3),
+        "local_rotation": floats(3),
+        "local_quaternion": floats(4),
+        "local_to_world_matrix": floats(16),
+    }
+
+
+def controller_data() -> dict:
+    data = base_data("franka_panda")
+    data.update({
+        "number_of_joints": JOINTS,
+        "names": [f"panda_link{i}" for i in range(JOINTS)],
+        "positions": [floats(3) for _ in range(JOINTS)],
+        "rotations": [floats(3) for _ in range(JOINTS)],
+        "quaternion": [floats(4) for _ in range(JOINTS)],
+        "velocities": [floats(3) for _ in range(JOINTS)],
+        "number_of_moveable_joints": JOINTS - 2,
+        "joint_positions": floats(JOINTS - 2),
+        "joint_velocities": floats(JOINTS - 2),
+        "joint_accelerations": floats(JOINTS - 2),
+        "joint_force": floats(JOINTS - 2),
+        "move_done": True,
+        "rotate_done": True,
+    })
+    return data
+
+
+def rigidbody_data(i: int) -> dict:
+    data = base_data(f"object_{i}")
+    data.update({"velocity": floats(3), "angular_velocity": floats(3)})
+    return data
+
+
+def encode(communicator: RFUniverseCommunicator, *args) -> bytes:
+    datas = bytearray()
+    communicator.write_int(datas, len(args))
+    for obj in args:
+        communicator.write_object(datas, obj)
+    return bytes(datas)
+
+
+def collect(communicator: RFUniverseCommunicator, encoded: list) -> dict:
+    attrs = {}
+    for i in encoded:
+        objs = communicator.receive_object(i)
+        if len(objs) > 0:
+            attrs[objs[1]] = objs[3]
+    return attrs
+
+
+scene = [("Instance", 0, "ControllerAttr", controller_data())]
+scene += [("Instance", i, "RigidbodyAttr", rigidbody_data(i)) for i in range(1, OBJECTS)]
+subscriptions = {0: frozenset(["joint_positions"]), 1: frozenset(["position"]), 2: frozenset(["position"])}
+repeat = 20
+
+communicator = RFUniverseCommunicator(proc_type="editor")
+communicator.protocol_version = 2
+full = [encode(communicator, *frame) for frame in scene]
+player_filtered = [
+    encode(communicator, head, id, attr_type, {key: data[key] for key in subscriptions[id]})
+    for head, id, attr_type, data in scene
+    if id in subscriptions
+]
+
+expected = collect(communicator, full)
+communicator.collect_filter = subscriptions
+# The first frame of every object is decoded whole, so that new objects get their data.
+collect(communicator, full)
+filtered = collect(communicator, full)
+assert list(filtered) == list(subscriptions)
+for id, data in filtered.items():
+    assert data == {key: expected[id][key] for key in subscriptions[id]}
+assert collect(communicator, player_filtered) == filtered
+
+results = {}
+for name, encoded, collect_filter in [
+    ("full collect", full, None),
+    ("filter on receive", full, subscriptions),
+    ("filter in player", player_filtered, subscriptions),
+]:
+    communicator.collect_filter = collect_filter
+    start = time.perf_counter()
+    for _ in range(repeat):
+        collect(communicator, encoded)
+    results[name] = (sum(len(i) for i in encoded), (time.perf_counter() - start) / repeat)
+
+print(f"{'mode':>18} {'bytes/step':>11} {'decode/step':>12} {'speedup':>8}")
+for name, (size, decode_time) in results.items():
+    print(f"{name:>18} {size:>11} {decode_time * 1e3:>10.2f}ms {results['full collect'][1] / decode_time:>7.1f}x")
@@ -0,0 +1,82 @@
+import socket
+import cv2
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator, available_compressions
+
+# Measure compression ratio and CPU time of frame compression on large payloads, and estimate the time to
+# move one frame over a network link with and without compression. Frames go through a local TCP
+# connection so that the compressed framing is checked end to end. No Unity player is needed.
+WIDTH = 1280
+HEIGHT = 720
+REPEAT = 5
+LINKS = {"100 Mbit/s": 100e6 / 8, "1 Gbit/s": 1e9 / 8, "10 Gbit/s": 10e9 / 8}
+
+
+def encode(communicator: RFUniverseCommunicator, *args) -> bytes:
+    datas = bytearray()
+    communicator.write_int(datas, len(args))
+    for obj in args:
+        communicator.write_object(datas, obj)
+    return bytes(datas)
+
+
+def payloads() -> dict:
+    y, x = np.mgrid[0:HEIGHT, 0:WIDTH]
+    image = np.stack([x * 255 // WIDTH, y * 255 // HEIGHT, (x + y) % 256], axis=-1).astype(np.uint8)
+    image = cv2.add(image, np.random.randint(0, 8, image.shape, dtype=np.uint8))
+    depth = (1.0 + 0.001 * x + 0.002 * y).astype(np.float32)
+    particles = np.random.rand(200000, 3).astype(np.float32)
+    grasps = [[float(i) for i in np.round(np.random.rand(7), 3)] + [bool(np.random.rand() > 0.5)] for _ in range(20000)]
+    return {
+        "png": ("CameraAttr", {"rgb": cv2.imencode(".png", image)[1].tobytes()}),
+        "depth exr": ("CameraAttr", {"depth_exr": depth.tobytes()}),
+        "particles": ("ClothAttr", {"particles": particles}),
+        "grasp results": ("GraspSimAttr", {"points": grasps}),
+    }
+
+
+def tcp_pair() -> tuple:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("localhost", 0))
+    server.listen(1)
+    client = socket.create_connection(server.getsockname())
+    accepted, _ = server.accept()
+    server.close()
+    return client, accepted
+
+
+def connect(communicator: RFUniverseCommunicator, sock: socket.socket) -> RFUniverseCommunicator:
+    communicator.client = sock
+    communicator.connected = True
+    return communicator
+
+
+frames = {name: encode(RFUniverseCommunicator(proc_type="editor"), "Instance", 1, attr_type, data) for name, (attr_type, data) in payloads().items()}
+print(f"codecs: {', '.join(available_compressions())}")
+print(f"{'payload':>14} {'codec':>6} {'MB':>7} {'ratio':>6} {'compress':>9} {'decompress':>11}  " + " ".join(f"{i:>16}" for i in LINKS))
+for name, frame in frames.items():
+    for codec in [None] + available_compressions():
+        sender_sock, receiver_sock = tcp_pair()
+        sender = connect(RFUniverseCommunicator(proc_type="editor", compression=codec, compression_threshold=64 * 1024), sender_sock)
+        receiver = connect(RFUniverseCommunicator(proc_type="editor", zero_copy=True), receiver_sock)
+        for _ in range(REPEAT):
+            sender.send_bytes(frame)
+            data = receiver.receive_bytes()
+            assert bytes(data) == frame
+            receiver._release_bytes(data)
+        sender_sock.close()
+        receiver_sock.close()
+
+        if codec is None:
+            wire_size, compress_time, decompress_time = len(frame), 0.0, 0.0
+        else:
+            stats = sender.compression_stats
+            wire_size = (stats["compressed_bytes_sent"] / REPEAT) if stats["frames_compressed"] > 0 else len(frame)
+            compress_time = stats["compress_time"] / REPEAT
+            decompress_time = receiver.compression_stats["decompress_time"] / REPEAT
+        ratio = len(frame) / wire_size
+        link_times = [f"{(wire_size / bandwidth + compress_time + decompress_time) * 1e3:>14.1f}ms" for bandwidth in LINKS.values()]
+        print(
+            f"{name:>14} {codec or 'none':>6} {len(frame) / 1e6:>7.2f} {ratio:>6.2f} "
+            f"{compress_time * 1e3:>7.1f}ms {decompress_time * 1e3:>9.1f}ms  " + " ".join(link_times)
+        )
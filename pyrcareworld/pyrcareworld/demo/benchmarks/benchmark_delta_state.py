@@ -0,0 +1,125 @@
+import time
+import numpy as np
+from pyrcareworld.attributes import BaseAttr
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+from pyrcareworld.utils.delta_state import DeltaStateEncoder, StateDelta
+
+# Compare bytes per step and decode time of full state and delta state updates on a scene with
+# 4 moving robots (ControllerAttr) and 40 rigid bodies, 10 of which are moving.
+# The player side is stood in for by DeltaStateEncoder, and every step the merged `attr.data` is checked
+# against the full state. No Unity player is needed.
+JOINTS = 9
+ROBOTS = 4
+OBJECTS = 40
+MOVING_OBJECTS = 10
+STEPS = 200
+KEYFRAME_INTERVAL = 50
+
+
+def floats(count: int) -> list:
+    return [float(i) for i in np.random.rand(count)]
+
+
+def robot_data(i: int) -> dict:
+    return {
+        "name": f"robot_{i}",
+        "position": floats(3),
+        "rotation": floats(3),
+        "quaternion": floats(4),
+        "local_to_world_matrix": floats(16),
+        "number_of_joints": JOINTS,
+        "names": [f"link{j}" for j in range(JOINTS)],
+        "types": ["revolute"] * JOINTS,
+        "positions": [floats(3) for _ in range(JOINTS)],
+        "rotations": [floats(3) for _ in range(JOINTS)],
+        "velocities": [floats(3) for _ in range(JOINTS)],
+        "number_of_moveable_joints": JOINTS - 2,
+        "joint_positions": floats(JOINTS - 2),
+        "joint_velocities": floats(JOINTS - 2),
+        "joint_lower_limit": floats(JOINTS - 2),
+        "joint_upper_limit": floats(JOINTS - 2),
+        "joint_stiffness": floats(JOINTS - 2),
+        "joint_damping": floats(JOINTS - 2),
+        "move_done": True,
+        "rotate_done": True,
+    }
+
+
+def object_data(i: int) -> dict:
+    return {
+        "name": f"object_{i}",
+        "position": floats(3),
+        "rotation": floats(3),
+        "quaternion": floats(4),
+        "local_to_world_matrix": floats(16),
+        "velocity": floats(3),
+        "angular_velocity": floats(3),
+    }
+
+
+def advance(scene: dict) -> None:
+    for id, (attr_type, data) in scene.items():
+        if attr_type == "ControllerAttr":
+            for key in ["positions", "rotations", "velocities"]:
+                data[key] = [floats(3) for _ in range(JOINTS)]
+            for key in ["joint_positions", "joint_velocities"]:
+                data[key] = floats(JOINTS - 2)
+        elif id < ROBOTS + MOVING_OBJECTS:
+            for key in ["position", "rotation", "velocity", "angular_velocity"]:
+                data[key] = floats(3)
+            data["quaternion"] = floats(4)
+            data["local_to_world_matrix"] = floats(16)
+
+
+def encode(communicator: RFUniverseCommunicator, *args) -> bytes:
+    datas = bytearray()
+    communicator.write_int(datas, len(args))
+    for obj in args:
+        communicator.write_object(datas, obj)
+    return bytes(datas)
+
+
+def receive(communicator: RFUniverseCommunicator, attrs: dict, frame: bytes) -> None:
+    objs = communicator.receive_object(frame)
+    data = objs[3] if len(objs) == 4 else StateDelta(objs[3], objs[4])
+    attrs[objs[1]].parse_message(data)
+
+
+np.random.seed(0)
+scene = {i: ("ControllerAttr", robot_data(i)) for i in range(ROBOTS)}
+scene.update({i: ("RigidbodyAttr", object_data(i)) for i in range(ROBOTS, ROBOTS + OBJECTS)})
+communicator = RFUniverseCommunicator(proc_type="editor")
+communicator.protocol_version = 2
+
+steps = {"full": [], "delta": []}
+encoder = DeltaStateEncoder(KEYFRAME_INTERVAL)
+for _ in range(STEPS):
+    advance(scene)
+    steps["full"].append([encode(communicator, "Instance", id, attr_type, dict(data)) for id, (attr_type, data) in scene.items()])
+    steps["delta"].append([encode(communicator, "Instance", *encoder.encode(id, attr_type, dict(data))) for id, (attr_type, data) in scene.items()])
+    encoder.end_step()
+
+full_attrs = {id: BaseAttr(None, id) for id in scene}
+delta_attrs = {id: BaseAttr(None, id) for id in scene}
+for full_frames, delta_frames in zip(steps["full"], steps["delta"]):
+    for frame in full_frames:
+        receive(communicator, full_attrs, frame)
+    for frame in delta_frames:
+        receive(communicator, delta_attrs, frame)
+    for id in scene:
+        assert delta_attrs[id].data == full_attrs[id].data
+
+results = {}
+for mode, frames_per_step in steps.items():
+    attrs = {id: BaseAttr(None, id) for id in scene}
+    start = time.perf_counter()
+    for frames in frames_per_step:
+        for frame in frames:
+            receive(communicator, attrs, frame)
+    decode_time = (time.perf_counter() - start) / STEPS
+    results[mode] = (sum(len(i) for frames in frames_per_step for i in frames) / STEPS, decode_time)
+
+print(f"{'mode':>6} {'bytes/step':>11} {'decode/step':>12}")
+for mode, (size, decode_time) in results.items():
+    print(f"{mode:>6} {size:>11.0f} {decode_time * 1e3:>10.2f}ms")
+print(f"delta/full: bytes {results['delta'][0] / results['full'][0]:.2f}, decode {results['delta'][1] / results['full'][1]:.2f}")
@@ -0,0 +1,36 @@
+import time
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Simulated steps per second of env.step(K) with one round trip per step and with fast_forward=True,
+# which runs the K physics steps in one round trip, against MockUnityPlayer with 4 robots.
+# MockUnityPlayer does no physics, so this measures the round trips saved; with Unity the physics time of
+# every substep is still spent.
+SECONDS = 3
+COUNTS = [1, 10, 100]
+
+
+def measure(port: int, count: int, fast_forward: bool) -> float:
+    player = MockUnityPlayer(port=port, controllers=4)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port)
+    env.step()
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        env.step(count, fast_forward=fast_forward)
+        steps += count
+    elapsed = time.perf_counter() - start
+    env.close()
+    player.join(10)
+    return steps / elapsed
+
+
+if __name__ == "__main__":
+    port = 5900
+    print(f"{'K':>5} {'loop steps/s':>13} {'fast forward steps/s':>21} {'speedup':>8}")
+    for count in COUNTS:
+        loop = measure(port, count, False)
+        fast = measure(port + 1, count, True)
+        port += 2
+        print(f"{count:>5} {loop:>13.0f} {fast:>21.0f} {fast / loop:>7.1f}x")
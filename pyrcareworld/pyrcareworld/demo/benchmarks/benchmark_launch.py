@@ -0,0 +1,82 @@
+import os
+import socket
+import stat
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.locker import Locker
+
+# Time to allocate ports for, and to launch, N environments in release mode on one node.
+# The previous allocator probed ports under a file lock shared by every process, which sleeps 0.1s on release,
+# and closed the probe socket before listening again later. It is reproduced below for comparison.
+# Launching runs a fake player executable that starts MockUnityPlayer on the port passed with -port:.
+ALLOCATIONS = 64
+LAUNCHES = [1, 8, 16]
+PLAYER = """#!{python}
+import sys
+sys.path.insert(0, {path!r})
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+port = int([arg for arg in sys.argv if arg.startswith("-port:")][0][6:])
+MockUnityPlayer(port=port).run()
+"""
+
+
+def locked_probe_port(port: int) -> int:
+    with Locker("port"):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        while port < 65536:
+            try:
+                server.bind(("localhost", port))
+                server.close()
+                return port
+            except OSError:
+                port += 256
+        raise OSError("No available port")
+
+
+def ephemeral_port() -> socket.socket:
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("localhost", 0))
+    server.listen(1)
+    return server
+
+
+def allocate(allocator, count: int) -> tuple:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(count) as pool:
+        results = list(pool.map(allocator, range(count)))
+    elapsed = time.perf_counter() - start
+    return elapsed, results
+
+
+def launch(executable: str, count: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(count) as pool:
+        envs = list(pool.map(lambda i: RCareWorld(executable_file=executable, proc_id=i), range(count)))
+    elapsed = time.perf_counter() - start
+    for env in envs:
+        env.close()
+    return elapsed
+
+
+if __name__ == "__main__":
+    elapsed, ports = allocate(lambda i: locked_probe_port(5004 + 1 + i), ALLOCATIONS)
+    print(f"locked probe: {ALLOCATIONS} ports in {elapsed * 1e3:.0f}ms, {ALLOCATIONS - len(set(ports))} duplicates")
+    # Two launchers using the same proc_id, e.g. two training scripts, probe the same ports.
+    elapsed, ports = allocate(lambda i: locked_probe_port(5004 + 1 + i % (ALLOCATIONS // 2)), ALLOCATIONS)
+    print(f"locked probe, 2 launchers: {ALLOCATIONS} ports in {elapsed * 1e3:.0f}ms, {ALLOCATIONS - len(set(ports))} duplicates")
+    elapsed, servers = allocate(lambda i: ephemeral_port(), ALLOCATIONS)
+    ports = [server.getsockname()[1] for server in servers]
+    print(f"ephemeral: {ALLOCATIONS} ports in {elapsed * 1e3:.1f}ms, {ALLOCATIONS - len(set(ports))} duplicates")
+    for server in servers:
+        server.close()
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    executable = os.path.join(tempfile.mkdtemp(), "mock_player")
+    with open(executable, "w") as f:
+        f.write(PLAYER.format(python=sys.executable, path=root))
+    os.chmod(executable, os.stat(executable).st_mode | stat.S_IEXEC)
+    for count in LAUNCHES:
+        print(f"launch {count} envs: {launch(executable, count):.2f}s")
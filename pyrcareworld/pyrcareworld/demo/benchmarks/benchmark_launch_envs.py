@@ -0,0 +1,66 @@
+import os
+import stat
+import sys
+import tempfile
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.envs.launcher import launch_envs
+
+# Time to bring up N environments one after another and with launch_envs, against a fake player executable
+# that waits BOOT seconds, like a Unity player loading, then runs MockUnityPlayer on the port passed with -port:.
+# Also shows that a player exiting before it connects only fails its own future.
+BOOT = 1.0
+COUNTS = [4, 16]
+PLAYER = """#!{python}
+import sys
+import time
+sys.path.insert(0, {path!r})
+time.sleep({boot})
+if {fail}:
+    sys.exit(3)
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+port = int([arg for arg in sys.argv if arg.startswith("-port:")][0][6:])
+MockUnityPlayer(port=port).run()
+"""
+
+
+def write_player(directory: str, name: str, fail: bool) -> str:
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(PLAYER.format(python=sys.executable, path=root, boot=BOOT, fail=fail))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def print_timings(envs: list) -> None:
+    for phase in envs[0].launch_timings:
+        values = [env.launch_timings[phase] for env in envs]
+        print(f"    {phase:>14}: mean {np.mean(values) * 1e3:8.1f}ms, max {np.max(values) * 1e3:8.1f}ms")
+
+
+if __name__ == "__main__":
+    directory = tempfile.mkdtemp()
+    player = write_player(directory, "mock_player", False)
+    for count in COUNTS:
+        start = time.perf_counter()
+        envs = [RCareWorld(executable_file=player, proc_id=i) for i in range(count)]
+        serial = time.perf_counter() - start
+        for env in envs:
+            env.close()
+        start = time.perf_counter()
+        envs = [future.result() for future in launch_envs(count, executable_file=player)]
+        concurrent = time.perf_counter() - start
+        print(f"{count} envs: one after another {serial:.2f}s, launch_envs {concurrent:.2f}s")
+        print_timings(envs)
+        for env in envs:
+            env.close()
+
+    failing = write_player(directory, "failing_player", True)
+    futures = launch_envs(2, executable_file=player) + launch_envs(2, executable_file=failing)
+    for i, future in enumerate(futures):
+        error = future.exception()
+        print(f"env {i}: {'ready' if error is None else f'{type(error).__name__}: {error}'}")
+        if error is None:
+            future.result().close()
@@ -0,0 +1,100 @@
+import time
+import pickle
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Compare eager and lazy decoding of Instance frames shaped like ControllerAttr data,
+# when every value is read and when only "joint_positions" is read.
+# No Unity player is needed, the communicators are only used for encoding/decoding.
+JOINTS = 9
+
+
+def vectors(count: int, size: int = 3) -> list:
+    return [[float(j) for j in np.random.rand(size)] for _ in range(count)]
+
+
+def controller_data() -> dict:
+    return {
+        "name": "franka_panda",
+        "position": [float(i) for i in np.random.rand(3)],
+        "rotation": [float(i) for i in np.random.rand(3)],
+        "quaternion": [float(i) for i in np.random.rand(4)],
+        "local_position": [float(i) for i in np.random.rand(3)],
+        "local_rotation": [float(i) for i in np.random.rand(3)],
+        "local_quaternion": [float(i) for i in np.random.rand(4)],
+        "local_to_world_matrix": [float(i) for i in np.random.rand(16)],
+        "number_of_joints": JOINTS,
+        "names": [f"panda_link{i}" for i in range(JOINTS)],
+        "types": ["revolute"] * JOINTS,
+        "positions": vectors(JOINTS),
+        "rotations": vectors(JOINTS),
+        "local_positions": vectors(JOINTS),
+        "local_rotations": vectors(JOINTS),
+        "local_quaternion": vectors(JOINTS, 4),
+        "velocities": vectors(JOINTS),
+        "angular_velocities": vectors(JOINTS),
+        "number_of_moveable_joints": JOINTS - 2,
+        "joint_positions": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_velocities": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_accelerations": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_force": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_lower_limit": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_upper_limit": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "move_done": True,
+        "rotate_done": True,
+    }
+
+
+def encode(communicator: RFUniverseCommunicator, *args) -> bytes:
+    datas = bytearray()
+    communicator.write_int(datas, len(args))
+    for obj in args:
+        communicator.write_object(datas, obj)
+    return bytes(datas)
+
+
+def same(a, b) -> bool:
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(same(a[key], b[key]) for key in a)
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    return type(a) == type(b) and a == b
+
+
+frames = [("Instance", 100000 + i, "ControllerAttr", controller_data()) for i in range(200)]
+frames.append(("Instance", 0, "CameraAttr", {"rgb": b"\x01" * 1024, "depth": np.random.rand(4, 8).astype(np.float32), "id_map": None}))
+repeat = 10
+results = {}
+for version in [1, 2]:
+    eager = RFUniverseCommunicator(proc_type="editor")
+    lazy = RFUniverseCommunicator(proc_type="editor", lazy_decode=True)
+    eager.protocol_version = lazy.protocol_version = version
+    encoded = [encode(eager, *frame) for frame in frames]
+
+    for i in encoded:
+        expected = eager.receive_object(i)[3]
+        for check in [
+            lambda data: same(data, expected),
+            lambda data: same(dict(data), expected),
+            lambda data: same({**data}, expected),
+            lambda data: same(pickle.loads(pickle.dumps(data)), expected),
+            lambda data: same(dict(data.items()), expected),
+            lambda data: all(same(data.get(key), expected[key]) for key in reversed(expected)),
+        ]:
+            data = lazy.receive_object(i)[3]
+            assert list(data) == list(expected)
+            assert check(data)
+
+    for name, read in [("all", lambda data: list(data.values())), ("one key", lambda data: data.get("joint_positions"))]:
+        for mode, communicator in [("eager", eager), ("lazy", lazy)]:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for i in encoded:
+                    read(communicator.receive_object(i)[3])
+            results[(version, name, mode)] = (time.perf_counter() - start) / repeat / len(encoded)
+
+print(f"{'version':>8} {'read':>8} {'eager':>10} {'lazy':>10} {'speedup':>8}")
+for version in [1, 2]:
+    for name in ["all", "one key"]:
+        eager_time, lazy_time = results[(version, name, "eager")], results[(version, name, "lazy")]
+        print(f"{version:>8} {name:>8} {eager_time * 1e6:>8.1f}us {lazy_time * 1e6:>8.1f}us {eager_time / lazy_time:>7.2f}x")
@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Throughput and latency of RCareWorld.step against MockUnityPlayer, a pure-Python stand-in for the
+# Unity player, on a few synthetic scenes and with a few RCareWorld options.
+# No Unity player is needed, so this also runs on CI machines.
+STEPS = 300
+SCENES = {
+    "1 robot": dict(controllers=1),
+    "16 robots": dict(controllers=16),
+    "2 cameras 640x480": dict(controllers=1, cameras=2),
+    "cloth 20k particles": dict(controllers=1, cloths=1, particles=20000),
+}
+OPTIONS = {
+    "default": dict(),
+    "unix+batch": dict(transport="unix", batch_send=True),
+    "zero copy+lazy": dict(zero_copy=True, lazy_decode=True),
+    "pipelined": dict(pipelined=True),
+}
+
+
+def measure(port: int, scene: dict, options: dict) -> tuple:
+    player = MockUnityPlayer(port=port, transport=options.get("transport", "tcp"), **scene)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port, **options)
+    env.step()
+    latencies = []
+    for _ in range(STEPS):
+        start = time.perf_counter()
+        env.step()
+        latencies.append(time.perf_counter() - start)
+    env.close()
+    player.join(10)
+    latencies = np.array(latencies)
+    return 1 / latencies.mean(), np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+if __name__ == "__main__":
+    results = []
+    port = 5400
+    for scene_name, scene in SCENES.items():
+        for option_name, options in OPTIONS.items():
+            results.append((scene_name, option_name, *measure(port, scene, options)))
+            port += 1
+    print(f"{'scene':>20} {'options':>15} {'steps/s':>9} {'p50':>9} {'p99':>9}")
+    for scene_name, option_name, steps, p50, p99 in results:
+        print(f"{scene_name:>20} {option_name:>15} {steps:>9.0f} {p50 * 1e3:>7.2f}ms {p99 * 1e3:>7.2f}ms")
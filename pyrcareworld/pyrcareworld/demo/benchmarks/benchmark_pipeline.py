@@ -0,0 +1,80 @@
+import multiprocessing as mp
+import socket
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Compare lockstep and pipelined stepping throughput.
+# A stand-in player process simulates for SIMULATE_TIME per step and answers with Instance frames for
+# ROBOTS controllers, while Python spends POLICY_TIME per step computing an action.
+ROBOTS = 20
+JOINTS = 7
+SIMULATE_TIME = 0.004
+POLICY_TIME = 0.002
+STEPS = 300
+
+
+def stand_in_player(port: int):
+    while True:
+        try:
+            client = socket.create_connection(("localhost", port))
+            break
+        except ConnectionRefusedError:
+            time.sleep(0.01)
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    player = RFUniverseCommunicator(proc_type="editor")
+    player.client = client
+    player.connected = True
+    player.send_object("StepEnd")
+    step = 0
+    try:
+        while True:
+            objs = player.receive_object(player.receive_bytes())
+            if objs[0] != "StepStart":
+                continue
+            if step == 0:
+                player.send_object("Env", {"scene_init": True})
+            time.sleep(SIMULATE_TIME)
+            for i in range(ROBOTS):
+                player.send_object("Instance", i, "ControllerAttr", {
+                    "positions": [[float(j) for j in np.random.rand(3)] for _ in range(JOINTS + 2)],
+                    "joint_positions": [float(j) for j in np.random.rand(JOINTS)],
+                    "joint_velocities": [float(j) for j in np.random.rand(JOINTS)],
+                    "step": step,
+                })
+            player.send_object("StepEnd")
+            step += 1
+    except (AssertionError, OSError):
+        client.close()
+
+
+def policy(env: RCareWorld):
+    time.sleep(POLICY_TIME)
+    for i in range(ROBOTS):
+        if i in env.attrs:
+            env.attrs[i].SetJointPosition(env.attrs[i].data["joint_positions"])
+
+
+def measure(pipelined: bool, port: int) -> float:
+    player = mp.Process(target=stand_in_player, args=(port,), daemon=True)
+    player.start()
+    env = RCareWorld(port=port, pipelined=pipelined)
+    env.step()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        policy(env)
+        env.step()
+    elapsed = time.perf_counter() - start
+    env.close()
+    player.join()
+    return STEPS / elapsed
+
+
+if __name__ == "__main__":
+    lockstep = measure(False, 5400)
+    pipelined = measure(True, 5401)
+    print(f"{'mode':>10} {'steps/s':>10}")
+    print(f"{'lockstep':>10} {lockstep:>10.1f}")
+    print(f"{'pipelined':>10} {pipelined:>10.1f}")
+    print(f"speedup {pipelined / lockstep:.2f}x")
@@ -0,0 +1,122 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.envs.pool import RCareWorldPool
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Steps per second of N environments against MockUnityPlayer, each stepped and gathered into one array:
+# one after another, on a thread per environment, with RCareWorldPool with and without its threads, and with SubprocVecEnv (a process per
+# environment) if stable_baselines3 and gym are installed. Each player takes STEP_TIME to answer a step, like
+# Unity simulating it, so that the environments can overlap their waits.
+COUNTS = [8, 32, 64]
+STEP_TIME = 0.005
+SECONDS = 3
+ROBOT = 1000
+
+try:
+    import gym
+    from pyrcareworld.utils.proc_wrapper import SubprocVecEnv
+except ImportError:
+    SubprocVecEnv = None
+
+
+class VecTask(RCareWorld):
+    # The minimal gym-style interface SubprocVecEnv expects from the environment of each process.
+
+    def __init__(self, port: int, proc_id: int = 0):
+        super().__init__(executable_file="@editor", port=port + proc_id)
+        self.step()
+        joints = len(self.attrs[ROBOT].data["joint_positions"])
+        self.observation_space = gym.spaces.Box(-np.inf, np.inf, (joints,), np.float32)
+        self.action_space = gym.spaces.Box(-1, 1, (1,), np.float32)
+
+    def step(self, action=None, *args, **kwargs):
+        if action is None or len(args) > 0 or len(kwargs) > 0:
+            return super().step(*([] if action is None else [action]), *args, **kwargs)
+        super().step()
+        observation = np.asarray(self.attrs[ROBOT].data["joint_positions"], dtype=np.float32)[None]
+        return observation, np.zeros(1), np.zeros(1, dtype=bool), np.array([{}])
+
+    def reset(self):
+        return np.asarray(self.attrs[ROBOT].data["joint_positions"], dtype=np.float32)[None]
+
+
+def start_players(port: int, count: int) -> list:
+    players = [MockUnityPlayer(port=port + i, controllers=1, step_time=STEP_TIME) for i in range(count)]
+    for player in players:
+        player.start()
+    return players
+
+
+def rate(step) -> float:
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        step()
+        steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def measure_in_process(port: int, count: int) -> dict:
+    players = start_players(port, count)
+    envs = [RCareWorld(executable_file="@editor", port=port + i) for i in range(count)]
+    pool = RCareWorldPool(envs)
+    unthreaded_pool = RCareWorldPool(envs, threads=0)
+    pool.step()
+    executor = ThreadPoolExecutor(count)
+
+    def serial():
+        for env in envs:
+            env.step()
+        pool.gather(ROBOT, "joint_positions")
+
+    def threads():
+        list(executor.map(lambda env: env.step(), envs))
+        pool.gather(ROBOT, "joint_positions")
+
+    def pooled():
+        pool.step()
+        pool.gather(ROBOT, "joint_positions")
+
+    def unthreaded():
+        unthreaded_pool.step()
+        unthreaded_pool.gather(ROBOT, "joint_positions")
+
+    results = {
+        "one after another": rate(serial),
+        "thread per env": rate(threads),
+        "RCareWorldPool": rate(pooled),
+        "threads=0": rate(unthreaded),
+    }
+    executor.shutdown()
+    pool.close()
+    for player in players:
+        player.join(10)
+    return results
+
+
+def measure_subprocess(port: int, count: int) -> float:
+    players = start_players(port, count)
+    vec_env = SubprocVecEnv([partial(VecTask, port)] * count, start_method="fork", n_agents=1)
+    vec_env.reset()
+    actions = np.zeros((count, 1), dtype=np.float32)
+    result = rate(lambda: vec_env.step(actions))
+    vec_env.close()
+    for player in players:
+        player.join(10)
+    return result
+
+
+if __name__ == "__main__":
+    port = 6000
+    print(f"{'envs':>5} {'method':>18} {'steps/s':>9} {'env steps/s':>12}")
+    for count in COUNTS:
+        results = measure_in_process(port, count)
+        port += count
+        if SubprocVecEnv is not None:
+            results["SubprocVecEnv"] = measure_subprocess(port, count)
+            port += count
+        for method, steps in results.items():
+            print(f"{count:>5} {method:>18} {steps:>9.1f} {steps * count:>12.0f}")
@@ -0,0 +1,83 @@
+import time
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Compare frame size and decode time of wire protocol version 1 (string type tags)
+# and version 2 (single-byte type codes) on Instance frames shaped like ControllerAttr data.
+# No Unity player is needed, the communicators are only used for encoding/decoding.
+JOINTS = 9
+
+
+def vectors(count: int, size: int = 3) -> list:
+    return [[float(j) for j in np.random.rand(size)] for _ in range(count)]
+
+
+def controller_data() -> dict:
+    return {
+        "name": "franka_panda",
+        "position": [float(i) for i in np.random.rand(3)],
+        "rotation": [float(i) for i in np.random.rand(3)],
+        "quaternion": [float(i) for i in np.random.rand(4)],
+        "local_position": [float(i) for i in np.random.rand(3)],
+        "local_rotation": [float(i) for i in np.random.rand(3)],
+        "local_quaternion": [float(i) for i in np.random.rand(4)],
+        "local_to_world_matrix": [float(i) for i in np.random.rand(16)],
+        "number_of_joints": JOINTS,
+        "names": [f"panda_link{i}" for i in range(JOINTS)],
+        "types": ["revolute"] * JOINTS,
+        "positions": vectors(JOINTS),
+        "rotations": vectors(JOINTS),
+        "local_positions": vectors(JOINTS),
+        "local_rotations": vectors(JOINTS),
+        "local_quaternion": vectors(JOINTS, 4),
+        "velocities": vectors(JOINTS),
+        "angular_velocities": vectors(JOINTS),
+        "number_of_moveable_joints": JOINTS - 2,
+        "joint_positions": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_velocities": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_accelerations": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_force": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_lower_limit": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "joint_upper_limit": [float(i) for i in np.random.rand(JOINTS - 2)],
+        "move_done": True,
+        "rotate_done": True,
+    }
+
+
+def encode(communicator: RFUniverseCommunicator, *args) -> bytes:
+    datas = bytearray()
+    communicator.write_int(datas, len(args))
+    for obj in args:
+        communicator.write_object(datas, obj)
+    return bytes(datas)
+
+
+frames = [("Instance", 100000 + i, "ControllerAttr", controller_data()) for i in range(200)]
+repeat = 10
+results = {}
+for version in [1, 2]:
+    communicator = RFUniverseCommunicator(proc_type="editor")
+    communicator.protocol_version = version
+    encoded = [encode(communicator, *frame) for frame in frames]
+    decoded = [communicator.receive_object(i) for i in encoded]
+    assert np.allclose([i[3]["joint_positions"] for i in decoded], [i[3]["joint_positions"] for i in frames])
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            encode(communicator, *frame)
+    encode_time = (time.perf_counter() - start) / repeat / len(frames)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for i in encoded:
+            communicator.receive_object(i)
+    decode_time = (time.perf_counter() - start) / repeat / len(frames)
+    results[version] = (sum(len(i) for i in encoded) / len(frames), encode_time, decode_time)
+
+print(f"{'version':>8} {'bytes/frame':>12} {'encode':>10} {'decode':>10}")
+for version, (size, encode_time, decode_time) in results.items():
+    print(f"{version:>8} {size:>12.0f} {encode_time * 1e6:>8.1f}us {decode_time * 1e6:>8.1f}us")
+print(
+    f"v2/v1: size {results[2][0] / results[1][0]:.2f}, "
+    f"encode {results[2][1] / results[1][1]:.2f}, decode {results[2][2] / results[1][2]:.2f}"
+)
@@ -0,0 +1,48 @@
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Step latency with and without RCareWorld(reader_thread=True) against MockUnityPlayer.
+# The reader thread pays off when frames are large, so that reading the next frame overlaps with decoding the
+# previous one, and when they are compressed, since decompression then also runs on the reader thread.
+STEPS = 200
+SCENES = {
+    "16 robots": dict(controllers=16),
+    "4 cameras 640x480": dict(controllers=1, cameras=4),
+    "cloth 50k particles x2": dict(controllers=1, cloths=2, particles=50000),
+}
+OPTIONS = {
+    "default": dict(),
+    "reader thread": dict(reader_thread=True),
+    "lz4": dict(compression="lz4", compression_threshold=1024),
+    "lz4+reader thread": dict(compression="lz4", compression_threshold=1024, reader_thread=True),
+}
+
+
+def measure(port: int, scene: dict, options: dict) -> tuple:
+    player = MockUnityPlayer(port=port, **scene)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port, **options)
+    env.step()
+    latencies = []
+    for _ in range(STEPS):
+        start = time.perf_counter()
+        env.step()
+        latencies.append(time.perf_counter() - start)
+    env.close()
+    player.join(10)
+    latencies = np.array(latencies)
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+if __name__ == "__main__":
+    results = []
+    port = 5700
+    for scene_name, scene in SCENES.items():
+        for option_name, options in OPTIONS.items():
+            results.append((scene_name, option_name, *measure(port, scene, options)))
+            port += 1
+    print(f"{'scene':>24} {'options':>18} {'p50':>9} {'p99':>9}")
+    for scene_name, option_name, p50, p99 in results:
+        print(f"{scene_name:>24} {option_name:>18} {p50 * 1e3:>7.2f}ms {p99 * 1e3:>7.2f}ms")
@@ -0,0 +1,85 @@
+import multiprocessing as mp
+import socket
+import time
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing
+
+# Compare camera frame throughput at 1920x1080 when the image travels inline in the socket frame
+# and when it is written into a shared memory ring with only a descriptor in the socket frame.
+# A stand-in producer process plays the Unity player: it answers every StepStart with an Instance frame
+# carrying CameraAttr data, followed by StepEnd.
+WIDTH = 1920
+HEIGHT = 1080
+STEPS = 200
+
+
+def stand_in_producer(port: int, ring_name, slot_count: int, slot_size: int):
+    client = socket.create_connection(("localhost", port))
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    player = RFUniverseCommunicator(proc_type="editor")
+    player.client = client
+    player.connected = True
+    ring = None
+    if ring_name is not None:
+        ring = SharedMemoryRing(ring_name, slot_count, slot_size, create=False)
+    image = np.random.randint(0, 255, (HEIGHT, WIDTH, 3), dtype=np.uint8).tobytes()
+    player.send_object("StepEnd")
+    try:
+        while True:
+            objs = player.receive_object(player.receive_bytes())
+            if objs[0] != "StepStart":
+                continue
+            datas = bytearray()
+            player.write_int(datas, 4)
+            player.write_object(datas, "Instance")
+            player.write_object(datas, 123456)
+            player.write_object(datas, "CameraAttr")
+            player.write_type(datas, "dict")
+            player.write_int(datas, 1)
+            player.write_object(datas, "rgb")
+            if ring is None:
+                player.write_object(datas, image)
+            else:
+                ring.begin_step()
+                player.write_type(datas, "shm")
+                for i in ring.write(image):
+                    player.write_int(datas, i)
+            player.send_bytes(bytes(datas))
+            player.send_object("StepEnd")
+    except (AssertionError, OSError):
+        client.close()
+    if ring is not None:
+        ring.close()
+
+
+def measure(use_shared_memory: bool, port: int) -> float:
+    received = []
+    communicator = RFUniverseCommunicator(
+        port=port, receive_data_callback=lambda objs: received.append(objs[3]["rgb"]), proc_type="editor"
+    )
+    ring_name, slot_count, slot_size = None, 0, 0
+    if use_shared_memory:
+        ring = communicator.open_shared_memory(4, WIDTH * HEIGHT * 4)
+        ring_name, slot_count, slot_size = ring.name, ring.slot_count, ring.slot_size
+    producer = mp.Process(target=stand_in_producer, args=(port, ring_name, slot_count, slot_size), daemon=True)
+    producer.start()
+    communicator.online()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        communicator.sync_step()
+        # Touch the image the way a user would, then drop it.
+        np.frombuffer(received.pop(), dtype=np.uint8)
+    elapsed = time.perf_counter() - start
+    communicator.close()
+    producer.join()
+    return STEPS / elapsed
+
+
+if __name__ == "__main__":
+    frame_mb = WIDTH * HEIGHT * 3 / 1024 / 1024
+    inline = measure(False, 5200)
+    shm = measure(True, 5201)
+    print(f"{'path':>14} {'frames/s':>10} {'MB/s':>10}")
+    print(f"{'socket inline':>14} {inline:>10.1f} {inline * frame_mb:>10.1f}")
+    print(f"{'shared memory':>14} {shm:>10.1f} {shm * frame_mb:>10.1f}")
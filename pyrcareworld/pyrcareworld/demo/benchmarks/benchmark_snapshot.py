@@ -0,0 +1,49 @@
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Episode reset latency against MockUnityPlayer: `Restore` of a snapshot taken at the start of the episode,
+# against reloading the scene with `LoadSceneAsync`. Unity cannot run here, so the player takes LOAD_TIME to load
+# a scene, standing in for Unity loading its assets, which takes hundreds of milliseconds to seconds.
+# `Restore` does not depend on it, its cost grows with the number of objects it puts back.
+RESETS = 50
+EPISODE_STEPS = 10
+LOAD_TIME = 0.2
+SCENES = [(1, 0), (4, 16), (16, 64)]
+
+
+def measure(port: int, controllers: int, meshes: int, method: str, batch_send: bool = False) -> np.ndarray:
+    player = MockUnityPlayer(port=port, controllers=controllers, load_time=LOAD_TIME)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port, batch_send=batch_send)
+    for i in range(meshes):
+        env.LoadMesh(f"object_{i}.obj", id=10000 + i)
+    env.step()
+    handle = env.Snapshot()
+    latencies = []
+    for _ in range(RESETS):
+        env.step(EPISODE_STEPS)
+        start = time.perf_counter()
+        if method == "Restore":
+            env.Restore(handle)
+        else:
+            env.LoadSceneAsync("scene.json", auto_wait=True)
+        latencies.append(time.perf_counter() - start)
+    env.close()
+    player.join(10)
+    return np.array(latencies)
+
+
+if __name__ == "__main__":
+    port = 5700
+    print(f"{'robots':>6} {'objects':>7} {'method':>24} {'p50':>10} {'p99':>10}")
+    for controllers, meshes in SCENES:
+        for method, batch_send in [("LoadSceneAsync", False), ("Restore", False), ("Restore", True)]:
+            latencies = measure(port, controllers, meshes, method, batch_send)
+            port += 1
+            name = method + (" (batch_send)" if batch_send else "")
+            print(
+                f"{controllers:>6} {meshes:>7} {name:>24} "
+                f"{np.median(latencies) * 1e3:>8.2f}ms {np.percentile(latencies, 99) * 1e3:>8.2f}ms"
+            )
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+import time
+import timeit
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+from pyrcareworld.utils.step_stats import StepStats
+
+# Overhead of RCareWorld(stats=True) against MockUnityPlayer, and the report it gives.
+# Step latencies on a loaded machine are noisy, so the cost of counting one frame is also measured on its own.
+# The timeline of the last run is exported as Chrome trace-event JSON, to open in chrome://tracing or https://ui.perfetto.dev.
+STEPS = 1000
+SCENE = dict(controllers=4, cameras=1, image_size=(320, 240))
+OPTIONS = {
+    "disabled": dict(),
+    "stats": dict(stats=True),
+    "stats+events": dict(stats=True, stats_events=True),
+}
+
+
+def measure(port: int, options: dict) -> tuple:
+    player = MockUnityPlayer(port=port, **SCENE)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port, **options)
+    env.step()
+    if env.stats is not None:
+        env.stats.reset()
+    latencies = []
+    for _ in range(STEPS):
+        start = time.perf_counter()
+        env.step()
+        latencies.append(time.perf_counter() - start)
+    env.close()
+    player.join(10)
+    return np.array(latencies), env.stats
+
+
+def frame_cost(events: bool) -> float:
+    stats = StepStats(events=events)
+    objs = ["Instance", 1000, "ControllerAttr", {}]
+    count = 100000
+
+    def add_frame():
+        stats.add_frame(objs, 1000, time.perf_counter(), time.perf_counter(), time.perf_counter(), time.perf_counter(), False)
+    return timeit.timeit(add_frame, number=count) / count
+
+
+if __name__ == "__main__":
+    results = {}
+    port = 5500
+    for name, options in OPTIONS.items():
+        results[name] = measure(port, options)
+        port += 1
+    baseline = np.median(results["disabled"][0])
+    print(f"{'options':>15} {'steps/s':>9} {'p50':>9} {'p99':>9} {'overhead':>9}")
+    for name, (latencies, _) in results.items():
+        p50 = np.median(latencies)
+        print(
+            f"{name:>15} {1 / latencies.mean():>9.0f} {p50 * 1e3:>7.3f}ms {np.percentile(latencies, 99) * 1e3:>7.3f}ms "
+            f"{(p50 / baseline - 1) * 100:>8.1f}%"
+        )
+    print(f"cost per frame: {frame_cost(False) * 1e6:.2f}us, with events {frame_cost(True) * 1e6:.2f}us")
+    stats = results["stats+events"][1]
+    print()
+    print(stats.summary())
+    path = os.path.join(tempfile.mkdtemp(), "steps.json")
+    stats.export_chrome_trace(path)
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    print()
+    print(f"Chrome trace: {path}, {len(events)} events")
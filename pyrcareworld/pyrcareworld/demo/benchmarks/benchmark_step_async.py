@@ -0,0 +1,53 @@
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Steps per second of a control loop against MockUnityPlayer, where a policy computes each action from the last observation:
+# with `step`, the policy runs after each step, with `step_async`/`step_wait` it runs while Unity simulates the step.
+# The player takes STEP_TIME to answer a step, like Unity simulating it, and the policy takes about POLICY_TIME of CPU.
+STEPS = 300
+STEP_TIME = 0.005
+POLICY_TIMES = [0.001, 0.005, 0.01]
+ROBOT = 1000
+
+
+def policy(observation: np.ndarray, seconds: float) -> list:
+    end = time.perf_counter() + seconds
+    action = observation
+    while time.perf_counter() < end:
+        action = np.tanh(action * 0.5)
+    return action.tolist()
+
+
+def measure(port: int, policy_time: float, split: bool) -> float:
+    player = MockUnityPlayer(port=port, controllers=1, step_time=STEP_TIME)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port)
+    robot = env.attrs[ROBOT]
+    env.step()
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        observation = np.asarray(robot.data["joint_positions"])
+        if split:
+            env.step_async()
+            action = policy(observation, policy_time)
+            env.step_wait()
+        else:
+            action = policy(observation, policy_time)
+            env.step()
+        robot.SetJointPosition(action)
+    rate = STEPS / (time.perf_counter() - start)
+    env.close()
+    player.join(10)
+    return rate
+
+
+if __name__ == "__main__":
+    port = 5600
+    print(f"{'policy':>8} {'step':>9} {'async':>9} {'speedup':>8}")
+    for policy_time in POLICY_TIMES:
+        blocking = measure(port, policy_time, False)
+        split = measure(port + 1, policy_time, True)
+        port += 2
+        print(f"{policy_time * 1e3:>6.1f}ms {blocking:>9.1f} {split:>9.1f} {split / blocking:>7.2f}x")
@@ -0,0 +1,50 @@
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+# Step time of tactile rigs of DIGIT sensors (two per gripper) streaming their light and depth images on every
+# step, against MockUnityPlayer, with images sent as base64 strings (older players) and as raw bytes.
+# "decoded" also reads every image with get_light_image/get_depth_image. The budget at 60 Hz is 16.7ms per step.
+STEPS = 200
+RIGS = [2, 4, 8]
+
+
+def measure(port: int, digits: int, raw: bool, decode: bool) -> tuple:
+    player = MockUnityPlayer(port=port, controllers=0, digits=digits)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port, stats=True)
+    if not raw:
+        env._send_env_data("SetRawSensorBytes", False)
+    env.step()
+    env.stats.reset()
+    sensors = [env.attrs[4000 + i] for i in range(digits)]
+    latencies = []
+    for _ in range(STEPS):
+        start = time.perf_counter()
+        env.step()
+        if decode:
+            for sensor in sensors:
+                sensor.get_light_image()
+                sensor.get_depth_image()
+        latencies.append(time.perf_counter() - start)
+    bytes_per_step = env.stats.received["Instance"]["bytes"] / STEPS
+    env.close()
+    player.join(10)
+    return np.percentile(latencies, 50), bytes_per_step
+
+
+if __name__ == "__main__":
+    results = []
+    port = 5800
+    for digits in RIGS:
+        for raw in [False, True]:
+            for decode in [False, True]:
+                results.append((digits, raw, decode, *measure(port, digits, raw, decode)))
+                port += 1
+    print(f"{'sensors':>8} {'payload':>8} {'decoded':>8} {'p50':>9} {'KB/step':>9} {'60 Hz':>6}")
+    for digits, raw, decode, p50, size in results:
+        print(
+            f"{digits:>8} {'raw' if raw else 'base64':>8} {str(decode):>8} {p50 * 1e3:>7.2f}ms {size / 1024:>9.0f} "
+            f"{'yes' if p50 < 1 / 60 else 'no':>6}"
+        )
@@ -0,0 +1,63 @@
+import cProfile
+import os
+import pstats
+import tempfile
+import time
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+from pyrcareworld.utils.trace_replay_player import TraceReplayPlayer
+
+# Record a session against MockUnityPlayer into a frame trace, then replay the trace into a new RCareWorld
+# at full speed and profile the Python side. The data of every object after the replay is checked against
+# the data at the end of the recorded session. No Unity player is needed.
+STEPS = 300
+SCENE = dict(controllers=8, cameras=1, image_size=(320, 240), cloths=1, particles=5000)
+
+
+def run_steps(env: RCareWorld, steps: int) -> float:
+    start = time.perf_counter()
+    for _ in range(steps):
+        env.step()
+    return steps / (time.perf_counter() - start)
+
+
+def replay(path: str, port: int, recorded: dict, profiler: cProfile.Profile = None) -> float:
+    player = TraceReplayPlayer(path, port=port)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=port)
+    if profiler is not None:
+        profiler.enable()
+    rate = run_steps(env, STEPS)
+    if profiler is not None:
+        profiler.disable()
+    for id, data in recorded.items():
+        for key, value in data.items():
+            if isinstance(value, np.ndarray):
+                assert np.array_equal(env.attrs[id].data[key], value)
+            else:
+                assert env.attrs[id].data[key] == value
+    env.close()
+    player.join(10)
+    return rate
+
+
+if __name__ == "__main__":
+    path = os.path.join(tempfile.mkdtemp(), "episode.trace")
+    player = MockUnityPlayer(port=5500, **SCENE)
+    player.start()
+    env = RCareWorld(executable_file="@editor", port=5500, trace_file=path)
+    live_rate = run_steps(env, STEPS)
+    recorded = {id: dict(attr.data) for id, attr in env.attrs.items()}
+    env.close()
+    player.join(10)
+
+    steps = TraceReplayPlayer(path).count_steps()
+    replay_rate = replay(path, 5501, recorded)
+    profiler = cProfile.Profile()
+    replay(path, 5502, recorded, profiler)
+
+    print(f"trace: {os.path.getsize(path) / 1e6:.1f} MB, {steps} steps ({steps - STEPS} during setup)")
+    print(f"live against the mock player: {live_rate:.0f} steps/s, replayed: {replay_rate:.0f} steps/s")
+    print("Python side of the replay, by internal time:")
+    pstats.Stats(profiler).sort_stats("tottime").print_stats(10)
@@ -0,0 +1,63 @@
+import multiprocessing as mp
+import socket
+import time
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Compare sync_step round-trip latency over localhost TCP and a Unix domain socket.
+# A stand-in player process connects to the communicator and answers every StepStart
+# with a small Env frame followed by StepEnd, so only the transport cost is measured.
+STEPS = 5000
+
+
+def stand_in_player(transport: str, address):
+    family = socket.AF_UNIX if transport == "unix" else socket.AF_INET
+    while True:
+        try:
+            client = socket.socket(family, socket.SOCK_STREAM)
+            client.connect(address)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            client.close()
+            time.sleep(0.01)
+    if transport == "tcp":
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    player = RFUniverseCommunicator(proc_type="editor", transport=transport)
+    player.client = client
+    player.connected = True
+    player.send_object("StepEnd")
+    try:
+        while True:
+            objs = player.receive_object(player.receive_bytes())
+            if objs[0] == "StepStart":
+                player.send_object("Env", {"frame": 0})
+                player.send_object("StepEnd")
+    except (AssertionError, OSError):
+        client.close()
+
+
+def measure(transport: str) -> list:
+    communicator = RFUniverseCommunicator(
+        port=5100, receive_data_callback=lambda objs: None, proc_type="editor", transport=transport
+    )
+    address = communicator.socket_path if transport == "unix" else ("localhost", communicator.port)
+    player = mp.Process(target=stand_in_player, args=(transport, address), daemon=True)
+    player.start()
+    communicator.online()
+    latencies = []
+    for _ in range(STEPS):
+        start = time.perf_counter()
+        communicator.sync_step()
+        latencies.append(time.perf_counter() - start)
+    communicator.close()
+    player.join()
+    return sorted(latencies)
+
+
+if __name__ == "__main__":
+    print(f"{'transport':>10} {'mean':>10} {'p50':>10} {'p99':>10}")
+    for transport in ["tcp", "unix"]:
+        latencies = measure(transport)
+        mean = sum(latencies) / len(latencies)
+        p50 = latencies[len(latencies) // 2]
+        p99 = latencies[int(len(latencies) * 0.99)]
+        print(f"{transport:>10} {mean * 1e6:>8.1f}us {p50 * 1e6:>8.1f}us {p99 * 1e6:>8.1f}us")
@@ -0,0 +1,37 @@
+import time
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+# Frame size, encode + decode time and round-trip error of arrays sent as legacy float32 "array" values
+# and as "typed_array" values. No Unity player is needed.
+REPEAT = 50
+ARRAYS = {
+    "uint8 mask 640x480": np.random.randint(0, 2, (480, 640), dtype=np.uint8),
+    "int32 ids 100k": np.arange(100000, dtype=np.int32) * 1000 + 1,
+    "float64 poses 1k x 4x4": np.random.rand(1000, 4, 4) * 100,
+    "float32 points 100k x 3": np.random.rand(100000, 3).astype(np.float32),
+}
+
+
+def round_trip(communicator: RFUniverseCommunicator, array: np.ndarray) -> tuple:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        datas = bytearray()
+        communicator.write_object(datas, array)
+        communicator.read_offset = 0
+        result = communicator.read_object(bytes(datas))
+    elapsed = (time.perf_counter() - start) / REPEAT
+    error = float(np.max(np.abs(result.astype(np.float64) - array.astype(np.float64))))
+    return len(datas), elapsed, error, result.dtype
+
+
+if __name__ == "__main__":
+    communicator = RFUniverseCommunicator(proc_type="editor")
+    communicator.protocol_version = 2
+    print(f"{'array':>24} {'encoding':>12} {'bytes':>10} {'time':>9} {'max error':>10} {'dtype':>8}")
+    for name, array in ARRAYS.items():
+        for typed in [False, True]:
+            communicator.typed_arrays = typed
+            size, elapsed, error, dtype = round_trip(communicator, array)
+            encoding = "typed_array" if typed else "array"
+            print(f"{name:>24} {encoding:>12} {size:>10} {elapsed * 1e3:>7.2f}ms {error:>10.3g} {str(dtype):>8}")
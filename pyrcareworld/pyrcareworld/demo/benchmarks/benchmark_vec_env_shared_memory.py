@@ -0,0 +1,75 @@
+import time
+from functools import partial
+import numpy as np
+
+# Steps per second of SubprocVecEnv, which pickles the observations through pipes, against SharedMemorySubprocVecEnv,
+# which writes them into shared memory, with a camera image and joint positions per agent and N_AGENTS agents per process.
+# The environments only fill their observations, so the difference is the cost of moving them to the main process.
+# Needs stable_baselines3 and gym.
+PROCESSES = 4
+N_AGENTS = 32
+IMAGE_SIZES = [(64, 64), (128, 128)]
+EPISODE_STEPS = 100
+SECONDS = 3
+
+try:
+    import gym
+    from pyrcareworld.utils.proc_wrapper import SubprocVecEnv, SharedMemorySubprocVecEnv
+except ImportError:
+    gym = None
+
+
+class ImageTask:
+    # A gym-style environment of N_AGENTS agents, whose observation is a Dict space of an image and joint positions.
+
+    def __init__(self, image_size: tuple, proc_id: int = 0):
+        self.observation_space = gym.spaces.Dict(
+            {
+                "rgb": gym.spaces.Box(0, 255, (image_size[1], image_size[0], 3), np.uint8),
+                "joint_positions": gym.spaces.Box(-np.inf, np.inf, (7,), np.float32),
+            }
+        )
+        self.action_space = gym.spaces.Box(-1, 1, (7,), np.float32)
+        self.rgb = np.random.randint(0, 256, (N_AGENTS, image_size[1], image_size[0], 3), dtype=np.uint8)
+        self.joint_positions = np.zeros((N_AGENTS, 7), dtype=np.float32)
+        self.steps = 0
+
+    def observation(self) -> dict:
+        return {"rgb": self.rgb, "joint_positions": self.joint_positions}
+
+    def step(self, action):
+        self.steps += 1
+        done = np.full(N_AGENTS, self.steps % EPISODE_STEPS == 0)
+        return self.observation(), np.zeros(N_AGENTS), done, [{} for _ in range(N_AGENTS)]
+
+    def reset(self):
+        return self.observation()
+
+    def close(self):
+        pass
+
+
+def rate(vec_env) -> float:
+    vec_env.reset()
+    actions = np.zeros((vec_env.num_envs, 7), dtype=np.float32)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < SECONDS:
+        vec_env.step_async(actions)
+        vec_env.step_wait()
+        steps += 1
+    vec_env.close()
+    return steps / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    if gym is None:
+        print("stable_baselines3 and gym are needed")
+        exit()
+    print(f"{'image':>9} {'vec env':>26} {'steps/s':>9} {'env steps/s':>12}")
+    for image_size in IMAGE_SIZES:
+        env_fns = [partial(ImageTask, image_size)] * PROCESSES
+        for vec_env_type in [SubprocVecEnv, SharedMemorySubprocVecEnv]:
+            steps = rate(vec_env_type(env_fns, start_method="fork", n_agents=N_AGENTS))
+            size = f"{image_size[0]}x{image_size[1]}"
+            print(f"{size:>9} {vec_env_type.__name__:>26} {steps:>9.1f} {steps * PROCESSES * N_AGENTS:>12.0f}")
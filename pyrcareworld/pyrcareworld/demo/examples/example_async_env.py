@@ -0,0 +1,29 @@
+import asyncio
+from pyrcareworld.envs.async_env import AsyncRCareWorld
+import pyrcareworld.attributes as attr
+
+ENV_COUNT = 4
+
+
+async def run(env: AsyncRCareWorld, index: int):
+    # Each environment drives its own robot, all environments share one event loop
+    robot = env.InstanceObject(name="franka_panda", id=123456, attr_type=attr.ControllerAttr)
+    robot.SetIKTargetOffset(position=[0, 0.105, 0])
+    await env.step()
+
+    robot.IKTargetDoMove(position=[0, 0.5, 0.3 + 0.05 * index], duration=1, speed_based=False)
+    await robot.WaitDo()
+    print(f"env {index} joint positions: {robot.data['joint_positions']}")
+
+
+async def main():
+    # Launch the players concurrently, each on its own port
+    envs = await asyncio.gather(
+        *[AsyncRCareWorld.create(assets=["franka_panda"], proc_id=i) for i in range(ENV_COUNT)]
+    )
+    await asyncio.gather(*[run(env, i) for i, env in enumerate(envs)])
+    for env in envs:
+        env.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,186 @@
+import time
+import pyrcareworld
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.async_rfuniverse_communicator import AsyncRFUniverseCommunicator
+
+
+class AsyncRCareWorld(RCareWorld):
+    """
+    RCareWorld environment running on `asyncio`, so that one event loop can drive many Unity players.
+
+    Create it with `env = await AsyncRCareWorld.create(...)`, which takes the same parameters as `RCareWorld`.
+    All commands and attributes are the same as `RCareWorld`; commands are queued and sent at the next step.
+    Methods that wait for Unity are coroutines: `step`, `WaitSceneInit`, `WaitLoadDone`, `Pend`,
+    `PreLoadAssetsAsync`, `LoadSceneAsync`, `SwitchSceneAsync`, `Restore` and the attributes' `WaitDo`.
+
+    Example::
+
+        envs = await asyncio.gather(*[AsyncRCareWorld.create(executable_file=path, proc_id=i) for i in range(8)])
+        await asyncio.gather(*[env.step() for env in envs])
+    """
+
+    communicator_type = AsyncRFUniverseCommunicator
+    is_async = True
+
+    @classmethod
+    async def create(cls, *args, **kwargs):
+        """
+        Launch or wait for the Unity player, then initialize the scene.
+
+        :return: AsyncRCareWorld, the connected environment.
+        """
+        env = cls(*args, **kwargs)
+        await env.online()
+        return env
+
+    def _online(self, assets: list, scene_file: str) -> None:
+        # Connecting needs the event loop, it is done in `online`.
+        self._online_args = (assets, scene_file)
+
+    async def online(self) -> None:
+        """
+        Wait for the Unity player to connect, then initialize the scene.
+        """
+        assets, scene_file = self._online_args
+        start = time.perf_counter()
+        await self.communicator.online()
+        self.launch_timings["connect"] = time.perf_counter() - start
+        start = time.perf_counter()
+        await self.WaitSceneInit()
+        self._open_shared_memory()
+        self.launch_timings["scene_init"] = time.perf_counter() - start
+        if len(assets) > 0:
+            start = time.perf_counter()
+            await self.PreLoadAssetsAsync(assets, True)
+            self.launch_timings["preload"] = time.perf_counter() - start
+        if scene_file is not None:
+            start = time.perf_counter()
+            await self.LoadSceneAsync(scene_file, True)
+            self.launch_timings["load_scene"] = time.perf_counter() - start
+
+    async def _step(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False):
+        """
+        Send the messages of called functions to Unity and simulate for a step, then accept the data from Unity.
+
+        :param count: Int, the number of steps for executing Unity simulation.
+        :param simulate: Bool, True to simulate physics, False otherwise.
+        :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip, see `RCareWorld.step`.
+        :raises Exception: If the Unity environment is not connected.
+        """
+        if not self.communicator.connected:
+            raise Exception("Unity Env not connected")
+        if count < 1:
+            count = 1
+        if fast_forward:
+            self._send_fast_forward(count, simulate, collect)
+            await self.communicator.sync_step()
+        else:
+            for i in range(count):
+                if simulate:
+                    self.Simulate()
+                if collect and i == count - 1:
+                    self.Collect()
+                await self.communicator.sync_step()
+        self.issued_step += count
+        self.observed_step = self.issued_step
+
+    def step_async(self, *args, **kwargs):
+        raise NotImplementedError("Run `env.step()` in an asyncio task instead, e.g. `task = asyncio.create_task(env.step())`")
+
+    def step_wait(self):
+        raise NotImplementedError("Await the task running `env.step()` instead")
+
+    async def step(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False):
+        """
+        Send the messages of called functions to Unity and simulate for a step, then accept the data from Unity.
+
+        :param count: Int, the number of steps for executing Unity simulation.
+        :param simulate: Bool, True to simulate physics, False otherwise.
+        :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip, see `RCareWorld.step`.
+        """
+        start = time.perf_counter() if self.stats is not None else 0
+        await self._step(count, simulate, collect, fast_forward)
+        if self.stats is not None:
+            self.stats.add_step(start, time.perf_counter())
+
+    async def PreLoadAssetsAsync(self, names: list, auto_wait: bool = False) -> None:
+        """
+        Pre-load the assets.
+
+        :param names: List, the names of assets.
+        :param auto_wait: Bool, if True, this function will not return until the loading is done.
+        """
+        self._send_env_data("PreLoadAssetsAsync", names)
+
+        if auto_wait:
+            await self.WaitLoadDone()
+
+    async def LoadSceneAsync(self, file: str, auto_wait: bool = False) -> None:
+        """
+        Load the scene asynchronously.
+
+        :param file: Str, the scene JSON file. If it's a relative path, it will load from `StreamingAssets`.
+        :param auto_wait: Bool, if True, this function will not return until the loading is done.
+        """
+        self._send_env_data("LoadSceneAsync", file)
+
+        if auto_wait:
+            await self.WaitLoadDone()
+
+    async def SwitchSceneAsync(self, name: str, auto_wait: bool = False) -> None:
+        """
+        Switch the scene asynchronously.
+
+        :param name: Str, the scene name.
+        :param auto_wait: Bool, if True, this function will not return until the loading is done.
+        """
+        self._send_env_data("SwitchSceneAsync", name)
+
+        if auto_wait:
+            await self.WaitSceneInit()
+
+    async def WaitSceneInit(self) -> None:
+        """
+        Wait for the scene initialization to be done.
+        """
+        while "scene_init" not in self.data:
+            await self._step(simulate=False)
+        self.data.pop("scene_init")
+        self._send_debug_data("SetPythonVersion", pyrcareworld.__version__)
+        self._read_player_features()
+        changes = self._request_wire_format()
+        if len(changes) > 0:
+            await self._step(simulate=False, collect=False)
+            for key, value in changes.items():
+                setattr(self.communicator, key, value)
+
+    async def WaitLoadDone(self) -> None:
+        """
+        Wait for the loading to be done.
+        """
+        while "load_done" not in self.data:
+            await self._step(simulate=False)
+        self.data.pop("load_done")
+
+    async def Pend(self, simulate: bool = True, collect: bool = True) -> None:
+        """
+        Pend the program until the `EndPend` button in `UnityPlayer` is clicked.
+
+        :param simulate: Bool, if True, simulate physics.
+        :param collect: Bool, if True, collect data.
+        """
+        self._send_env_data("Pend")
+        while "pend_done" not in self.data:
+            await self._step(simulate=simulate, collect=collect)
+        self.data.pop("pend_done")
+
+    async def Restore(self, handle: int) -> None:
+        """
+        Put the objects of a snapshot back in their saved state, see `RCareWorld.Restore`.
+
+        :param handle: Int, the snapshot handle returned by `Snapshot`.
+        """
+        self._send_restore(handle)
+        await self._step(simulate=False)
@@ -2,11 +2,16 @@ import random
 import subprocess
 from abc import ABC
 import socket
+import time
 import numpy as np
 import pyrcareworld
 import pyrcareworld.attributes as attr
 from pyrcareworld.side_channel import IncomingMessage, OutgoingMessage
-from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator, PROTOCOL_VERSION, available_compressions
+from pyrcareworld.utils.delta_state import StateDelta
+from pyrcareworld.utils.frame_trace import FrameTraceWriter
+from pyrcareworld.utils.step_stats import StepStats
+from pyrcareworld.utils.snapshot_store import SnapshotStore, SNAPSHOT_FIELDS
 import os
 
 
@@ -23,10 +28,31 @@ class RCareWorld(ABC):
     :param log_level: Int, the log level for the Unity environment. 0 for no log, 1 for error logs, 2 for warnings and errors, 3 for all logs.
     :param ext_attr: List, the list of extended attributes. All extended attributes will be added to the environment. (Deprecated in RCareWorld 1.5.0)
     :param check_version: Bool, True for checking the version of the Unity environment and the pyrcareworld library, False for not checking the version.
+    :param zero_copy: Bool, True to receive data into reusable buffers and return large `bytes` payloads as read-only `memoryview` objects instead of copies. See `RFUniverseCommunicator` for the lifetime rules of the views.
+    :param batch_send: Bool, True to queue all commands called between steps and send them in a single write when stepping. Per-flush counters are in `env.communicator.batch_stats`.
+    :param protocol_version: Int, the highest wire protocol version to negotiate with the Unity player. 1 for type names as strings, 2 for single-byte type codes. The player falls back to 1 if it does not support 2.
+    :param transport: Str, "tcp" for a localhost TCP socket, "unix" for a Unix domain socket, which has lower latency when the player runs on the same host. The socket path is passed to the player with `-socket:`.
+    :param shared_memory: Bool, True to open a shared memory ring next to the socket. Players that support it write large payloads such as camera images into the ring and send only a descriptor, and the data becomes a read-only `memoryview` of the mapping. The player must advertise support for it, otherwise payloads stay in the socket. A view is valid until the player wraps around to its slot, which does not happen within a step, or within two steps in pipelined mode; reading an overwritten payload raises ValueError, see `SharedMemoryRing`.
+    :param shared_memory_slots: Int, the number of slots in the shared memory ring.
+    :param shared_memory_slot_size: Int, the size of each slot in the shared memory ring in bytes.
+    :param pipelined: Bool, True to pipeline `step`: each call sends the next step to Unity before decoding the results of the previous one, so that Unity simulates while Python decodes and computes. Observations then lag one step behind, see `step`.
+    :param lazy_decode: Bool, True to decode the data of each object lazily: a value in `attr.data` is only decoded the first time it is accessed in a step. The data is the same as with eager decoding.
+    :param delta_state: Bool, True to ask the player to only send the keys of each object that changed since the last step. `attr.data` is merged with the changes instead of being replaced, so it holds the same data as without delta state. Only used if the player supports it.
+    :param keyframe_interval: Int, in delta state mode, the player resends the full data of every object once every this many steps. 0 to never resync.
+    :param compression: Str, "zlib" or "lz4" to compress frames of at least `compression_threshold` bytes in both directions, for players reached over a slow network. "lz4" needs the `lz4` package. Only used if the player supports the codec, see `communicator.compression_stats` to tell whether it pays off.
+    :param compression_threshold: Int, frames smaller than this many bytes stay uncompressed.
+    :param trace_file: Str, a file to record every frame exchanged with the player into, see `FrameTraceWriter`. The trace can be fed back to a new environment by `TraceReplayPlayer`. None to disable recording.
+    :param stats: Bool, True to time every step and count the frames per message type in `env.stats`, see `StepStats`.
+    :param stats_events: Bool, True to also record a timeline of every step for `env.stats.export_chrome_trace`.
+    :param reader_thread: Bool, True to read the socket on a background thread, so that frames keep arriving and are decompressed while earlier ones are decoded. It pays off for large or compressed frames from a remote player; on localhost the hand-off between threads can cost more than it saves. Not supported by `AsyncRCareWorld`.
+    :param typed_arrays: Bool, True to send and receive `np.ndarray` values with their dtype (uint8, int32, float32 or float64) and shape if the player supports it. Other integer arrays are sent as int32 and raise OverflowError if a value does not fit. False, or with older players, arrays are sent as float32.
+    :param snapshot_capacity: Int, the number of snapshots taken by `Snapshot` to keep. Beyond it the least recently used one is dropped, see `SnapshotStore`.
     """
 
 
     metadata = {"render.modes": ["human", "rgb_array"]}
+    communicator_type = RFUniverseCommunicator
+    is_async = False
 
     def __init__(
             self,
@@ -38,7 +64,26 @@ class RCareWorld(ABC):
             proc_id=0,
             log_level=0,
             ext_attr: list = [],
-            check_version: bool = False
+            check_version: bool = False,
+            zero_copy: bool = False,
+            batch_send: bool = False,
+            protocol_version: int = PROTOCOL_VERSION,
+            transport: str = "tcp",
+            shared_memory: bool = False,
+            shared_memory_slots: int = 4,
+            shared_memory_slot_size: int = 16 * 1024 * 1024,
+            pipelined: bool = False,
+            lazy_decode: bool = False,
+            delta_state: bool = False,
+            keyframe_interval: int = 100,
+            compression: str = None,
+            compression_threshold: int = 64 * 1024,
+            trace_file: str = None,
+            stats: bool = False,
+            stats_events: bool = False,
+            reader_thread: bool = False,
+            typed_arrays: bool = True,
+            snapshot_capacity: int = 8,
     ):
         """
         Initialize the RCareWorld base environment class.
@@ -52,17 +97,58 @@ class RCareWorld(ABC):
         :param log_level: Int, the log level for the Unity environment. 0 for no log, 1 for error logs, 2 for warnings and errors, 3 for all logs.
         :param ext_attr: List, the list of extended attributes. All extended attributes will be added to the environment. (Deprecated in RCareWorld 1.5.0)
         :param check_version: Bool, True for checking the version of the Unity environment and the pyrcareworld library, False for not checking the version.
+        :param zero_copy: Bool, True to receive data into reusable buffers and return large `bytes` payloads as read-only `memoryview` objects instead of copies. See `RFUniverseCommunicator` for the lifetime rules of the views.
+        :param batch_send: Bool, True to queue all commands called between steps and send them in a single write when stepping. Per-flush counters are in `env.communicator.batch_stats`.
+        :param protocol_version: Int, the highest wire protocol version to negotiate with the Unity player. 1 for type names as strings, 2 for single-byte type codes. The player falls back to 1 if it does not support 2.
+        :param transport: Str, "tcp" for a localhost TCP socket, "unix" for a Unix domain socket, which has lower latency when the player runs on the same host. The socket path is passed to the player with `-socket:`.
+        :param shared_memory: Bool, True to open a shared memory ring next to the socket. Players that support it write large payloads such as camera images into the ring and send only a descriptor, and the data becomes a read-only `memoryview` of the mapping. The player must advertise support for it, otherwise payloads stay in the socket. A view is valid until the player wraps around to its slot, which does not happen within a step, or within two steps in pipelined mode; reading an overwritten payload raises ValueError, see `SharedMemoryRing`.
+        :param shared_memory_slots: Int, the number of slots in the shared memory ring.
+        :param shared_memory_slot_size: Int, the size of each slot in the shared memory ring in bytes.
+        :param pipelined: Bool, True to pipeline `step`: each call sends the next step to Unity before decoding the results of the previous one, so that Unity simulates while Python decodes and computes. Observations then lag one step behind, see `step`.
+        :param lazy_decode: Bool, True to decode the data of each object lazily: a value in `attr.data` is only decoded the first time it is accessed in a step. The data is the same as with eager decoding.
+        :param delta_state: Bool, True to ask the player to only send the keys of each object that changed since the last step. `attr.data` is merged with the changes instead of being replaced, so it holds the same data as without delta state. Only used if the player supports it.
+        :param keyframe_interval: Int, in delta state mode, the player resends the full data of every object once every this many steps. 0 to never resync.
+        :param compression: Str, "zlib" or "lz4" to compress frames of at least `compression_threshold` bytes in both directions, for players reached over a slow network. "lz4" needs the `lz4` package. Only used if the player supports the codec, see `communicator.compression_stats` to tell whether it pays off.
+        :param compression_threshold: Int, frames smaller than this many bytes stay uncompressed.
+        :param trace_file: Str, a file to record every frame exchanged with the player into, see `FrameTraceWriter`. The trace can be fed back to a new environment by `TraceReplayPlayer`. None to disable recording.
+        :param stats: Bool, True to time every step and count the frames per message type in `env.stats`, see `StepStats`.
+        :param stats_events: Bool, True to also record a timeline of every step for `env.stats.export_chrome_trace`.
+        :param reader_thread: Bool, True to read the socket on a background thread, so that frames keep arriving and are decompressed while earlier ones are decoded. It pays off for large or compressed frames from a remote player; on localhost the hand-off between threads can cost more than it saves. Not supported by `AsyncRCareWorld`.
+        :param typed_arrays: Bool, True to send and receive `np.ndarray` values with their dtype (uint8, int32, float32 or float64) and shape if the player supports it. Other integer arrays are sent as int32 and raise OverflowError if a value does not fit. False, or with older players, arrays are sent as float32.
+        :param snapshot_capacity: Int, the number of snapshots taken by `Snapshot` to keep. Beyond it the least recently used one is dropped, see `SnapshotStore`.
         """
         # time step
         self.t = 0
         self.graphics = graphics
         self.process = None
+        self.launch_timings = {}
         self.attrs = {}
         self.data = {}
         self.listen_messages = {}
         self.listen_object = {}
         self.port = port
         self.check_version = check_version
+        self.protocol_version = protocol_version
+        self.shared_memory = shared_memory
+        self.shared_memory_slots = shared_memory_slots
+        self.shared_memory_slot_size = shared_memory_slot_size
+        self.pipelined = pipelined
+        self.subscriptions = {}
+        self.delta_state = delta_state
+        self.keyframe_interval = keyframe_interval
+        if compression is not None and compression not in available_compressions():
+            raise ValueError(f"This compression is unavailable: {compression}")
+        self.compression = compression
+        self.typed_arrays = typed_arrays
+        self._player_collect_filter = False
+        self._player_delta_state = False
+        self._player_shared_memory = False
+        self.issued_step = 0
+        self.observed_step = 0
+        self._steps_in_flight = 0
+        self._async_step_pending = False
+        self._async_step_start = 0
+        self.snapshots = SnapshotStore(snapshot_capacity)
         for i in ext_attr:
             if i.__name__ in attr.attrs:
                 raise ValueError(f"ext_attr {i.__name__} already exists")
@@ -85,20 +171,64 @@ class RCareWorld(ABC):
         else:  # error
             raise ValueError(f"Executable file {executable_file} does not exist")
 
-        self.communicator = RFUniverseCommunicator(
+        self.communicator = self.communicator_type(
             port=self.port,
             receive_data_callback=self._receive_data,
             proc_type=PROC_TYPE,
+            zero_copy=zero_copy,
+            batch_send=batch_send or pipelined,
+            lazy_decode=lazy_decode,
+            compression_threshold=compression_threshold,
+            transport=transport,
+            reader_thread=reader_thread,
         )
         self.port = self.communicator.port  # update port
+        if trace_file is not None:
+            self.communicator.trace = FrameTraceWriter(trace_file)
+        self.stats = StepStats(events=stats_events) if stats else None
+        self.communicator.stats = self.stats
         if PROC_TYPE == "release":
+            start = time.perf_counter()
             self.process = self._start_unity_env(executable_file, self.port)
+            self.communicator.player_process = self.process
+            self.launch_timings["process_start"] = time.perf_counter() - start
+        try:
+            self._online(assets, scene_file)
+        except BaseException:
+            self.close()
+            raise
+
+    def _online(self, assets: list, scene_file: str) -> None:
+        """
+        Wait for the Unity player to connect, then initialize the scene.
+
+        :param assets: List, the list of pre-loaded assets.
+        :param scene_file: Str, the scene JSON file to load, or None.
+        """
+        start = time.perf_counter()
         self.communicator.online()
+        self.launch_timings["connect"] = time.perf_counter() - start
+        start = time.perf_counter()
         self.WaitSceneInit()
+        self._open_shared_memory()
+        self.launch_timings["scene_init"] = time.perf_counter() - start
         if len(assets) > 0:
+            start = time.perf_counter()
             self.PreLoadAssetsAsync(assets, True)
+            self.launch_timings["preload"] = time.perf_counter() - start
         if scene_file is not None:
+            start = time.perf_counter()
             self.LoadSceneAsync(scene_file, True)
+            self.launch_timings["load_scene"] = time.perf_counter() - start
+
+    def _open_shared_memory(self) -> None:
+        if not self.shared_memory or not self._player_shared_memory:
+            return
+        ring = self.communicator.open_shared_memory(self.shared_memory_slots, self.shared_memory_slot_size)
+        # The player writes at most this many payloads per step and sends the rest inline. In pipelined mode
+        # a step is decoded after the next one is sent, so each step gets half the ring.
+        step_budget = max(ring.slot_count // 2, 1) if self.pipelined else ring.slot_count
+        self._send_env_data("SetSharedMemory", ring.name, ring.slot_count, ring.slot_size, step_budget)
 
     def __del__(self):
         self.close()
@@ -124,9 +254,13 @@ class RCareWorld(ABC):
         else:
             proc_out = None
         arg.append(f"-port:{port}")
+        if self.communicator.transport == "unix":
+            arg.append(f"-socket:{self.communicator.socket_path}")
         return subprocess.Popen(arg, stdout=proc_out, stderr=proc_out)
 
     def _receive_data(self, objs: list) -> None:
+        if len(objs) == 0:
+            return
         msg = objs[0]
         objs = objs[1:]
         if msg == "Env":
@@ -150,6 +284,8 @@ class RCareWorld(ABC):
         this_object_id = objs[0]
         this_object_type = objs[1]
         this_object_data = objs[2]
+        if len(objs) > 3:
+            this_object_data = StateDelta(objs[2], objs[3])
 
         try:
             attr_type = attr.attrs[this_object_type]
@@ -193,55 +329,199 @@ class RCareWorld(ABC):
         # warnings.warn(f"unknown object data type: {head}")
 
     def _send_env_data(self, *args) -> None:
+        self._check_no_async_step()
         self.communicator.send_object("Env", *args)
 
     def _send_physics_scene_data(self, *args) -> None:
+        self._check_no_async_step()
         self.communicator.send_object("PhysicsScene", *args)
 
     def _send_instance_data(self, *args) -> None:
+        self._check_no_async_step()
         self.communicator.send_object("Instance", *args)
 
     def _send_debug_data(self, *args) -> None:
+        self._check_no_async_step()
         self.communicator.send_object("Debug", *args)
 
     def _send_message_data(self, *args) -> None:
+        self._check_no_async_step()
         self.communicator.send_object("Message", *args)
 
     def _send_object_data(self, *args) -> None:
+        self._check_no_async_step()
         self.communicator.send_object("Object", *args)
 
-    def _step(self, count: int = 1, simulate: bool = True, collect: bool = True):
+    def _step(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False):
         """
         Send the messages of called functions to Unity and simulate for a step, then accept the data from Unity.
 
         :param count: Int, the number of steps for executing Unity simulation.
         :param simulate: Bool, True to simulate physics, False otherwise.
         :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip, see `step`.
         :raises Exception: If the Unity environment is not connected.
         """
         if not self.communicator.connected:
             raise Exception("Unity Env not connected")
+        self._check_no_async_step()
+        self._drain_pipeline()
         if count < 1:
             count = 1
-        for i in range(count):
-            if simulate:
-                self.Simulate()
-            if collect and i == count - 1:
-                self.Collect()
+        if fast_forward:
+            self._send_fast_forward(count, simulate, collect)
             self.communicator.sync_step()
+        else:
+            for i in range(count):
+                if simulate:
+                    self.Simulate()
+                if collect and i == count - 1:
+                    self.Collect()
+                self.communicator.sync_step()
+        self.issued_step += count
+        self.observed_step = self.issued_step
 
+    def _step_pipelined(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False) -> int:
+        """
+        Receive the results of the steps in flight, send the next steps to Unity, then decode and dispatch the received results while Unity simulates.
 
-    def step(self, count: int = 1, simulate: bool = True, collect: bool = True):
+        :param count: Int, the number of steps for executing Unity simulation.
+        :param simulate: Bool, True to simulate physics, False otherwise.
+        :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip, see `step`.
+        :return: Int, `observed_step`, the step whose results are now in `attrs` and `data`.
+        :raises Exception: If the Unity environment is not connected.
+        """
+        if not self.communicator.connected:
+            raise Exception("Unity Env not connected")
+        self._check_no_async_step()
+        if count < 1:
+            count = 1
+        frames = []
+        for _ in range(self._steps_in_flight):
+            frames.extend(self.communicator.receive_step_frames())
+        observed_step = self.issued_step
+        self._send_steps(count, simulate, collect, fast_forward)
+        self.communicator.dispatch_frames(frames)
+        self.observed_step = observed_step
+        return self.observed_step
+
+    def _send_steps(self, count: int, simulate: bool, collect: bool, fast_forward: bool) -> None:
+        # Send the steps without waiting for them, their results are received by whoever drains `_steps_in_flight`.
+        if fast_forward:
+            self._send_fast_forward(count, simulate, collect)
+            self.communicator.send_step()
+            self._steps_in_flight = 1
+        else:
+            for i in range(count):
+                if simulate:
+                    self.Simulate()
+                if collect and i == count - 1:
+                    self.Collect()
+                self.communicator.send_step()
+            self._steps_in_flight = count
+        self.issued_step += count
+
+    def _send_fast_forward(self, count: int, simulate: bool, collect: bool) -> None:
+        # Unity runs every physics substep of `Simulate` within one step, and collects once after the last one.
+        if simulate:
+            self.Simulate(count=count)
+        if collect:
+            self.Collect()
+
+    def _drain_pipeline(self) -> None:
+        """
+        Receive and dispatch the results of the steps in flight, so that `attrs` and `data` are up to date.
+        """
+        if self._steps_in_flight == 0:
+            return
+        frames = []
+        for _ in range(self._steps_in_flight):
+            frames.extend(self.communicator.receive_step_frames())
+        self._steps_in_flight = 0
+        self.communicator.dispatch_frames(frames)
+        self.observed_step = self.issued_step
+
+    def _check_no_async_step(self) -> None:
+        if self._async_step_pending:
+            raise RuntimeError("A step sent by step_async is in flight, call step_wait first")
+
+    def step_async(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False) -> None:
+        """
+        Send the messages of called functions to Unity and simulate for a step, without waiting for the data from Unity.
+        Call `step_wait` to receive it, e.g. to compute the next action while Unity simulates::
+
+            env.step_async()
+            action = policy(observation)
+            env.step_wait()
+
+        Until `step_wait` is called, calling a command or any function that steps raises a RuntimeError,
+        and `attrs` and `data` keep the results of the previous step.
+
+        :param count: Int, the number of steps for executing Unity simulation.
+        :param simulate: Bool, True to simulate physics, False otherwise.
+        :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip, see `step`.
+        :raises Exception: If the Unity environment is not connected.
+        :raises RuntimeError: If a step sent by `step_async` is already in flight.
+        """
+        if not self.communicator.connected:
+            raise Exception("Unity Env not connected")
+        self._check_no_async_step()
+        self._drain_pipeline()
+        if count < 1:
+            count = 1
+        self._async_step_start = time.perf_counter()
+        self._send_steps(count, simulate, collect, fast_forward)
+        self._async_step_pending = True
+
+    def step_wait(self) -> int:
+        """
+        Wait for the data of the step sent by `step_async`, and update `attrs` and `data` with it.
+
+        :return: Int, `observed_step`, the step whose results are now in `attrs` and `data`.
+        :raises RuntimeError: If no step was sent by `step_async`.
+        """
+        if not self._async_step_pending:
+            raise RuntimeError("No step is in flight, call step_async first")
+        self._async_step_pending = False
+        self._drain_pipeline()
+        if self.stats is not None:
+            self.stats.add_step(self._async_step_start, time.perf_counter())
+        return self.observed_step
+
+    def step(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False):
         """
         Send the messages of called functions to Unity and simulate for a step, then accept the data from Unity.
         The difference of this function with `_step` is that this function is designed to be overwritten if there is a new class inherited from `RCareWorld`.
 
+        In pipelined mode, this function sends the step and returns the results of the previous step instead of waiting for this one.
+        `env.issued_step` counts the steps sent to Unity and `env.observed_step` is the step whose results are in `attrs` and `data`.
+        After the k-th call, `observed_step` is the step issued by the (k-1)-th call, so the data reflects the commands called before
+        the (k-1)-th call, while the commands called before the k-th call are being simulated.
+        Any other function that waits for Unity, such as `WaitDo` or `WaitLoadDone`, first receives the step in flight.
+        To choose when to wait for a step in non-pipelined mode, use `step_async` and `step_wait` instead.
+
+        With `fast_forward`, the `count` physics steps are simulated by a single `Simulate(count=count)` in one round trip
+        instead of one round trip per step, e.g. `env.step(100, fast_forward=True)` to let objects settle.
+        The physics result is the same, but per-frame Unity updates, such as the tweens of `DoMove`, run once instead of `count` times,
+        and there is no data of the intermediate steps.
+
         :param count: Int, the number of steps for executing Unity simulation.
         :param simulate: Bool, True to simulate physics, False otherwise.
         :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip.
+        :return: Int, `observed_step`, the step whose results are now in `attrs` and `data`.
         :raises Exception: If the Unity environment is not connected.
         """
-        self._step(count, simulate, collect)
+        start = time.perf_counter() if self.stats is not None else 0
+        if self.pipelined:
+            self._step_pipelined(count, simulate, collect, fast_forward)
+        else:
+            self._step(count, simulate, collect, fast_forward)
+        if self.stats is not None:
+            self.stats.add_step(start, time.perf_counter())
+        return self.observed_step
 
     def close(self):
         """
@@ -269,6 +549,110 @@ class RCareWorld(ABC):
         """
         self._send_env_data("Collect")
 
+    def Subscribe(self, id: int, fields: list = None) -> None:
+        """
+        Subscribe to the data of an object.
+        Once any object is subscribed, only subscribed objects are updated by `Collect`, and of those only the keys in `fields`.
+        Without subscriptions, every object and every key is collected.
+        Data returned for requests sent in a step, such as `GetRGB`, and the first data of new objects are not filtered.
+
+        :param id: Int, object ID.
+        :param fields: List, the keys of `attr.data` to collect, or None for every key.
+        """
+        subscriptions = dict(self.subscriptions)
+        subscriptions[id] = None if fields is None else list(fields)
+        self._update_collect_filter(subscriptions)
+
+    def Unsubscribe(self, id: int = None) -> None:
+        """
+        Unsubscribe from the data of an object. Once no object is subscribed, every object is collected again.
+
+        :param id: Int, object ID, or None to remove every subscription.
+        """
+        subscriptions = {} if id is None else dict(self.subscriptions)
+        subscriptions.pop(id, None)
+        self._update_collect_filter(subscriptions)
+
+    def _update_collect_filter(self, subscriptions: dict) -> None:
+        """
+        Send the new subscriptions to the player if it can filter `Collect` itself, then apply them to the received data.
+        Players that advertise `collect_filter` in the scene init data only send the subscribed objects and keys.
+        Nothing changes if sending fails, e.g. while a `step_async` is in flight, so that both sides keep the same filter.
+
+        :param subscriptions: Dict, the new `subscriptions`.
+        """
+        self._check_no_async_step()
+        if self._player_collect_filter:
+            self._send_env_data("SetCollectFilter", dict(subscriptions))
+        # Keys that become subscribed are only sent by a delta once they change.
+        self.RequestKeyframe()
+        self.subscriptions = subscriptions
+        if len(subscriptions) == 0:
+            self.communicator.collect_filter = None
+        else:
+            self.communicator.collect_filter = {
+                id: None if fields is None else frozenset(fields) for id, fields in subscriptions.items()
+            }
+
+    def RequestKeyframe(self) -> None:
+        """
+        In delta state mode, ask the player to send the full data of every object in the next step.
+        """
+        if self.delta_state and self._player_delta_state:
+            self._send_env_data("RequestKeyframe")
+
+    def Snapshot(self, ids: list = None) -> int:
+        """
+        Save the state of objects: their position and rotation, rigidbody velocities, and articulation joint positions and velocities.
+        The state is taken from the data of the last collected step, without a round trip, so call it right after a step that collected.
+        Snapshots are kept in `env.snapshots`, which drops the least recently used one beyond `snapshot_capacity`.
+
+        Example::
+
+            env.step()
+            handle = env.Snapshot()
+            for episode in range(100):
+                env.Restore(handle)
+                ...
+
+        :param ids: List, the IDs of the objects to save. None for every object.
+        :return: Int, the snapshot handle.
+        """
+        self._check_no_async_step()
+        self._drain_pipeline()
+        return self.snapshots.capture(self.attrs, ids)
+
+    def Restore(self, handle: int) -> None:
+        """
+        Put the objects of a snapshot back in their saved state, in a single step that does not simulate, without reloading anything.
+        Objects created after the snapshot are kept, and objects destroyed since are skipped.
+        Only the fields listed in `SNAPSHOT_FIELDS` are restored, e.g. cloth particles and the targets of joint drives are not.
+
+        :param handle: Int, the snapshot handle returned by `Snapshot`.
+        :raises KeyError: If the snapshot does not exist or was dropped from `env.snapshots`.
+        """
+        self._send_restore(handle)
+        self._step(simulate=False)
+
+    def _send_restore(self, handle: int) -> None:
+        state = self.snapshots.get(handle)
+        for id, fields in state.items():
+            if id not in self.attrs:
+                continue
+            attr = self.attrs[id]
+            for key, value in fields.items():
+                command = getattr(attr, SNAPSHOT_FIELDS[key], None)
+                if command is not None:
+                    command(value)
+
+    def DeleteSnapshot(self, handle: int) -> None:
+        """
+        Delete a snapshot.
+
+        :param handle: Int, the snapshot handle.
+        """
+        self.snapshots.remove(handle)
+
     def GetAttr(self, id: int):
         """
         Get the attribute instance by object ID.
@@ -325,6 +709,51 @@ class RCareWorld(ABC):
             self._step(simulate=False)
         self.data.pop("scene_init")
         self._send_debug_data("SetPythonVersion", pyrcareworld.__version__)
+        self._read_player_features()
+        self._negotiate_wire_format()
+
+    def _read_player_features(self) -> None:
+        """
+        Read the optional features the player advertises in the scene init data, and enable the requested ones.
+        """
+        self._player_collect_filter = self.data.pop("collect_filter", False)
+        self._player_delta_state = self.data.pop("delta_state", False)
+        self._player_shared_memory = self.data.pop("shared_memory", False)
+        if self.delta_state and self._player_delta_state:
+            self._send_env_data("SetDeltaState", True, int(self.keyframe_interval))
+        # Tactile and IR images are sent as base64 strings unless the player is asked for raw bytes.
+        if self.data.pop("raw_sensor_bytes", False):
+            self._send_env_data("SetRawSensorBytes", True)
+
+    def _negotiate_wire_format(self) -> None:
+        """
+        Switch to the highest wire protocol version supported by both sides, to the requested frame compression and to typed arrays if the player supports them.
+        The player advertises its version as `protocol_version`, its codecs as `compression` and typed arrays as `typed_array` in the scene init data; players without them only speak version 1 with float32 arrays and without compression.
+        The requests are sent in the current format, and both sides use the new format for every frame after the `StepEnd` of that step.
+        """
+        changes = self._request_wire_format()
+        if len(changes) == 0:
+            return
+        self._step(simulate=False, collect=False)
+        for key, value in changes.items():
+            setattr(self.communicator, key, value)
+
+    def _request_wire_format(self) -> dict:
+        changes = {}
+        player_version = self.data.pop("protocol_version", 1)
+        version = min(player_version, self.protocol_version)
+        if version != self.communicator.protocol_version:
+            self._send_env_data("SetProtocolVersion", int(version))
+            changes["protocol_version"] = version
+        player_compressions = self.data.pop("compression", [])
+        if self.compression in player_compressions and self.compression != self.communicator.compression:
+            self._send_env_data("SetCompression", self.compression, int(self.communicator.compression_threshold))
+            changes["compression"] = self.compression
+        player_typed_arrays = self.data.pop("typed_array", False)
+        if self.typed_arrays and player_typed_arrays and not self.communicator.typed_arrays:
+            self._send_env_data("SetTypedArrays", True)
+            changes["typed_arrays"] = True
+        return changes
 
     def WaitLoadDone(self) -> None:
         """
@@ -56,7 +56,48 @@ class RCareWorldGymWrapper(RCareWorld, gym.Env):
         :param simulate: Simulate physics.
         :param collect: Collect data.
         """
-        self.step(count, simulate, collect)
+        RCareWorld.step(self, count, simulate, collect)
+
+    def apply_action(self, action: gym.core.ActType) -> None:
+        """
+        Call the commands of an action, which are sent with the next step by `gym_step_async`.
+        Override it with the commands of the task, e.g. `self.attrs[robot_id].SetJointPosition(action)`.
+        The default calls no command, so the step only simulates.
+
+        :param action: Gym action.
+        """
+        pass
+
+    def get_step_result(self) -> tuple[gym.core.ObsType, SupportsFloat, bool, bool, dict[str, Any]]:
+        """
+        Build the result of a Gym step from `attrs` and `data` once `gym_step_wait` has received it.
+        Override it with the observation, reward and termination of the task.
+        The default observes the data of every object by ID, with no reward, and never terminates.
+
+        :return: A tuple containing the observation, reward, terminated flag, truncated flag and info dictionary.
+        """
+        return {id: obj.data for id, obj in self.attrs.items()}, 0.0, False, False, {}
+
+    def gym_step_async(self, action: gym.core.ActType) -> None:
+        """
+        Apply an action with `apply_action` and send the step to Unity without waiting for it, like `VecEnv.step_async`.
+        A vectorized caller sends the step of every environment first, then waits for each with `gym_step_wait`,
+        so that the environments simulate at the same time and the caller can compute meanwhile.
+        Commands called before `gym_step_wait` raise a RuntimeError, see `RCareWorld.step_async`.
+
+        :param action: Gym action, passed to `apply_action`.
+        """
+        self.apply_action(action)
+        self.step_async()
+
+    def gym_step_wait(self) -> tuple[gym.core.ObsType, SupportsFloat, bool, bool, dict[str, Any]]:
+        """
+        Wait for the step sent by `gym_step_async`.
+
+        :return: A tuple containing the observation, reward, terminated flag, truncated flag and info dictionary, from `get_step_result`.
+        """
+        self.step_wait()
+        return self.get_step_result()
 
     def step(self, action: gym.core.ActType) -> tuple[gym.core.ObsType, SupportsFloat, bool, bool, dict[str, Any]]:
         """
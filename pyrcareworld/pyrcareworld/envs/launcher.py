@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+from pyrcareworld.envs.base_env import RCareWorld
+
+
+def launch_envs(count: int, env_type: type = RCareWorld, max_workers: int = None, first_proc_id: int = 0, **kwargs) -> list:
+    """
+    Launch several Unity players at once, each with its own environment.
+
+    `RCareWorld.__init__` blocks until its player has booted, connected and loaded the scene, so creating environments
+    one after another takes the sum of their boot times. Here every environment is created on a thread of its own,
+    and the waits on the players overlap. Each future resolves to a ready environment, or raises the error of that
+    environment alone, e.g. `ConnectionError` if its player exited before connecting. Players of failed environments are killed.
+    The time spent in each launch phase is in `env.launch_timings`: "process_start", "connect", "scene_init",
+    and "preload" and "load_scene" if `assets` or `scene_file` are given.
+
+    Example::
+
+        futures = launch_envs(32, executable_file=path, assets=["franka_panda"])
+        envs = [future.result() for future in futures]
+
+    :param count: Int, the number of environments.
+    :param env_type: Type, `RCareWorld` or a subclass of it. `AsyncRCareWorld` is created with `asyncio.gather` instead.
+    :param max_workers: Int, the maximum number of players booting at the same time. None for `count`.
+    :param first_proc_id: Int, the `proc_id` of the first environment, the others follow.
+    :param kwargs: The parameters of `env_type`, the same for every environment.
+    :return: List, a `concurrent.futures.Future` per environment.
+    """
+    if getattr(env_type, "is_async", False):
+        raise ValueError("Async environments are launched with asyncio.gather(*[AsyncRCareWorld.create(...)])")
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(count, 1), thread_name_prefix="launch_envs")
+    futures = [executor.submit(env_type, proc_id=first_proc_id + i, **kwargs) for i in range(count)]
+    # The threads exit once every environment is ready.
+    executor.shutdown(wait=False)
+    return futures
@@ -0,0 +1,172 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.envs.launcher import launch_envs
+
+
+class RCareWorldPool:
+    """
+    A group of environments stepped together from one process.
+
+    Stepping an environment is mostly waiting for its player, so `step` first sends the step to every player
+    with `RCareWorld.step_async`, then receives the results with `RCareWorld.step_wait` on a pool of threads.
+    All players simulate at the same time, and the threads overlap the socket reads, which release the GIL.
+    Decoding holds the GIL, so with small frames `threads=0`, which receives the results one environment after
+    another on the calling thread, can be as fast. Commands are called on each environment as usual, or on several
+    at once with `call` and `call_attr`, and `gather` stacks the data of an object across environments into a numpy array.
+
+    Example::
+
+        pool = RCareWorldPool.launch(32, executable_file=path, scene_file="scene.json")
+        pool.call_attr(robot_id, "SetJointPosition", [0.0] * 7)
+        pool.step()
+        joint_positions = pool.gather(robot_id, "joint_positions")  # shape (32, 7)
+
+    :param envs: List, the environments, which the pool closes in `close`. They must not be `AsyncRCareWorld`.
+    :param reset_fn: Callable, called with an environment by `reset` to reset it, e.g. `lambda env: env.Restore(handle)`.
+        It may only call commands, which `reset` then sends with one step of all the reset environments together,
+        or step the environment itself as `Restore` does, which `reset` then does not step again.
+        `reset` raises a ValueError without it.
+    :param threads: Int, the number of threads receiving the results of `step`. None for one per environment, up to 32.
+        0 to receive them on the calling thread.
+    """
+
+    def __init__(self, envs: list, reset_fn=None, threads: int = None):
+        for env in envs:
+            if env.is_async:
+                raise ValueError("AsyncRCareWorld environments are stepped with asyncio.gather instead")
+        self.envs = list(envs)
+        self.reset_fn = reset_fn
+        if threads is None:
+            threads = min(32, len(self.envs))
+        self.executor = ThreadPoolExecutor(threads) if threads > 0 else None
+
+    @classmethod
+    def launch(cls, count: int, env_type: type = RCareWorld, reset_fn=None, threads: int = None, **kwargs):
+        """
+        Launch the players of a new pool concurrently, see `launch_envs`.
+        If any environment fails to start, the others are closed and its error is raised.
+
+        :param count: Int, the number of environments.
+        :param env_type: Type, `RCareWorld` or a subclass of it.
+        :param reset_fn: Callable, see `RCareWorldPool`.
+        :param threads: Int, see `RCareWorldPool`.
+        :param kwargs: The parameters of `env_type`, the same for every environment.
+        :return: RCareWorldPool, the pool.
+        """
+        futures = launch_envs(count, env_type, **kwargs)
+        envs = []
+        error = None
+        for future in futures:
+            try:
+                envs.append(future.result())
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            for env in envs:
+                env.close()
+            raise error
+        return cls(envs, reset_fn, threads)
+
+    def __len__(self) -> int:
+        return len(self.envs)
+
+    def __getitem__(self, index: int) -> RCareWorld:
+        return self.envs[index]
+
+    def _select(self, indices) -> list:
+        if indices is None:
+            return self.envs
+        return [self.envs[i] for i in indices]
+
+    def step(self, count: int = 1, simulate: bool = True, collect: bool = True, fast_forward: bool = False, indices: list = None) -> None:
+        """
+        Step the environments together. Each environment steps as with `RCareWorld.step`.
+
+        :param count: Int, the number of steps for executing Unity simulation.
+        :param simulate: Bool, True to simulate physics, False otherwise.
+        :param collect: Bool, True to collect data, False otherwise.
+        :param fast_forward: Bool, True to simulate the `count` steps in a single round trip, see `RCareWorld.step`.
+        :param indices: List, the indices of the environments to step. None for all of them.
+        """
+        envs = self._select(indices)
+        sent = []
+        try:
+            for env in envs:
+                env.step_async(count, simulate, collect, fast_forward)
+                sent.append(env)
+        finally:
+            if self.executor is None:
+                for env in sent:
+                    env.step_wait()
+            else:
+                for future in [self.executor.submit(env.step_wait) for env in sent]:
+                    future.result()
+
+    def call(self, method: str, *args, indices: list = None, **kwargs) -> list:
+        """
+        Call a method of the environments, e.g. `pool.call("SetTimeScale", 2)`. Commands are sent at the next `step`.
+
+        :param method: Str, the method name.
+        :param indices: List, the indices of the environments. None for all of them.
+        :return: List, the result of each call.
+        """
+        return [getattr(env, method)(*args, **kwargs) for env in self._select(indices)]
+
+    def call_attr(self, id: int, method: str, *args, indices: list = None, **kwargs) -> list:
+        """
+        Call a method of the object `id` in the environments, e.g. `pool.call_attr(robot_id, "SetJointPosition", joints)`.
+
+        :param id: Int, the object ID.
+        :param method: Str, the method name.
+        :param indices: List, the indices of the environments. None for all of them.
+        :return: List, the result of each call.
+        """
+        return [getattr(env.attrs[id], method)(*args, **kwargs) for env in self._select(indices)]
+
+    def Collect(self, indices: list = None) -> None:
+        """
+        Collect the data of the environments at the next `step`, for steps called with `collect=False`.
+
+        :param indices: List, the indices of the environments. None for all of them.
+        """
+        self.call("Collect", indices=indices)
+
+    def gather(self, id: int, key: str, indices: list = None) -> np.ndarray:
+        """
+        Stack a value of the data of an object across environments.
+
+        :param id: Int, the object ID.
+        :param key: Str, the key in `attr.data`, e.g. "joint_positions".
+        :param indices: List, the indices of the environments. None for all of them.
+        :return: np.ndarray, the values, with the environment index as the first axis.
+        """
+        return np.stack([np.asarray(env.attrs[id].data[key]) for env in self._select(indices)])
+
+    def reset(self, indices: list = None) -> None:
+        """
+        Reset some of the environments with `reset_fn`, e.g. those whose episode ended, and step the ones
+        `reset_fn` did not already step once to collect their new data. The other environments are not stepped.
+
+        :param indices: List, the indices of the environments to reset. None for all of them.
+        :raises ValueError: If the pool has no `reset_fn`.
+        """
+        if self.reset_fn is None:
+            raise ValueError("RCareWorldPool.reset needs a reset_fn, e.g. RCareWorldPool(envs, reset_fn=lambda env: env.Restore(handle))")
+        unsynced = []
+        for i, env in zip(range(len(self.envs)) if indices is None else indices, self._select(indices)):
+            issued_step = env.issued_step
+            self.reset_fn(env)
+            if env.issued_step == issued_step:
+                unsynced.append(i)
+        if len(unsynced) > 0:
+            self.step(simulate=False, indices=unsynced)
+
+    def close(self) -> None:
+        """
+        Close every environment.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+        for env in self.envs:
+            env.close()
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator, COMPRESSED_FRAME_FLAG
+from pyrcareworld.utils.frame_trace import TRACE_RECEIVED
+
+
+class AsyncRFUniverseCommunicator(RFUniverseCommunicator):
+    """
+    Communicator running on `asyncio` streams, so that one event loop can drive many Unity players.
+    Encoding and decoding are shared with `RFUniverseCommunicator`. Outgoing frames are always queued
+    and written in one batch by `sync_step`, so sending a command never blocks.
+    `online`, `sync_step` and `receive_step` are coroutines.
+
+    Frames are received as `bytes`. Zero-copy mode and the reader thread are not supported.
+    A release player's `player_process` is polled while connected, and its exit fails the pending `online` or step
+    with ConnectionError, like the polling in `RFUniverseCommunicator._accept`.
+    Takes the same parameters as `RFUniverseCommunicator`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["zero_copy"] = False
+        kwargs["batch_send"] = True
+        kwargs["reader_thread"] = False
+        super().__init__(*args, **kwargs)
+        self.reader = None
+        self.writer = None
+        self.player_watcher = None
+
+    async def online(self):
+        connection = asyncio.get_running_loop().create_future()
+
+        def on_connect(reader, writer):
+            if connection.done():
+                writer.close()
+            else:
+                connection.set_result((reader, writer))
+
+        if self.server is not None:
+            # Release mode, listening on the port picked when the communicator was created.
+            self.server = await asyncio.start_server(on_connect, sock=self.server)
+            print(f"Waiting for connections on port: {self.port}...")
+        elif self.transport == "unix":
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.server = await asyncio.start_unix_server(on_connect, path=self.socket_path)
+            print(f"Waiting for connections on socket: {self.socket_path}...")
+        else:
+            self.server = await asyncio.start_server(on_connect, "localhost", self.port)
+            print(f"Waiting for connections on port: {self.port}...")
+        if self.player_process is not None:
+            self.player_watcher = asyncio.ensure_future(self._watch_player(connection))
+        self.reader, self.writer = await connection
+        print(f"Connected successfully")
+        self.connected = True
+        await self.receive_step()
+
+    async def _watch_player(self, connection: asyncio.Future):
+        # Reads wait on the socket only, so a player that dies while another process keeps its socket open
+        # would hang them. Poll the process and fail whatever is waiting once it exits.
+        while self.player_process.poll() is None:
+            await asyncio.sleep(0.5)
+        code = self.player_process.returncode
+        if not connection.done():
+            connection.set_exception(ConnectionError(f"The player exited with code {code} before connecting"))
+        elif self.connected:
+            self.connected = False
+            self.reader.set_exception(ConnectionError(f"The player exited with code {code}"))
+
+    def close(self):
+        if self.player_watcher is not None:
+            self.player_watcher.cancel()
+            self.player_watcher = None
+        if self.writer is not None:
+            self.writer.close()
+        if self.server is not None:
+            self.server.close()
+        self.connected = False
+        if self.transport == "unix" and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        if self.shared_memory is not None:
+            self.shared_memory.close()
+            self.shared_memory = None
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+
+    def run(self):
+        raise NotImplementedError("AsyncRFUniverseCommunicator does not run in a thread")
+
+    async def sync_step(self):
+        start = time.perf_counter()
+        self.send_object("StepStart")
+        self.flush()
+        await self.writer.drain()
+        if self.stats is not None:
+            self.stats.add_phase("send", start, time.perf_counter())
+        await self.receive_step()
+
+    async def receive_step(self):
+        self.command_ids = self._next_command_ids()
+        if self.stats is not None:
+            return await self._receive_step_with_stats()
+        while True:
+            if not self.connected:
+                raise ConnectionError("Connection closed")
+            data = await self.receive_bytes()
+            if data is not None and len(data) > 0:
+                objs = self.receive_object(data)
+                if len(objs) > 0 and objs[0] == "StepEnd":
+                    break
+                self.on_receive_data(objs)
+
+    async def _receive_step_with_stats(self):
+        first = True
+        while True:
+            if not self.connected:
+                raise ConnectionError("Connection closed")
+            start = time.perf_counter()
+            data = await self.receive_bytes()
+            if data is not None and len(data) > 0:
+                received = time.perf_counter()
+                objs = self.receive_object(data)
+                decoded = time.perf_counter()
+                if len(objs) > 0 and objs[0] == "StepEnd":
+                    self.stats.add_frame(objs, len(data), start, received, decoded, decoded, first)
+                    break
+                self.on_receive_data(objs)
+                self.stats.add_frame(objs, len(data), start, received, decoded, time.perf_counter(), first)
+                first = False
+
+    async def receive_bytes(self):
+        try:
+            length = int.from_bytes(await self.reader.readexactly(4), byteorder="little", signed=False)
+            compressed = length & COMPRESSED_FRAME_FLAG
+            length &= ~COMPRESSED_FRAME_FLAG
+            if length == 0:
+                return None
+            data = await self.reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            self.connected = False
+            raise ConnectionError("Connection closed")
+        if compressed:
+            data = self._decompress_frame(data)
+        if self.trace is not None:
+            self.trace.write(TRACE_RECEIVED, data)
+        return data
+
+    def _write_buffers(self, buffers: list):
+        self.writer.writelines(buffers)
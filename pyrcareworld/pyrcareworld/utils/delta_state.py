@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class StateDelta(dict):
+    """
+    The keys of an object's data that changed since the last step, received in delta state mode.
+    `BaseAttr.parse_message` merges it into `attr.data` instead of replacing `attr.data`.
+
+    :param changed: Dict, the changed keys and their new values.
+    :param removed: List, the keys that no longer exist.
+    """
+
+    def __init__(self, changed: dict, removed: list = None):
+        super().__init__(changed)
+        self.removed = [] if removed is None else list(removed)
+
+    def merge(self, state: dict) -> dict:
+        """
+        Apply the delta to a state.
+
+        :param state: Dict, the previous state of the object.
+        :return: Dict, a new dict with the state after this step.
+        """
+        merged = dict(state)
+        merged.update(self)
+        for key in self.removed:
+            merged.pop(key, None)
+        return merged
+
+
+def _equal(a, b) -> bool:
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and a.shape == b.shape and np.array_equal(a, b)
+    return type(a) == type(b) and a == b
+
+
+class DeltaStateEncoder:
+    """
+    The sender side of delta state mode, as the player implements it.
+    It keeps the last state sent for each object and turns a full state into the arguments of an "Instance" frame:
+    (id, attr_type, data) for a keyframe, (id, attr_type, changed, removed) for a delta.
+
+    :param keyframe_interval: Int, send a full keyframe of every object once every this many steps. 0 to never resync.
+    """
+
+    def __init__(self, keyframe_interval: int = 100):
+        self.keyframe_interval = keyframe_interval
+        self.states = {}
+        self.step_count = 0
+        self.keyframe_requested = True
+
+    def request_keyframe(self) -> None:
+        """
+        Send a keyframe of every object in the next `encode` calls, e.g. after the receiver lost its state.
+        """
+        self.keyframe_requested = True
+
+    def encode(self, id: int, attr_type: str, data: dict) -> tuple:
+        """
+        Encode the state of an object against the last state sent for it.
+
+        :param id: Int, object ID.
+        :param attr_type: Str, the attribute type name.
+        :param data: Dict, the full state of the object.
+        :return: Tuple, the arguments of the "Instance" frame.
+        """
+        last = self.states.get(id)
+        self.states[id] = data
+        if last is None or self.keyframe_requested:
+            return id, attr_type, data
+        changed = {key: value for key, value in data.items() if key not in last or not _equal(last[key], value)}
+        removed = [key for key in last if key not in data]
+        return id, attr_type, changed, removed
+
+    def end_step(self) -> None:
+        """
+        Count a step once every object has been encoded. Keyframes are sent again on every `keyframe_interval`-th step.
+        """
+        self.step_count += 1
+        self.keyframe_requested = self.keyframe_interval > 0 and self.step_count % self.keyframe_interval == 0
@@ -0,0 +1,83 @@
+import threading
+from collections import deque
+
+
+class FrameReader(threading.Thread):
+    """
+    Background thread that keeps reading frames from the socket of a `RFUniverseCommunicator` into a bounded queue,
+    see `RFUniverseCommunicator(reader_thread=True)`.
+
+    The socket is read, and compressed frames are decompressed, while the caller's thread decodes and dispatches
+    earlier frames. Both `recv` and decompression release the GIL, so they overlap with decoding.
+    Frames are queued in the order they are received and `get` returns them in the same order.
+
+    The queue holds at most `max_frames` frames and `max_bytes` bytes. Once it is full the thread stops reading,
+    so the socket buffers fill up and the player blocks, instead of frames piling up in memory. A single frame
+    larger than `max_bytes` is still queued when the queue is empty.
+
+    :param communicator: RFUniverseCommunicator, a connected communicator.
+    :param max_frames: Int, the maximum number of queued frames.
+    :param max_bytes: Int, the maximum number of queued bytes.
+    """
+
+    def __init__(self, communicator, max_frames: int = 64, max_bytes: int = 256 * 1024 * 1024):
+        threading.Thread.__init__(self, daemon=True)
+        self.communicator = communicator
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.frames = deque()
+        self.queued_bytes = 0
+        self.error = None
+        self.condition = threading.Condition()
+        self.stats = {
+            "frames": 0,
+            "bytes": 0,
+            "max_queued_frames": 0,
+            "full_waits": 0,
+        }
+
+    def run(self) -> None:
+        try:
+            while True:
+                data = self.communicator.receive_bytes()
+                if data is None or len(data) == 0:
+                    continue
+                self._put(data)
+        except Exception as e:
+            with self.condition:
+                self.error = e
+                self.condition.notify_all()
+
+    def _put(self, data) -> None:
+        size = len(data)
+        with self.condition:
+            if self._full():
+                self.stats["full_waits"] += 1
+                while self._full():
+                    self.condition.wait()
+            self.frames.append(data)
+            self.queued_bytes += size
+            self.stats["frames"] += 1
+            self.stats["bytes"] += size
+            self.stats["max_queued_frames"] = max(self.stats["max_queued_frames"], len(self.frames))
+            self.condition.notify_all()
+
+    def _full(self) -> bool:
+        return len(self.frames) > 0 and (len(self.frames) >= self.max_frames or self.queued_bytes >= self.max_bytes)
+
+    def get(self):
+        """
+        Wait for the next frame.
+
+        :return: Bytes-like, the frame payload, as `RFUniverseCommunicator.receive_bytes` returns it.
+        :raises ConnectionError: If the connection was closed and every frame received before has been returned.
+        """
+        with self.condition:
+            while len(self.frames) == 0:
+                if self.error is not None:
+                    raise ConnectionError("Connection closed") from self.error
+                self.condition.wait()
+            data = self.frames.popleft()
+            self.queued_bytes -= len(data)
+            self.condition.notify_all()
+            return data
@@ -0,0 +1,143 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+TRACE_MAGIC = b"RCWTRACE"
+TRACE_VERSION = 1
+# Direction of a frame, as seen from pyrcareworld.
+TRACE_RECEIVED = 0
+TRACE_SENT = 1
+# Timestamp in seconds since the trace was opened, direction, frame length.
+_RECORD_HEADER = struct.Struct("<dBI")
+_FILE_HEADER = struct.Struct("<8sI")
+
+
+class FrameTraceWriter:
+    """
+    Append-only recorder of the frames exchanged by `RFUniverseCommunicator`, see `RCareWorld(trace_file=...)`.
+
+    The file starts with a header, followed by one record per frame: a timestamp, the direction and the frame
+    payload without its length prefix. Compressed frames are recorded decompressed, so a trace can be replayed
+    whatever compression was negotiated. Frames carrying "shm" descriptors refer to a shared memory ring that
+    only exists during the session, so sessions using shared memory cannot be replayed.
+
+    The file is memory-mapped and grows `chunk_size` bytes at a time, so recording a frame is a copy into the mapping.
+    The unused tail is zeros and is cut off by `close`. A record is written before its header, so the trace of
+    a process that died while recording ends at the first zero header, after the last complete record.
+
+    :param path: Str, the trace file. Frames are appended if it already exists.
+    :param chunk_size: Int, the number of bytes the file grows by when the mapping is full.
+    """
+
+    def __init__(self, path: str, chunk_size: int = 64 * 1024 * 1024):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.file = open(path, "a+b")
+        size = os.fstat(self.file.fileno()).st_size
+        if size == 0:
+            self._map(chunk_size)
+            _FILE_HEADER.pack_into(self.mmap, 0, TRACE_MAGIC, TRACE_VERSION)
+            self.offset = _FILE_HEADER.size
+        else:
+            self._map(size)
+            _check_header(self.mmap, path)
+            self.offset = _FILE_HEADER.size
+            for _, _, frame in _records(self.mmap):
+                self.offset = frame.stop
+        self.start = time.perf_counter()
+        self.frames = 0
+        # Received frames are written from the reader thread of `RFUniverseCommunicator(reader_thread=True)`.
+        self.lock = threading.Lock()
+
+    def _map(self, size: int) -> None:
+        self.file.truncate(size)
+        self.mmap = mmap.mmap(self.file.fileno(), size)
+
+    def write(self, direction: int, data: bytes) -> None:
+        """
+        Append a frame.
+
+        :param direction: Int, `TRACE_RECEIVED` or `TRACE_SENT`.
+        :param data: Bytes-like, the frame payload.
+        """
+        with self.lock:
+            length = len(data)
+            end = self.offset + _RECORD_HEADER.size + length
+            size = len(self.mmap)
+            if end > size:
+                self.mmap.close()
+                self._map(max(end, size + self.chunk_size))
+            self.mmap[self.offset + _RECORD_HEADER.size: end] = data
+            _RECORD_HEADER.pack_into(self.mmap, self.offset, time.perf_counter() - self.start, direction, length)
+            self.offset = end
+            self.frames += 1
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.mmap.closed:
+                self.mmap.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            if not self.file.closed:
+                self.mmap.close()
+                self.file.truncate(self.offset)
+                self.file.close()
+
+
+def _check_header(buffer, path: str) -> None:
+    if len(buffer) < _FILE_HEADER.size:
+        raise ValueError(f"This file is not a frame trace: {path}")
+    magic, version = _FILE_HEADER.unpack_from(buffer, 0)
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"This file is not a frame trace: {path}")
+    if version != TRACE_VERSION:
+        raise ValueError(f"This trace version is unsupported: {version}")
+
+
+def _records(buffer):
+    # Yield (timestamp, direction, slice) of every complete record.
+    offset = _FILE_HEADER.size
+    size = len(buffer)
+    while offset + _RECORD_HEADER.size <= size:
+        timestamp, direction, length = _RECORD_HEADER.unpack_from(buffer, offset)
+        if timestamp == 0 and length == 0:
+            # The zero tail of a trace that was not closed.
+            break
+        offset += _RECORD_HEADER.size
+        if offset + length > size:
+            # A record cut short by a crash while recording.
+            break
+        yield timestamp, direction, slice(offset, offset + length)
+        offset += length
+
+
+class FrameTrace:
+    """
+    Reader of a trace written by `FrameTraceWriter`. The file is memory-mapped, and iterating yields
+    (timestamp, direction, frame) tuples where the frame is a read-only `memoryview` of the mapping.
+
+    :param path: Str, the trace file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _FILE_HEADER.size:
+                raise ValueError(f"This file is not a frame trace: {path}")
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self.mmap, path)
+        self.buffer = memoryview(self.mmap).toreadonly()
+
+    def __iter__(self):
+        for timestamp, direction, frame in _records(self.buffer):
+            yield timestamp, direction, self.buffer[frame]
+
+    def close(self) -> None:
+        try:
+            self.buffer.release()
+            self.mmap.close()
+        except BufferError:
+            pass
@@ -0,0 +1,128 @@
+class _LazyValue:
+    __slots__ = ("offset",)
+
+    def __init__(self, offset: int):
+        self.offset = offset
+
+
+class LazyDict(dict):
+    """
+    A dict whose values are decoded from the received frame the first time they are accessed.
+    Keys are known up front, so `in`, `len` and iterating over keys never decode anything.
+    Any method that returns values (`items`, `values`, `copy`, `==`, ...) decodes the remaining values first.
+    It keeps a reference to the frame it was received in until every value is decoded.
+
+    :param communicator: RFUniverseCommunicator, used to decode the values.
+    :param datas: Bytes-like, the received frame.
+    """
+
+    def __init__(self, communicator, datas):
+        super().__init__()
+        self._communicator = communicator
+        self._datas = datas
+        self._protocol_version = communicator.protocol_version
+        self._pending = 0
+
+    def _add_lazy(self, key, offset: int):
+        if not isinstance(dict.get(self, key), _LazyValue):
+            self._pending += 1
+        dict.__setitem__(self, key, _LazyValue(offset))
+
+    def _decode(self, key, value):
+        communicator = self._communicator
+        read_offset, protocol_version = communicator.read_offset, communicator.protocol_version
+        communicator.read_offset, communicator.protocol_version = value.offset, self._protocol_version
+        try:
+            value = communicator.read_object(self._datas)
+        finally:
+            communicator.read_offset, communicator.protocol_version = read_offset, protocol_version
+        dict.__setitem__(self, key, value)
+        self._pending -= 1
+        if self._pending == 0:
+            self._datas = None
+        return value
+
+    def _decode_all(self):
+        if self._pending == 0:
+            return
+        for key, value in list(dict.items(self)):
+            if isinstance(value, _LazyValue):
+                self._decode(key, value)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, _LazyValue):
+            value = self._decode(key, value)
+        return value
+
+    def __setitem__(self, key, value):
+        if isinstance(dict.get(self, key), _LazyValue):
+            self._pending -= 1
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if isinstance(dict.get(self, key), _LazyValue):
+            self._pending -= 1
+        dict.__delitem__(self, key)
+
+    def __iter__(self):
+        # Overriding __iter__ also makes dict(lazy) and {**lazy} go through keys() and __getitem__.
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            dict.__delitem__(self, key)
+            return value
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._decode_all()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def values(self):
+        self._decode_all()
+        return dict.values(self)
+
+    def items(self):
+        self._decode_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._decode_all()
+        return dict(dict.items(self))
+
+    def __eq__(self, other):
+        self._decode_all()
+        if isinstance(other, LazyDict):
+            other._decode_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._decode_all()
+        return dict.__repr__(self)
+
+    def __or__(self, other):
+        self._decode_all()
+        return dict(dict.items(self)) | other
+
+    def __ror__(self, other):
+        self._decode_all()
+        return other | dict(dict.items(self))
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
@@ -0,0 +1,358 @@
+import base64
+import math
+import multiprocessing as mp
+import socket
+import time
+import cv2
+import numpy as np
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator, PROTOCOL_VERSION, available_compressions
+from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing
+from pyrcareworld.utils.delta_state import DeltaStateEncoder
+
+
+class _SharedMemoryPayload(tuple):
+    # A (slot, offset, length, sequence) descriptor of a payload in the shared memory ring, written as "shm".
+    pass
+
+
+class MockUnityPlayer:
+    """
+    A pure-Python stand-in for the Unity player, for testing and benchmarking without Unity.
+    It connects to `RCareWorld` in editor mode and speaks the same framing: every `StepStart` is answered with
+    an "Env" frame, the "Instance" frames of the scene if `Collect` was called, and `StepEnd`.
+
+    The scene is synthesized: `controllers` robots whose joints move on every `Simulate`, `cameras` cameras with
+    fake image bytes, `cloths` cloths with `particles` particles each, and `digits` DIGIT sensors with PNG light and depth images. Objects loaded with `InstanceObject`,
+    `LoadURDF`, `LoadMesh` and `LoadCloth` are added to the scene, and `LoadSceneAsync` puts the scene back as it started.
+    The object commands that `RCareWorld.Restore` sends set the transforms and velocities of objects, and joint states until the next `Simulate`.
+    Other commands are counted in `commands` and ignored.
+
+    It advertises and supports every optional feature of `RCareWorld`: protocol version 2, compression,
+    typed arrays, raw sensor bytes, shared memory, delta state and collect filters.
+    With `shared_memory=False` it leaves shared memory out, like a player without it.
+
+    Example::
+
+        player = MockUnityPlayer(port=5004, controllers=4, cameras=1)
+        player.start()
+        env = RCareWorld(executable_file="@editor", port=5004)
+
+    :param port: Int, the port `RCareWorld` listens on.
+    :param controllers: Int, the number of ControllerAttr robots.
+    :param joints: Int, the number of joints of each robot.
+    :param cameras: Int, the number of CameraAttr cameras.
+    :param image_size: Tuple, the (width, height) of the fake RGB images.
+    :param cloths: Int, the number of ClothAttr cloths.
+    :param particles: Int, the number of particles of each cloth.
+    :param digits: Int, the number of DigitAttr tactile sensors.
+    :param digit_size: Tuple, the (width, height) of the DIGIT images.
+    :param step_time: Float, the time in seconds to wait before answering each step, standing in for the time Unity spends simulating and rendering it.
+    :param load_time: Float, the time in seconds `LoadSceneAsync` and `PreLoadAssetsAsync` take, standing in for Unity loading the assets.
+    :param shared_memory: Bool, True to advertise shared memory.
+    :param transport: Str, "tcp" or "unix", see `RFUniverseCommunicator`.
+    :param socket_path: Str, the Unix domain socket path. None for the default path of `port`.
+    :param connect_timeout: Float, the time in seconds to keep retrying to connect.
+    """
+
+    def __init__(
+            self,
+            port: int = 5004,
+            controllers: int = 1,
+            joints: int = 9,
+            cameras: int = 0,
+            image_size: tuple = (640, 480),
+            cloths: int = 0,
+            particles: int = 1000,
+            digits: int = 0,
+            digit_size: tuple = (240, 320),
+            step_time: float = 0,
+            load_time: float = 0,
+            shared_memory: bool = True,
+            transport: str = "tcp",
+            socket_path: str = None,
+            connect_timeout: float = 30,
+    ):
+        self.port = port
+        self.joints = joints
+        self.image_size = image_size
+        self.particles = particles
+        self.digit_size = digit_size
+        self.step_time = step_time
+        self.load_time = load_time
+        self.shared_memory = shared_memory
+        self.transport = transport
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+        self.objects = {}
+        for i in range(controllers):
+            self.objects[1000 + i] = "ControllerAttr"
+        for i in range(cameras):
+            self.objects[2000 + i] = "CameraAttr"
+        for i in range(cloths):
+            self.objects[3000 + i] = "ClothAttr"
+        for i in range(digits):
+            self.objects[4000 + i] = "DigitAttr"
+        self.scene_objects = dict(self.objects)
+        self.commands = {}
+        self.process = None
+
+    def start(self) -> mp.Process:
+        """
+        Run the player in a daemon process, so that it does not share the GIL with the code under test.
+
+        :return: multiprocessing.Process, the player process.
+        """
+        self.process = mp.Process(target=self.run, daemon=True)
+        self.process.start()
+        return self.process
+
+    def join(self, timeout: float = None) -> None:
+        """
+        Wait for the player process to exit, which it does once `RCareWorld` closes the connection.
+
+        :param timeout: Float, the time in seconds to wait, None to wait forever.
+        """
+        if self.process is not None:
+            self.process.join(timeout)
+
+    def run(self) -> None:
+        """
+        Connect to `RCareWorld` and serve steps until the connection is closed.
+        """
+        self._reset()
+        self.communicator.client = self._connect()
+        self.communicator.connected = True
+        self.communicator.send_object("StepEnd")
+        try:
+            while True:
+                objs = self.communicator.receive_object(self.communicator.receive_bytes())
+                if objs[0] == "StepStart":
+                    self._step()
+                elif objs[0] == "Env":
+                    self._on_env(objs[1], objs[2:])
+                elif objs[0] == "Instance":
+                    self._on_instance(objs[1], objs[2], objs[3:])
+                else:
+                    self._count(f"{objs[0]}.{objs[1] if len(objs) > 1 else ''}")
+        except (AssertionError, ConnectionError, OSError):
+            pass
+        finally:
+            self.communicator.client.close()
+            if self.communicator.shared_memory is not None:
+                self.communicator.shared_memory.close()
+
+    def _reset(self) -> None:
+        self.communicator = RFUniverseCommunicator(proc_type="editor", port=self.port, transport=self.transport, socket_path=self.socket_path)
+        self.communicator._object_writers[_SharedMemoryPayload] = self._write_shared_memory_payload
+        self.env_data = {"scene_init": True}
+        self.collect = False
+        self.collect_filter = None
+        self.delta_encoder = None
+        self.wire_format = {}
+        self.raw_sensor_bytes = False
+        # Seeded, so that players with the same options send the same data.
+        rng = np.random.default_rng(0)
+        width, height = self.image_size
+        self.image = rng.integers(0, 256, width * height * 3, dtype=np.uint8).tobytes()
+        width, height = self.digit_size
+        y, x = np.mgrid[0:height, 0:width]
+        light = np.stack([x * 255 // width, y * 255 // height, (x * y) % 256], axis=-1).astype(np.uint8)
+        light = cv2.add(light, rng.integers(0, 16, light.shape, dtype=np.uint8))
+        depth = (np.hypot(x - width / 2, y - height / 2) < min(width, height) / 4).astype(np.uint8) * 200
+        self.digit_light = cv2.imencode(".png", light)[1].tobytes()
+        self.digit_depth = cv2.imencode(".png", depth)[1].tobytes()
+        self._load_scene()
+
+    def _load_scene(self) -> None:
+        self.time = 0.0
+        self.objects = dict(self.scene_objects)
+        self.static_data = {id: self._static_data(id, attr_type) for id, attr_type in self.objects.items()}
+        self.joint_states = {}
+
+    def _connect(self) -> socket.socket:
+        deadline = time.time() + self.connect_timeout
+        while True:
+            try:
+                if self.transport == "unix":
+                    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    client.connect(self.communicator.socket_path)
+                else:
+                    client = socket.create_connection(("localhost", self.port))
+                    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return client
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def _count(self, command: str) -> None:
+        self.commands[command] = self.commands.get(command, 0) + 1
+
+    def _on_env(self, command: str, args: list) -> None:
+        self._count(command)
+        if command == "Collect":
+            self.collect = True
+        elif command == "Simulate":
+            self.time += 0.02 * max(int(args[1]), 1)
+            self.joint_states = {}
+        elif command == "SetProtocolVersion":
+            self.wire_format["protocol_version"] = args[0]
+        elif command == "SetCompression":
+            self.wire_format["compression"] = args[0]
+            self.communicator.compression_threshold = args[1]
+        elif command == "SetTypedArrays":
+            self.wire_format["typed_arrays"] = args[0]
+        elif command == "SetRawSensorBytes":
+            self.raw_sensor_bytes = args[0]
+        elif command == "SetSharedMemory":
+            self.communicator.shared_memory = SharedMemoryRing(args[0], args[1], args[2], create=False)
+            self.communicator.shared_memory.step_budget = args[3]
+        elif command == "SetDeltaState":
+            self.delta_encoder = DeltaStateEncoder(args[1]) if args[0] else None
+        elif command == "RequestKeyframe":
+            if self.delta_encoder is not None:
+                self.delta_encoder.request_keyframe()
+        elif command == "SetCollectFilter":
+            self.collect_filter = args[0] if len(args[0]) > 0 else None
+        elif command in ["PreLoadAssetsAsync", "LoadSceneAsync"]:
+            time.sleep(self.load_time)
+            if command == "LoadSceneAsync":
+                self._load_scene()
+            self.env_data["load_done"] = True
+        elif command == "SwitchSceneAsync":
+            self.env_data["scene_init"] = True
+        elif command == "Pend":
+            self.env_data["pend_done"] = True
+        elif command in ["InstanceObject", "LoadURDF", "LoadMesh", "LoadCloth"]:
+            self._add_object(command, args)
+
+    def _on_instance(self, id: int, command: str, args: list) -> None:
+        self._count(f"Instance.{command}")
+        if id not in self.objects:
+            return
+        key = {
+            "SetPosition": "position",
+            "SetRotationQuaternion": "quaternion",
+            "SetVelocity": "velocity",
+            "SetAngularVelocity": "angular_velocity",
+            "SetJointPositionDirectly": "joint_positions",
+            "SetJointVelocity": "joint_velocities",
+        }.get(command)
+        if key in ["joint_positions", "joint_velocities"]:
+            self.joint_states.setdefault(id, {})[key] = list(args[0])
+        elif key is not None:
+            self.static_data[id][key] = list(args[0])
+
+    def _add_object(self, command: str, args: list) -> None:
+        if command == "LoadCloth":
+            id, attr_type = args[1], "ClothAttr"
+        else:
+            id, attr_type = args[1] if command == "InstanceObject" else args[0], {
+                "InstanceObject": "GameObjectAttr",
+                "LoadURDF": "ControllerAttr",
+                "LoadMesh": "RigidbodyAttr",
+            }[command]
+        self.objects[id] = attr_type
+        self.static_data[id] = self._static_data(id, attr_type)
+
+    def _step(self) -> None:
+        if self.step_time > 0:
+            time.sleep(self.step_time)
+        if self.env_data.get("scene_init"):
+            self.env_data.update({
+                "protocol_version": PROTOCOL_VERSION,
+                "compression": available_compressions(),
+                "collect_filter": True,
+                "delta_state": True,
+                "typed_array": True,
+                "raw_sensor_bytes": True,
+                "shared_memory": self.shared_memory,
+            })
+        self.communicator.send_object("Env", self.env_data)
+        self.env_data = {}
+        if self.communicator.shared_memory is not None:
+            self.communicator.shared_memory.begin_step()
+        if self.collect:
+            for id, attr_type in self.objects.items():
+                if self.collect_filter is not None and id not in self.collect_filter:
+                    continue
+                data = self._object_data(id, attr_type)
+                fields = None if self.collect_filter is None else self.collect_filter[id]
+                if fields is not None:
+                    data = {key: data[key] for key in fields if key in data}
+                if self.delta_encoder is None:
+                    self.communicator.send_object("Instance", id, attr_type, data)
+                else:
+                    self.communicator.send_object("Instance", *self.delta_encoder.encode(id, attr_type, data))
+            if self.delta_encoder is not None:
+                self.delta_encoder.end_step()
+            self.collect = False
+        self.communicator.send_object("StepEnd")
+        for key, value in self.wire_format.items():
+            setattr(self.communicator, key, value)
+        self.wire_format = {}
+
+    def _write_shared_memory_payload(self, datas: bytearray, obj: _SharedMemoryPayload) -> None:
+        self.communicator.write_type(datas, "shm")
+        for i in obj:
+            self.communicator.write_int(datas, i)
+
+    def _static_data(self, id: int, attr_type: str) -> dict:
+        data = {
+            "name": f"{attr_type}_{id}",
+            "position": [float(id % 10), 0.0, float(id // 10 % 10)],
+            "rotation": [0.0, 0.0, 0.0],
+            "quaternion": [0.0, 0.0, 0.0, 1.0],
+            "local_position": [0.0, 0.0, 0.0],
+            "local_rotation": [0.0, 0.0, 0.0],
+            "local_quaternion": [0.0, 0.0, 0.0, 1.0],
+            "local_to_world_matrix": [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+        }
+        if attr_type == "ControllerAttr":
+            moveable = max(self.joints - 2, 1)
+            data.update({
+                "number_of_joints": self.joints,
+                "names": [f"link{i}" for i in range(self.joints)],
+                "types": ["revolute"] * self.joints,
+                "number_of_moveable_joints": moveable,
+                "joint_lower_limit": [-math.pi] * moveable,
+                "joint_upper_limit": [math.pi] * moveable,
+                "move_done": True,
+                "rotate_done": True,
+            })
+        elif attr_type == "CameraAttr":
+            width, height = self.image_size
+            data.update({"width": width, "height": height, "fov": 60.0})
+        elif attr_type == "ClothAttr":
+            data["particles_count"] = self.particles
+        elif attr_type == "RigidbodyAttr":
+            data["velocity"] = [0.0, 0.0, 0.0]
+            data["angular_velocity"] = [0.0, 0.0, 0.0]
+        return data
+
+    def _object_data(self, id: int, attr_type: str) -> dict:
+        data = dict(self.static_data[id])
+        if attr_type == "ControllerAttr":
+            moveable = data["number_of_moveable_joints"]
+            phases = [self.time + 0.1 * i + 0.01 * id for i in range(self.joints)]
+            data["joint_positions"] = [math.sin(i) for i in phases[:moveable]]
+            data["joint_velocities"] = [math.cos(i) for i in phases[:moveable]]
+            data["positions"] = [[0.0, 0.1 * i, 0.05 * math.sin(phases[i])] for i in range(self.joints)]
+            data["rotations"] = [[0.0, math.degrees(phases[i]) % 360, 0.0] for i in range(self.joints)]
+            data.update(self.joint_states.get(id, {}))
+        elif attr_type == "CameraAttr":
+            descriptor = None
+            if self.communicator.shared_memory is not None:
+                descriptor = self.communicator.shared_memory.write(self.image)
+            # The image comes first, so that skipping it on receive is exercised by the keys after it.
+            data = {"rgb": self.image if descriptor is None else _SharedMemoryPayload(descriptor), **data}
+        elif attr_type == "ClothAttr":
+            rng = np.random.default_rng(int(self.time * 1000) + id)
+            data["particles"] = rng.random((self.particles, 3), dtype=np.float32)
+        elif attr_type == "DigitAttr":
+            if self.raw_sensor_bytes:
+                data["light"], data["depth"] = self.digit_light, self.digit_depth
+            else:
+                data["light"] = base64.b64encode(self.digit_light).decode()
+                data["depth"] = base64.b64encode(self.digit_depth).decode()
+        return data
@@ -1,6 +1,7 @@
 import multiprocessing as mp
 import os
 from collections import OrderedDict
+from multiprocessing import resource_tracker, shared_memory
 from typing import Any, Callable, List, Optional, Sequence, Tuple, Type, Union
 
 import gym
@@ -19,29 +20,53 @@ def _worker(remote: mp.connection.Connection, env_fn, i) -> None:
     from stable_baselines3.common.env_util import is_wrapped
 
     env = env_fn(proc_id=i)
+    kind = None
+    buffers = None
+    shms = []
+    result = None
     while True:
         try:
             cmd, data = remote.recv()
             if cmd == "step":
-                observation, reward, done, info = env.step(data)
-                if done.all():
-                    # save final observation where user can get it, then reset
-                    # TODO - bug here
-                    # for _i, _o in zip([info, observation]):
-                    #     _i["terminal_observation"] = _o
-                    observation = env.reset()
-                remote.send((observation, reward, done, info))
+                _send_step_result(remote, env, env.step(data), kind, buffers)
+            elif cmd == "step_async":
+                # an RCareWorldGymWrapper sends its step to Unity and returns, so that Unity simulates until "step_wait"
+                if hasattr(env, "gym_step_async"):
+                    env.gym_step_async(data)
+                    result = None
+                else:
+                    result = env.step(data)
+            elif cmd == "step_wait":
+                if result is None:
+                    result = env.gym_step_wait()
+                _send_step_result(remote, env, result, kind, buffers)
+                result = None
             elif cmd == "seed":
                 remote.send(env.seed(data))
             elif cmd == "reset":
                 observation = env.reset()
+                if buffers is not None:
+                    _write_obs(buffers, observation)
+                    observation = None
                 remote.send(observation)
             elif cmd == "render":
                 remote.send(env.render(data))
             elif cmd == "close":
                 env.close()
+                buffers = None
+                for shm in shms:
+                    shm.close()
                 remote.close()
                 break
+            elif cmd == "attach_buffers":
+                kind, specs = data
+                buffers = []
+                for key, name, shape, dtype in specs:
+                    # workers share the resource tracker of the parent, which unlinks the blocks in close
+                    shm = shared_memory.SharedMemory(name=name)
+                    shms.append(shm)
+                    buffers.append((key, np.ndarray(shape, dtype, buffer=shm.buf)[i]))
+                remote.send(None)
             elif cmd == "get_spaces":
                 remote.send((env.observation_space, env.action_space))
             elif cmd == "env_method":
@@ -59,6 +84,39 @@ def _worker(remote: mp.connection.Connection, env_fn, i) -> None:
             break
 
 
+def _send_step_result(remote: mp.connection.Connection, env, result: tuple, kind: Optional[str], buffers) -> None:
+    """
+    Send the result of a step of a worker, resetting the environment once every agent is done.
+
+    :param remote: the pipe to the main process.
+    :param env: the environment of the worker.
+    :param result: the `(observation, reward, done, info)` of `step`, or the `(observation, reward, terminated, truncated, info)` of `gym_step_wait`.
+    :param kind: the kind of the observation space, see `_pack_obs`.
+    :param buffers: the shared memory arrays of the worker, see SharedMemorySubprocVecEnv, or None.
+    """
+    if len(result) == 5:
+        observation, reward, terminated, truncated, info = result
+        done = np.logical_or(terminated, truncated)
+    else:
+        observation, reward, done, info = result
+    if buffers is not None:
+        # observations go through shared memory, see SharedMemorySubprocVecEnv
+        _write_obs(buffers, observation)
+        if done.all():
+            for j, agent_info in enumerate(info):
+                agent_info["terminal_observation"] = _pack_obs(kind, [(key, buffer[j].copy()) for key, buffer in buffers])
+            _write_obs(buffers, env.reset())
+        remote.send((reward, done, info))
+    else:
+        if done.all():
+            # save final observation where user can get it, then reset
+            # TODO - bug here
+            # for _i, _o in zip([info, observation]):
+            #     _i["terminal_observation"] = _o
+            observation = env.reset()
+        remote.send((observation, reward, done, info))
+
+
 class SubprocVecEnv(VecEnv):
     """
     Creates a multiprocess vectorized wrapper for multiple environments, distributing each environment to its own
@@ -77,6 +135,10 @@ class SubprocVecEnv(VecEnv):
         ``if __name__ == "__main__":`` block.
         For more information, see the multiprocessing documentation.
 
+    `step_async` sends the actions and `step_wait` collects the results. Environments that are an
+    `RCareWorldGymWrapper` send their step to Unity with `gym_step_async` and receive it with `gym_step_wait`,
+    so Unity simulates in between while the caller computes. Other environments step in `step_async`.
+
     :param env_fns: Environments to run in subprocesses
     :param start_method: method used to start the subprocesses.
            Must be one of the methods returned by multiprocessing.get_all_start_methods().
@@ -125,11 +187,16 @@ class SubprocVecEnv(VecEnv):
         actions = actions.reshape(self.n_proc, -1)
 
         for remote, action in zip(self.remotes, actions):
-            remote.send(("step", action))
+            remote.send(("step_async", action))
         self.waiting = True
 
+    def _receive_step_results(self) -> list:
+        for remote in self.remotes:
+            remote.send(("step_wait", None))
+        return [remote.recv() for remote in self.remotes]
+
     def step_wait(self) -> VecEnvStepReturn:
-        results = [remote.recv() for remote in self.remotes]
+        results = self._receive_step_results()
         self.waiting = False
         obs, rews, dones, infos = zip(*results)
         return (
@@ -156,8 +223,7 @@ class SubprocVecEnv(VecEnv):
         if self.closed:
             return
         if self.waiting:
-            for remote in self.remotes:
-                remote.recv()
+            self._receive_step_results()
         for remote in self.remotes:
             remote.send(("close", None))
         for process in self.processes:
@@ -260,3 +326,125 @@ def _flatten_obs(
         return tuple(np.stack([o[i] for o in obs]) for i in range(obs_len))
     else:
         return np.stack(obs)
+
+
+class SharedMemorySubprocVecEnv(SubprocVecEnv):
+    """
+    A `SubprocVecEnv` whose workers write observations directly into arrays in shared memory,
+    instead of sending them through the pipes. Only the rewards, dones and infos are pickled,
+    which is much cheaper with image observations and many agents per process.
+
+    One shared memory block is allocated per array of the observation space, i.e. per subspace of a `Dict`
+    or `Tuple` space, with the shape `(n_proc, n_agents, *subspace.shape)`. Each array of the observations
+    returned by `step_wait` and `reset` has the shape `(num_envs, *subspace.shape)`.
+    When every agent of a process is done, the process writes its final observation into the `"terminal_observation"`
+    key of the agents' infos before resetting, since the reset observation overwrites it in shared memory.
+
+    :param env_fns: Environments to run in subprocesses
+    :param start_method: method used to start the subprocesses, see `SubprocVecEnv`.
+    :param n_agents: Int, the number of agents in each environment.
+    :param copy_obs: Bool, True to return copies of the observations. False to return views of the shared memory,
+           which are overwritten by the next `step_wait` or `reset`.
+    """
+
+    def __init__(
+        self,
+        env_fns: List[Callable[[], gym.Env]],
+        start_method: Optional[str] = None,
+        n_agents=32,
+        copy_obs: bool = True,
+    ):
+        # started before the workers so that they share it, otherwise a worker's own tracker unlinks the blocks when it exits
+        resource_tracker.ensure_running()
+        SubprocVecEnv.__init__(self, env_fns, start_method, n_agents)
+        self.n_agents = n_agents
+        self.copy_obs = copy_obs
+        if isinstance(self.observation_space, gym.spaces.Dict):
+            self.kind = "dict"
+            subspaces = list(self.observation_space.spaces.items())
+        elif isinstance(self.observation_space, gym.spaces.Tuple):
+            self.kind = "tuple"
+            subspaces = list(enumerate(self.observation_space.spaces))
+        else:
+            self.kind = None
+            subspaces = [(None, self.observation_space)]
+        self.shms = []
+        self.buffers = []
+        specs = []
+        for key, space in subspaces:
+            shape = (self.n_proc, n_agents) + tuple(space.shape)
+            dtype = np.dtype(space.dtype)
+            shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+            self.shms.append(shm)
+            self.buffers.append((key, np.ndarray(shape, dtype, buffer=shm.buf)))
+            specs.append((key, shm.name, shape, dtype.str))
+        for remote in self.remotes:
+            remote.send(("attach_buffers", (self.kind, specs)))
+        for remote in self.remotes:
+            remote.recv()
+
+    def step_wait(self) -> VecEnvStepReturn:
+        results = self._receive_step_results()
+        self.waiting = False
+        rews, dones, infos = zip(*results)
+        return (
+            self._get_obs(),
+            np.concatenate(rews),
+            np.concatenate(dones),
+            np.concatenate(infos),
+        )
+
+    def reset(self) -> VecEnvObs:
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        for remote in self.remotes:
+            remote.recv()
+        return self._get_obs()
+
+    def _get_obs(self) -> VecEnvObs:
+        obs = []
+        for key, buffer in self.buffers:
+            array = buffer.reshape((self.num_envs,) + buffer.shape[2:])
+            obs.append((key, array.copy() if self.copy_obs else array))
+        return _pack_obs(self.kind, obs)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        SubprocVecEnv.close(self)
+        self.buffers = []
+        for shm in self.shms:
+            try:
+                shm.close()
+            except BufferError:
+                # views returned with copy_obs=False are still referenced, the mapping is released with them
+                pass
+            shm.unlink()
+
+
+def _write_obs(buffers: List[Tuple[Any, np.ndarray]], observation: VecEnvObs) -> None:
+    """
+    Write the observation of a worker into its part of the shared memory arrays.
+
+    :param buffers: the key and the `(n_agents, *subspace.shape)` array of each subspace, the key is None for other spaces.
+    :param observation: the observation returned by the environment.
+    """
+    for key, buffer in buffers:
+        value = observation if key is None else observation[key]
+        buffer[...] = np.reshape(value, buffer.shape)
+
+
+def _pack_obs(kind: Optional[str], arrays: List[Tuple[Any, np.ndarray]]) -> VecEnvObs:
+    """
+    Build an observation from the arrays of its subspaces.
+
+    :param kind: "dict", "tuple", or None for an observation space which is neither a Dict nor a Tuple space.
+    :param arrays: the key and the array of each subspace.
+    :return: an OrderedDict, a tuple or a NumPy array.
+    """
+    if kind == "dict":
+        return OrderedDict(arrays)
+    elif kind == "tuple":
+        return tuple(array for _, array in arrays)
+    else:
+        return arrays[0][1]
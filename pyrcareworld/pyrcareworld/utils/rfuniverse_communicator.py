@@ -1,17 +1,153 @@
+import os
 import struct
 import socket
+import tempfile
 import threading
+import time
+import zlib
+from collections import deque
 from sys import platform
 import numpy as np
-from pyrcareworld.utils.locker import Locker
+from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing
+from pyrcareworld.utils.lazy_dict import LazyDict
+from pyrcareworld.utils.frame_trace import TRACE_RECEIVED, TRACE_SENT
+from pyrcareworld.utils.frame_reader import FrameReader
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+
+# Protocol version 1 tags every value with its type name as a string.
+# Protocol version 2 replaces the string with the single-byte code below.
+PROTOCOL_VERSION = 2
+TYPE_CODES = {
+    "none": 0,
+    "null": 0,
+    "int": 1,
+    "float": 2,
+    "string": 3,
+    "bool": 4,
+    "bytes": 5,
+    "vector3": 6,
+    "quaternion": 7,
+    "matrix": 8,
+    "rect": 9,
+    "array": 10,
+    "list": 11,
+    "dict": 12,
+    "tuple": 13,
+    "shm": 14,
+    "typed_array": 15,
+}
+
+# Element types of "typed_array" values, written as a single-byte code before the rank.
+# Other dtypes are converted to the nearest of these when writing, see `write_typed_array`.
+ARRAY_DTYPES = {
+    1: np.dtype("<u1"),
+    2: np.dtype("<i4"),
+    3: np.dtype("<f4"),
+    4: np.dtype("<f8"),
+}
+ARRAY_DTYPE_CODES = {dtype: code for code, dtype in ARRAY_DTYPES.items()}
+
+# A frame whose length prefix has this bit set is compressed: its payload is a codec byte followed by the compressed frame.
+COMPRESSED_FRAME_FLAG = 0x80000000
+COMPRESSION_CODECS = {
+    "zlib": 1,
+    "lz4": 2,
+}
+
+
+def available_compressions() -> list:
+    """
+    Get the frame compression codecs available in this Python environment, fastest first.
+
+    :return: List, the codec names. "lz4" needs the optional `lz4` package.
+    """
+    if lz4 is None:
+        return ["zlib"]
+    return ["lz4", "zlib"]
+
+
+# Payload size in bytes of the types with a fixed size, used to skip over objects without decoding them.
+SKIP_SIZES = {
+    "int": 4,
+    "float": 4,
+    "bool": 1,
+    "rect": 16,
+    "null": 0,
+    "none": 0,
+    "shm": SharedMemoryRing.DESCRIPTOR.size,
+}
 
 
 class RFUniverseCommunicator(threading.Thread):
+    """
+    Socket communicator between pyrcareworld and the Unity player.
+
+    :param port: Int, the port for communication. In release mode over TCP, the communicator listens on a free port picked by the OS instead, stored in `port` and passed to the player.
+    :param receive_data_callback: Callable, called with the decoded object list of every received frame.
+    :param proc_type: Str, "editor" or "release".
+    :param zero_copy: Bool, True to receive frames with `recv_into` into reusable buffers and decode them through `memoryview` without copying.
+    :param zero_copy_threshold: Int, in zero-copy mode, `bytes` and `array` payloads of at least this many bytes are returned as read-only views into the receive buffer. Smaller payloads are copied.
+    :param batch_send: Bool, True to queue every outgoing frame and write them all at once in `flush`, which `sync_step` calls before waiting for the step.
+    :param compression: Str, the codec to compress outgoing frames with, "zlib" or "lz4". None to send every frame uncompressed. Compressed frames are always accepted on receive.
+    :param compression_threshold: Int, frames smaller than this many bytes are sent uncompressed.
+    :param lazy_decode: Bool, True to decode the data dict of "Instance" frames lazily. Only the byte offset of each value is recorded on receive, and a value is decoded the first time it is accessed, see `LazyDict`.
+    :param transport: Str, "tcp" to listen on a localhost TCP port, "unix" to listen on a Unix domain socket at `socket_path`. Only for a player running on the same host.
+    :param socket_path: Str, the Unix domain socket path. None for a path in the temp directory derived from `port`.
+    :param reader_thread: Bool, True to read frames on a `FrameReader` thread once connected, so that the socket is drained while the caller's thread decodes and dispatches earlier frames.
+    :param reader_max_frames: Int, the maximum number of frames queued by the reader thread.
+    :param reader_max_bytes: Int, the maximum number of bytes queued by the reader thread.
+
+    Large payloads may also arrive through a `SharedMemoryRing` opened with `open_shared_memory`. The frame then only
+    carries a "shm" (slot, offset, length, sequence) descriptor, which is decoded to a read-only `memoryview` of the mapping.
+
+    `protocol_version` selects how value types are tagged on the wire: 1 writes the type name as a string,
+    2 writes a single-byte code from `TYPE_CODES`. It starts at 1 and is raised by `RCareWorld` only after the
+    player has agreed to it, see `RCareWorld.WaitSceneInit`.
+
+    `typed_arrays` is False to send every `np.ndarray` as a float32 "array", which every player reads.
+    True to send them as "typed_array" values, which keep uint8, int32, float32 and float64 elements, see `write_typed_array`.
+    Other integer arrays are sent as int32, and raise OverflowError if a value does not fit.
+    Like `protocol_version`, it is only set by `RCareWorld` once the player has agreed to it. "typed_array" values are always
+    accepted on receive and decoded to arrays of the dtype they were sent with.
+
+    `collect_filter` is None to decode every "Instance" frame. Otherwise it maps the subscribed object IDs to a
+    frozenset of keys, or to None for every key: frames of other objects are dropped after their ID is read and
+    other keys are skipped without being decoded, see `RCareWorld.Subscribe`. The filter only applies to `Collect`:
+    frames of objects that were sent an "Instance" command in the step are decoded whole, since they may carry
+    its response, and so is the first frame of an object received while filtering, so that new objects get their data.
+
+    `player_process` is None, or the `subprocess.Popen` of a release player, polled while waiting for it to connect.
+    `stats` is None, or a `StepStats` that times every step, see `RCareWorld(stats=True)`.
+    `trace` is None, or a `FrameTraceWriter` that records every frame sent and received, see `RCareWorld(trace_file=...)`.
+
+    Arrays are writable, except in zero-copy mode: there large `bytes` payloads (e.g. `CameraAttr.data["rgb"]`)
+    are read-only `memoryview` objects and large arrays are read-only `np.ndarray` objects. Both alias the buffer the frame was received into.
+    A receive buffer is only reused once no view into it is alive, so a view stays valid for as long as it is referenced,
+    but it also keeps the whole frame buffer alive. Call `bytes(view)` or `array.copy()` to keep a payload
+    across many steps, or to get a writable object. `np.frombuffer` accepts the views directly.
+    """
+
     def __init__(
             self,
             port: int = 5004,
             receive_data_callback=None,
             proc_type="editor",
+            zero_copy: bool = False,
+            zero_copy_threshold: int = 64 * 1024,
+            batch_send: bool = False,
+            lazy_decode: bool = False,
+            compression: str = None,
+            compression_threshold: int = 64 * 1024,
+            transport: str = "tcp",
+            socket_path: str = None,
+            reader_thread: bool = False,
+            reader_max_frames: int = 64,
+            reader_max_bytes: int = 256 * 1024 * 1024,
     ):
         self.server = None
         self.client = None
@@ -19,6 +155,99 @@ class RFUniverseCommunicator(threading.Thread):
         threading.Thread.__init__(self)
         self.read_offset = 0
         self.on_receive_data = receive_data_callback
+        self.zero_copy = zero_copy
+        self.zero_copy_threshold = zero_copy_threshold
+        self._length_buffer = bytearray(4)
+        self._receive_buffer = bytearray(1024 * 1024)
+        self.batch_send = batch_send
+        self._send_queue = []
+        self._send_queue_commands = 0
+        self._send_queue_bytes = 0
+        self.protocol_version = 1
+        self.typed_arrays = False
+        self.shared_memory = None
+        self.lazy_decode = lazy_decode
+        self.collect_filter = None
+        self.filtered_ids = set()
+        # The IDs sent "Instance" commands since the last "StepStart", those of each step in flight,
+        # and those whose frames are decoded whole by `receive_object`.
+        self._sent_command_ids = set()
+        self._step_command_ids = deque()
+        self._received_command_ids = set()
+        self.command_ids = frozenset()
+        self.trace = None
+        self.stats = None
+        self.reader_thread = reader_thread
+        self.reader_max_frames = reader_max_frames
+        self.reader_max_bytes = reader_max_bytes
+        self.frame_reader = None
+        self.player_process = None
+        self._read_frame = self.receive_bytes
+        if compression is not None and compression not in available_compressions():
+            raise ValueError(f"This compression is unavailable: {compression}")
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self._object_readers = {
+            "int": self.read_int,
+            "float": self.read_float,
+            "string": self.read_string,
+            "bool": self.read_bool,
+            "bytes": self.read_bytes,
+            "vector3": self.read_object,
+            "quaternion": self.read_object,
+            "matrix": self.read_object,
+            "rect": self._read_rect_object,
+            "array": self._read_array_object,
+            "list": self._read_list_object,
+            "dict": self._read_dict_object,
+            "tuple": self._read_tuple_object,
+            "null": self._read_none_object,
+            "none": self._read_none_object,
+            "shm": self._read_shared_memory_object,
+            "typed_array": self._read_typed_array_object,
+        }
+        self._object_readers_v2 = [None] * (max(TYPE_CODES.values()) + 1)
+        for data_type, code in TYPE_CODES.items():
+            self._object_readers_v2[code] = self._object_readers[data_type]
+        self._type_names_v2 = [None] * (max(TYPE_CODES.values()) + 1)
+        for data_type, code in TYPE_CODES.items():
+            if self._type_names_v2[code] is None:
+                self._type_names_v2[code] = data_type
+        self._object_writers = {
+            type(None): self._write_none_object,
+            int: self._write_int_object,
+            np.int32: self._write_int_object,
+            np.int64: self._write_int_object,
+            float: self._write_float_object,
+            np.float32: self._write_float_object,
+            np.float64: self._write_float_object,
+            bool: self._write_bool_object,
+            str: self._write_string_object,
+            bytes: self._write_bytes_object,
+            bytearray: self._write_bytes_object,
+            list: self._write_list_object,
+            dict: self._write_dict_object,
+            np.ndarray: self._write_array_object,
+            tuple: self._write_tuple_object,
+        }
+        self.batch_stats = {
+            "flushes": 0,
+            "commands": 0,
+            "bytes": 0,
+            "last_commands": 0,
+            "last_bytes": 0,
+        }
+        self.compression_stats = {
+            "frames_compressed": 0,
+            "frames_incompressible": 0,
+            "frames_decompressed": 0,
+            "raw_bytes_sent": 0,
+            "compressed_bytes_sent": 0,
+            "raw_bytes_received": 0,
+            "compressed_bytes_received": 0,
+            "compress_time": 0.0,
+            "decompress_time": 0.0,
+        }
         # self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         # self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         # send_buffer_size = 1024 * 1024 * 10
@@ -26,68 +255,213 @@ class RFUniverseCommunicator(threading.Thread):
         # recv_buffer_size = 1024 * 1024 * 10
         # self.server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer_size)
         self.port = port
+        self.transport = transport
+        self.socket_path = socket_path
+        if transport == "unix":
+            if not hasattr(socket, "AF_UNIX"):
+                raise ValueError("Unix domain sockets are not supported on this platform")
+            if self.socket_path is None:
+                if proc_type == "editor":
+                    name = f"rcareworld_{self.port}.sock"
+                else:
+                    name = f"rcareworld_{os.getpid()}_{self.port}.sock"
+                self.socket_path = os.path.join(tempfile.gettempdir(), name)
+        elif transport != "tcp":
+            raise ValueError(f"Unknown transport: {transport}")
         if proc_type == "editor":
             # self.server.bind(("localhost", self.port))
             pass
         elif proc_type == "release":
-            self._get_port()
+            if transport == "tcp":
+                self._listen_ephemeral_port()
         else:
             raise ValueError(f"Unknown proc_type: {proc_type}")
 
-    def _get_port(self):
-        with Locker("port"):
-            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            while self.port < 65536:
-                try:
-                    self.server.bind(("localhost", self.port))
-                    self.server.close()
-                    return
-                except OSError:
-                    self.port += 256
-            raise OSError("No available port")
+    def _listen_ephemeral_port(self):
+        # Let the OS pick a free port and keep listening on it until the player connects,
+        # so that no other environment can take it in between and no lock across processes is needed.
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("localhost", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
 
     def online(self):
-        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server.bind(("localhost", self.port))
-        print(f"Waiting for connections on port: {self.port}...")
+        if self.server is not None:
+            print(f"Waiting for connections on port: {self.port}...")
+        elif self.transport == "unix":
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(self.socket_path)
+            print(f"Waiting for connections on socket: {self.socket_path}...")
+        else:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind(("localhost", self.port))
+            print(f"Waiting for connections on port: {self.port}...")
         self.server.listen(1)
-        self.client, _ = self.server.accept()
+        self.client, _ = self._accept()
         print(f"Connected successfully")
         self.connected = True
         self.client.settimeout(None)
-        self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.transport == "tcp":
+            self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.reader_thread:
+            self.frame_reader = FrameReader(self, self.reader_max_frames, self.reader_max_bytes)
+            self.frame_reader.start()
+            self._read_frame = self.frame_reader.get
         self.receive_step()
 
+    def _accept(self) -> tuple:
+        if self.player_process is None:
+            return self.server.accept()
+        # Poll the player process, so that a player that dies while booting fails fast instead of blocking forever.
+        self.server.settimeout(0.5)
+        try:
+            while True:
+                try:
+                    return self.server.accept()
+                except socket.timeout:
+                    code = self.player_process.poll()
+                    if code is not None:
+                        raise ConnectionError(f"The player exited with code {code} before connecting")
+        finally:
+            self.server.settimeout(None)
+
+    def open_shared_memory(self, slot_count: int, slot_size: int) -> SharedMemoryRing:
+        self.shared_memory = SharedMemoryRing(slot_count=slot_count, slot_size=slot_size)
+        return self.shared_memory
+
     def close(self):
-        self.client.close()
-        self.server.close()
+        if self.client is not None:
+            self.client.close()
+        if self.server is not None:
+            self.server.close()
         self.connected = False
+        if self.shared_memory is not None:
+            self.shared_memory.close()
+            self.shared_memory = None
+        if self.transport == "unix" and os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
 
     def run(self):
         while True:
             data = self.receive_bytes()
             objs = self.receive_object(data)
+            self._release_bytes(data)
             if self.on_receive_data is not None:
                 self.on_receive_data(objs)
 
     def sync_step(self):
-        self.send_object("StepStart")
+        self.send_step()
         self.receive_step()
 
+    def send_step(self):
+        if self.stats is not None:
+            start = time.perf_counter()
+            self.send_object("StepStart")
+            self.flush()
+            self.stats.add_phase("send", start, time.perf_counter())
+            return
+        self.send_object("StepStart")
+        self.flush()
+
+    def receive_step_frames(self) -> list:
+        # Receive the frames of one step without decoding them, so that they can be dispatched later.
+        self._received_command_ids |= self._next_command_ids()
+        frames = []
+        start = time.perf_counter()
+        while True:
+            if not self.connected:
+                raise ConnectionError("Connection closed")
+            data = self._read_frame()
+            if data is not None and len(data) > 0:
+                if self._is_step_end(data):
+                    self._release_bytes(data)
+                    if self.stats is not None:
+                        self.stats.add_phase("receive", start, time.perf_counter())
+                    return frames
+                frames.append(data)
+
+    def dispatch_frames(self, frames: list):
+        self.command_ids = self._received_command_ids
+        self._received_command_ids = set()
+        if self.stats is not None:
+            for data in frames:
+                start = time.perf_counter()
+                size = len(data)
+                objs = self.receive_object(data)
+                self._release_bytes(data)
+                decoded = time.perf_counter()
+                self.on_receive_data(objs)
+                self.stats.add_frame(objs, size, start, start, decoded, time.perf_counter(), False)
+            return
+        for data in frames:
+            objs = self.receive_object(data)
+            self._release_bytes(data)
+            self.on_receive_data(objs)
+
+    def _is_step_end(self, data: bytes) -> bool:
+        self.read_offset = 0
+        if self.read_int(data) < 1:
+            return False
+        return self.read_object(data) == "StepEnd"
+
+    def _next_command_ids(self) -> set:
+        # The IDs sent commands in the oldest step in flight, whose frames are received next.
+        if len(self._step_command_ids) == 0:
+            return set()
+        return self._step_command_ids.popleft()
+
     def receive_step(self):
+        self.command_ids = self._next_command_ids()
+        if self.stats is not None:
+            return self._receive_step_with_stats()
         # sync_receive_objects_queue = []
         while True:
             if not self.connected:
                 raise ConnectionError("Connection closed")
-            data = self.receive_bytes()
+            data = self._read_frame()
             if data is not None and len(data) > 0:
                 objs = self.receive_object(data)
+                self._release_bytes(data)
                 if len(objs) > 0 and objs[0] == "StepEnd":
                     break
                 self.on_receive_data(objs)
 
+    def _receive_step_with_stats(self):
+        first = True
+        while True:
+            if not self.connected:
+                raise ConnectionError("Connection closed")
+            start = time.perf_counter()
+            data = self._read_frame()
+            if data is not None and len(data) > 0:
+                received = time.perf_counter()
+                size = len(data)
+                objs = self.receive_object(data)
+                self._release_bytes(data)
+                decoded = time.perf_counter()
+                if len(objs) > 0 and objs[0] == "StepEnd":
+                    self.stats.add_frame(objs, size, start, received, decoded, decoded, first)
+                    break
+                self.on_receive_data(objs)
+                self.stats.add_frame(objs, size, start, received, decoded, time.perf_counter(), first)
+                first = False
+
     def receive_bytes(self):
+        if self.zero_copy:
+            data = self._receive_bytes_into()
+        else:
+            data = self._receive_bytes_copy()
+        if self.trace is not None and data is not None:
+            self.trace.write(TRACE_RECEIVED, data)
+        return data
+
+    def _receive_bytes_copy(self):
         data = bytearray()
         while len(data) < 4:
             temp_data = self.client.recv(4 - len(data))
@@ -95,6 +469,8 @@ class RFUniverseCommunicator(threading.Thread):
             data.extend(temp_data)
         assert len(data) == 4
         length = int.from_bytes(data, byteorder="little", signed=False)
+        compressed = length & COMPRESSED_FRAME_FLAG
+        length &= ~COMPRESSED_FRAME_FLAG
         if length == 0:
             return None
         buffer = bytearray()
@@ -103,80 +479,317 @@ class RFUniverseCommunicator(threading.Thread):
             assert len(temp_data) != 0
             buffer.extend(temp_data)
         assert len(buffer) == length
+        if compressed:
+            return self._decompress_frame(buffer)
+        return buffer
+
+    def _receive_bytes_into(self):
+        self._recv_into(memoryview(self._length_buffer))
+        length = int.from_bytes(self._length_buffer, byteorder="little", signed=False)
+        compressed = length & COMPRESSED_FRAME_FLAG
+        length &= ~COMPRESSED_FRAME_FLAG
+        if length == 0:
+            return None
+        buffer = self._acquire_receive_buffer(length)
+        view = memoryview(buffer)[:length]
+        self._recv_into(view)
+        if compressed:
+            frame = self._decompress_frame(view)
+            view.release()
+            return frame
+        return view
+
+    def _recv_into(self, view: memoryview):
+        received = 0
+        while received < len(view):
+            count = self.client.recv_into(view[received:])
+            assert count != 0
+            received += count
+
+    def _acquire_receive_buffer(self, length: int) -> bytearray:
+        # Reuse the receive buffer unless a view returned from an earlier frame is still alive.
+        # A bytearray with live exports refuses to resize, which is used here as the probe.
+        buffer = self._receive_buffer
+        try:
+            if len(buffer) < length:
+                buffer.extend(bytes(length - len(buffer)))
+            else:
+                buffer.append(0)
+                buffer.pop()
+        except BufferError:
+            buffer = bytearray(max(length, len(buffer)))
+            self._receive_buffer = buffer
         return buffer
 
+    def _compress_frame(self, data: bytes) -> tuple:
+        # Return the payload to send and the flag to set in its length prefix.
+        start = time.perf_counter()
+        if self.compression == "lz4":
+            compressed = lz4.frame.compress(data)
+        else:
+            compressed = zlib.compress(data, 1)
+        self.compression_stats["compress_time"] += time.perf_counter() - start
+        if len(compressed) + 1 >= len(data):
+            self.compression_stats["frames_incompressible"] += 1
+            return data, 0
+        self.compression_stats["frames_compressed"] += 1
+        self.compression_stats["raw_bytes_sent"] += len(data)
+        self.compression_stats["compressed_bytes_sent"] += len(compressed) + 1
+        return bytes([COMPRESSION_CODECS[self.compression]]) + compressed, COMPRESSED_FRAME_FLAG
+
+    def _decompress_frame(self, data) -> bytes:
+        start = time.perf_counter()
+        codec = data[0]
+        if codec == COMPRESSION_CODECS["zlib"]:
+            frame = zlib.decompress(data[1:])
+        elif codec == COMPRESSION_CODECS["lz4"]:
+            if lz4 is None:
+                raise ValueError("Received an lz4 compressed frame, please install lz4 with `pip install lz4`")
+            frame = lz4.frame.decompress(data[1:])
+        else:
+            raise ValueError(f"This compression codec is unsupported: {codec}")
+        self.compression_stats["decompress_time"] += time.perf_counter() - start
+        self.compression_stats["frames_decompressed"] += 1
+        self.compression_stats["raw_bytes_received"] += len(frame)
+        self.compression_stats["compressed_bytes_received"] += len(data)
+        return frame
+
+    def compression_ratio(self) -> float:
+        """
+        Get the ratio of raw to compressed bytes over every compressed frame sent and received so far.
+
+        :return: Float, the compression ratio, 1 if no frame was compressed.
+        """
+        stats = self.compression_stats
+        compressed = stats["compressed_bytes_sent"] + stats["compressed_bytes_received"]
+        if compressed == 0:
+            return 1.0
+        return (stats["raw_bytes_sent"] + stats["raw_bytes_received"]) / compressed
+
+    def _release_bytes(self, data):
+        if isinstance(data, memoryview):
+            data.release()
+
     def send_bytes(self, data: bytes):
         if not self.connected:
             return
-        length = len(data).to_bytes(4, byteorder="little", signed=False)
+        if self.trace is not None:
+            self.trace.write(TRACE_SENT, data)
+        flag = 0
+        if self.compression is not None and len(data) >= self.compression_threshold:
+            data, flag = self._compress_frame(data)
+        length = (len(data) | flag).to_bytes(4, byteorder="little", signed=False)
+        if self.batch_send:
+            self._send_queue.append(length)
+            self._send_queue.append(data)
+            self._send_queue_commands += 1
+            self._send_queue_bytes += len(data) + 4
+            return
         self.client.send(length)
         self.client.send(data)
 
-        if platform == 'linux':
+        if platform == 'linux' and self.transport == "tcp":
             self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
 
+    def flush(self):
+        if len(self._send_queue) == 0:
+            return
+        buffers = self._send_queue
+        self._send_queue = []
+        self._write_buffers(buffers)
+        self.batch_stats["flushes"] += 1
+        self.batch_stats["commands"] += self._send_queue_commands
+        self.batch_stats["bytes"] += self._send_queue_bytes
+        self.batch_stats["last_commands"] = self._send_queue_commands
+        self.batch_stats["last_bytes"] = self._send_queue_bytes
+        self._send_queue_commands = 0
+        self._send_queue_bytes = 0
+
+    def _write_buffers(self, buffers: list):
+        if hasattr(self.client, "sendmsg"):
+            self._sendmsg_all(buffers)
+        else:
+            self.client.sendall(b"".join(buffers))
+
+        if platform == 'linux' and self.transport == "tcp":
+            self.client.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+
+    def _sendmsg_all(self, buffers: list):
+        # sendmsg may write only part of the iovec and accepts at most IOV_MAX entries per call.
+        buffers = [memoryview(i) for i in buffers]
+        index = 0
+        while index < len(buffers):
+            sent = self.client.sendmsg(buffers[index: index + 1024])
+            while sent > 0:
+                if sent >= len(buffers[index]):
+                    sent -= len(buffers[index])
+                    index += 1
+                else:
+                    buffers[index] = buffers[index][sent:]
+                    sent = 0
+
     def receive_object(self, data: bytes) -> list:
         self.read_offset = 0
         count = self.read_int(data)
         objs = []
+        fields = None
         for i in range(count):
-            objs.append(self.read_object(data))
+            if i == 3 and objs[0] == "Instance":
+                objs.append(self.read_instance_data(data, fields))
+            else:
+                objs.append(self.read_object(data))
+            if i == 1 and objs[0] == "Instance" and self.collect_filter is not None:
+                id = objs[1]
+                if id in self.command_ids or id not in self.filtered_ids:
+                    self.filtered_ids.add(id)
+                    fields = None
+                elif id in self.collect_filter:
+                    fields = self.collect_filter[id]
+                else:
+                    return []
         return objs
 
     def read_object(self, datas: bytes) -> object:
+        if self.protocol_version >= 2:
+            code = datas[self.read_offset]
+            self.read_offset += 1
+            if code >= len(self._object_readers_v2):
+                raise ValueError(f"This type code is unsupported: {code}")
+            return self._object_readers_v2[code](datas)
         data_type = self.read_string(datas)
-        if data_type == "int":
-            return self.read_int(datas)
-        elif data_type == "float":
-            return self.read_float(datas)
-        elif data_type == "string":
-            return self.read_string(datas)
-        elif data_type == "bool":
-            return self.read_bool(datas)
-        elif data_type == "bytes":
-            return self.read_bytes(datas)
-        elif data_type == "vector3":
-            return self.read_object(datas)
-        elif data_type == "quaternion":
-            return self.read_object(datas)
-        elif data_type == "matrix":
+        reader = self._object_readers.get(data_type)
+        if reader is None:
+            raise ValueError(f"This type is unsupported: {data_type}")
+        return reader(datas)
+
+    def read_type(self, datas: bytes) -> str:
+        if self.protocol_version >= 2:
+            code = datas[self.read_offset]
+            self.read_offset += 1
+            if code >= len(self._type_names_v2) or self._type_names_v2[code] is None:
+                raise ValueError(f"This type code is unsupported: {code}")
+            return self._type_names_v2[code]
+        return self.read_string(datas)
+
+    def read_instance_data(self, datas: bytes, fields: frozenset = None) -> object:
+        # Decode the data dict of an "Instance" frame, keeping only `fields` if given, as a LazyDict in lazy mode.
+        if not self.lazy_decode and fields is None:
             return self.read_object(datas)
-        elif data_type == "rect":
-            return [self.read_float(datas) for _ in range(4)]
-        elif data_type == "array":
-            rank = self.read_int(datas)
-            shape = []
-            for _ in range(rank):
-                shape.append(self.read_int(datas))
-            result = np.ndarray(shape, dtype=np.float32)
-            result = result.reshape(-1)
-            for i in range(len(result)):
-                result[i] = self.read_float(datas)
-            return result.reshape(shape)
-        elif data_type == "list":
-            count = self.read_int(datas)
-            result = []
-            for _ in range(count):
-                result.append(self.read_object(datas))
-            return result
-        elif data_type == "dict":
-            count = self.read_int(datas)
-            result = {}
-            for _ in range(count):
-                key = self.read_object(datas)
-                value = self.read_object(datas)
-                result[key] = value
-            return result
-        elif data_type == "tuple":
-            count = self.read_int(datas)
-            result = []
-            for _ in range(count):
-                result.append(self.read_object(datas))
-            return tuple(result)
-        elif data_type == "null" or data_type == "none":
-            return None
+        data_type = self.read_type(datas)
+        if data_type != "dict":
+            reader = self._object_readers.get(data_type)
+            if reader is None:
+                raise ValueError(f"This type is unsupported: {data_type}")
+            return reader(datas)
+        if self.lazy_decode:
+            if isinstance(datas, memoryview):
+                # Take a new view, the frame view itself is released once the frame is dispatched.
+                datas = datas[:]
+            result = LazyDict(self, datas)
         else:
-            raise ValueError(f"This type is unsupported: {data_type}")
+            result = {}
+        count = self.read_int(datas)
+        for _ in range(count):
+            key = self.read_object(datas)
+            if fields is not None and key not in fields:
+                self.skip_object(datas)
+            elif self.lazy_decode:
+                result._add_lazy(key, self.read_offset)
+                self.skip_object(datas)
+            else:
+                result[key] = self.read_object(datas)
+        return result
+
+    def skip_object(self, datas: bytes):
+        # Walk over one object without decoding it, nested objects are counted in `pending` instead of recursing.
+        offset = self.read_offset
+        pending = 1
+        while pending > 0:
+            pending -= 1
+            if self.protocol_version >= 2:
+                code = datas[offset]
+                data_type = self._type_names_v2[code] if code < len(self._type_names_v2) else None
+                offset += 1
+            else:
+                count = struct.unpack_from("<i", datas, offset)[0]
+                data_type = str(datas[offset + 4: offset + 4 + count], "utf-8")
+                offset += 4 + count
+            size = SKIP_SIZES.get(data_type)
+            if size is not None:
+                offset += size
+            elif data_type in ("string", "bytes"):
+                offset += 4 + struct.unpack_from("<i", datas, offset)[0]
+            elif data_type in ("vector3", "quaternion", "matrix"):
+                pending += 1
+            elif data_type in ("list", "tuple"):
+                pending += struct.unpack_from("<i", datas, offset)[0]
+                offset += 4
+            elif data_type == "dict":
+                pending += 2 * struct.unpack_from("<i", datas, offset)[0]
+                offset += 4
+            elif data_type == "array":
+                rank = struct.unpack_from("<i", datas, offset)[0]
+                shape = struct.unpack_from(f"<{rank}i", datas, offset + 4)
+                offset += 4 + 4 * rank + 4 * int(np.prod(shape))
+            elif data_type == "typed_array":
+                itemsize = ARRAY_DTYPES[datas[offset]].itemsize
+                rank = struct.unpack_from("<i", datas, offset + 1)[0]
+                shape = struct.unpack_from(f"<{rank}i", datas, offset + 5)
+                offset += 5 + 4 * rank + itemsize * int(np.prod(shape))
+            else:
+                raise ValueError(f"This type is unsupported: {data_type}")
+        self.read_offset = offset
+
+    def _read_none_object(self, datas: bytes) -> None:
+        return None
+
+    def _read_shared_memory_object(self, datas: bytes) -> memoryview:
+        slot, offset, length, sequence = SharedMemoryRing.DESCRIPTOR.unpack_from(datas, self.read_offset)
+        self.read_offset += SharedMemoryRing.DESCRIPTOR.size
+        if self.shared_memory is None:
+            raise ValueError("Received a shared memory descriptor without shared memory")
+        return self.shared_memory.view(slot, offset, length, sequence)
+
+    def _read_rect_object(self, datas: bytes) -> list:
+        return [self.read_float(datas) for _ in range(4)]
+
+    def _read_array_object(self, datas: bytes) -> np.ndarray:
+        rank = self.read_int(datas)
+        shape = []
+        for _ in range(rank):
+            shape.append(self.read_int(datas))
+        return self.read_array(datas, shape)
+
+    def _read_typed_array_object(self, datas: bytes) -> np.ndarray:
+        code = datas[self.read_offset]
+        self.read_offset += 1
+        dtype = ARRAY_DTYPES.get(code)
+        if dtype is None:
+            raise ValueError(f"This array dtype code is unsupported: {code}")
+        rank = self.read_int(datas)
+        shape = []
+        for _ in range(rank):
+            shape.append(self.read_int(datas))
+        return self.read_array(datas, shape, dtype)
+
+    def _read_list_object(self, datas: bytes) -> list:
+        count = self.read_int(datas)
+        result = []
+        for _ in range(count):
+            result.append(self.read_object(datas))
+        return result
+
+    def _read_dict_object(self, datas: bytes) -> dict:
+        count = self.read_int(datas)
+        result = {}
+        for _ in range(count):
+            key = self.read_object(datas)
+            value = self.read_object(datas)
+            result[key] = value
+        return result
+
+    def _read_tuple_object(self, datas: bytes) -> tuple:
+        return tuple(self._read_list_object(datas))
 
     def read_string(self, datas: bytes) -> str:
         count = self.read_int(datas)
@@ -188,15 +801,15 @@ class RFUniverseCommunicator(threading.Thread):
             )
         self.read_offset += count
         try:
-            ret = datas[self.read_offset - count: self.read_offset].decode("utf-8")
+            ret = str(datas[self.read_offset - count: self.read_offset], "utf-8")
         except:
-            print(datas[self.read_offset - count: self.read_offset])
+            print(bytes(datas[self.read_offset - count: self.read_offset]))
             print(
                 f"read_start: {self.read_offset - count}, read_end: {self.read_offset}, count: {count}"
             )
             raise UnicodeDecodeError(
                 "utf-8",
-                datas[self.read_offset - count: self.read_offset],
+                bytes(datas[self.read_offset - count: self.read_offset]),
                 self.read_offset - count,
                 self.read_offset,
             )
@@ -204,16 +817,27 @@ class RFUniverseCommunicator(threading.Thread):
 
     def read_int(self, datas: bytes) -> int:
         self.read_offset += 4
-        ret = int.from_bytes(
-            datas[self.read_offset - 4: self.read_offset],
-            byteorder="little",
-            signed=True,
-        )
-        return ret
+        return struct.unpack_from("<i", datas, self.read_offset - 4)[0]
 
     def read_float(self, datas: bytes) -> float:
         self.read_offset += 4
-        return struct.unpack("f", datas[self.read_offset - 4: self.read_offset])[0]
+        return struct.unpack_from("<f", datas, self.read_offset - 4)[0]
+
+    def read_array(self, datas: bytes, shape: list, dtype: np.dtype = np.dtype("<f4")) -> np.ndarray:
+        count = int(np.prod(shape, dtype=np.int64))
+        size = count * dtype.itemsize
+        result = np.frombuffer(datas, dtype=dtype, count=count, offset=self.read_offset)
+        self.read_offset += size
+        if self.zero_copy:
+            # The receive buffer is reused, small arrays are copied and large ones are read-only views of it.
+            if size < self.zero_copy_threshold:
+                result = result.copy()
+            else:
+                result.flags.writeable = False
+        elif not result.flags.writeable:
+            # A `bytes` frame, e.g. decompressed or received by the async communicator.
+            result = result.copy()
+        return result.reshape(shape)
 
     def read_bool(self, datas: bytes) -> bool:
         self.read_offset += 1
@@ -226,60 +850,92 @@ class RFUniverseCommunicator(threading.Thread):
     def read_bytes(self, datas: bytes) -> bytes:
         count = self.read_int(datas)
         self.read_offset += count
-        return datas[self.read_offset - count: self.read_offset]
+        ret = datas[self.read_offset - count: self.read_offset]
+        if isinstance(ret, memoryview):
+            if count < self.zero_copy_threshold:
+                return ret.tobytes()
+            return ret.toreadonly()
+        return ret
 
     def send_object(self, *args):
+        if args[0] == "Instance":
+            self._sent_command_ids.add(args[1])
+        elif args[0] == "StepStart":
+            self._step_command_ids.append(self._sent_command_ids)
+            self._sent_command_ids = set()
         datas = bytearray()
         self.write_int(datas, len(args))
         for obj in args:
             self.write_object(datas, obj)
+        if self.stats is not None:
+            self.stats.add_sent(args[0], len(datas))
         self.send_bytes(bytes(datas))
 
     def write_object(self, datas: bytearray, obj):
-        if obj is None:
-            self.write_string(datas, "none")
-        elif type(obj) == int or type(obj) == np.int32 or type(obj) == np.int64:
-            self.write_string(datas, "int")
-            self.write_int(datas, obj)
-        elif type(obj) == float or type(obj) == np.float32 or type(obj) == np.float64:
-            self.write_string(datas, "float")
-            self.write_float(datas, obj)
-        elif type(obj) == bool:
-            self.write_string(datas, "bool")
-            self.write_bool(datas, obj)
-        elif type(obj) == str:
-            self.write_string(datas, "string")
-            self.write_string(datas, obj)
-        elif type(obj) == bytes or type(obj) == bytearray:
-            self.write_string(datas, "bytes")
-            self.write_bytes(datas, bytes(obj))
-        elif type(obj) == list:
-            self.write_string(datas, "list")
-            self.write_int(datas, len(obj))
-            for item in obj:
-                self.write_object(datas, item)
-        elif type(obj) == dict:
-            self.write_string(datas, "dict")
-            self.write_int(datas, len(obj))
-            for item in obj:
-                self.write_object(datas, item)
-                self.write_object(datas, obj[item])
-        elif type(obj) == np.ndarray:
-            self.write_string(datas, "array")
-            self.write_int(datas, len(obj.shape))
-            for i in range(len(obj.shape)):
-                self.write_int(datas, obj.shape[i])
-            obj = obj.reshape(-1)
-            for i in range(len(obj)):
-                self.write_float(datas, float(obj[i]))
-        elif type(obj) == tuple:
-            self.write_string(datas, "tuple")
-            self.write_int(datas, len(obj))
-            for i in range(len(obj)):
-                self.write_object(datas, obj[i])
-        else:
+        writer = self._object_writers.get(type(obj))
+        if writer is None:
             print(f"dont support this type: {type(obj)}")
-            self.write_string(datas, "null")
+            self.write_type(datas, "null")
+        else:
+            writer(datas, obj)
+
+    def write_type(self, datas: bytearray, data_type: str):
+        if self.protocol_version >= 2:
+            datas.append(TYPE_CODES[data_type])
+        else:
+            self.write_string(datas, data_type)
+
+    def _write_none_object(self, datas: bytearray, obj):
+        self.write_type(datas, "none")
+
+    def _write_int_object(self, datas: bytearray, obj):
+        self.write_type(datas, "int")
+        self.write_int(datas, obj)
+
+    def _write_float_object(self, datas: bytearray, obj):
+        self.write_type(datas, "float")
+        self.write_float(datas, obj)
+
+    def _write_bool_object(self, datas: bytearray, obj):
+        self.write_type(datas, "bool")
+        self.write_bool(datas, obj)
+
+    def _write_string_object(self, datas: bytearray, obj):
+        self.write_type(datas, "string")
+        self.write_string(datas, obj)
+
+    def _write_bytes_object(self, datas: bytearray, obj):
+        self.write_type(datas, "bytes")
+        self.write_bytes(datas, bytes(obj))
+
+    def _write_list_object(self, datas: bytearray, obj):
+        self.write_type(datas, "list")
+        self.write_int(datas, len(obj))
+        for item in obj:
+            self.write_object(datas, item)
+
+    def _write_dict_object(self, datas: bytearray, obj):
+        self.write_type(datas, "dict")
+        self.write_int(datas, len(obj))
+        for item in obj:
+            self.write_object(datas, item)
+            self.write_object(datas, obj[item])
+
+    def _write_array_object(self, datas: bytearray, obj):
+        if self.typed_arrays:
+            self.write_typed_array(datas, obj)
+            return
+        self.write_type(datas, "array")
+        self.write_int(datas, len(obj.shape))
+        for i in range(len(obj.shape)):
+            self.write_int(datas, obj.shape[i])
+        self.write_array(datas, obj)
+
+    def _write_tuple_object(self, datas: bytearray, obj):
+        self.write_type(datas, "tuple")
+        self.write_int(datas, len(obj))
+        for i in range(len(obj)):
+            self.write_object(datas, obj[i])
 
     def write_string(self, datas: bytearray, s: str):
         s_byte = s.encode("utf-8")
@@ -298,3 +954,28 @@ class RFUniverseCommunicator(threading.Thread):
     def write_bytes(self, datas: bytearray, b: bytes):
         self.write_int(datas, len(b))
         datas.extend(b)
+
+    def write_array(self, datas: bytearray, a: np.ndarray):
+        datas.extend(np.ascontiguousarray(a, dtype="<f4").tobytes())
+
+    def write_typed_array(self, datas: bytearray, a: np.ndarray):
+        # Bool and uint8 arrays are sent as uint8, other integers as int32, float64 as is and other floats as float32.
+        if a.dtype.kind == "b" or a.dtype == np.uint8:
+            dtype = ARRAY_DTYPES[1]
+        elif a.dtype.kind in "iu":
+            dtype = ARRAY_DTYPES[2]
+            if not np.can_cast(a.dtype, dtype) and a.size > 0:
+                # Wider integers would wrap around silently.
+                info = np.iinfo(dtype)
+                if a.min() < info.min or a.max() > info.max:
+                    raise OverflowError(f"{a.dtype} array values out of the int32 range of typed arrays: [{a.min()}, {a.max()}]")
+        elif a.dtype == np.float64:
+            dtype = ARRAY_DTYPES[4]
+        else:
+            dtype = ARRAY_DTYPES[3]
+        self.write_type(datas, "typed_array")
+        datas.append(ARRAY_DTYPE_CODES[dtype])
+        self.write_int(datas, len(a.shape))
+        for i in range(len(a.shape)):
+            self.write_int(datas, a.shape[i])
+        datas.extend(np.ascontiguousarray(a, dtype=dtype).tobytes())
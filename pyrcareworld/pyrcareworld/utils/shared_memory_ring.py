@@ -0,0 +1,139 @@
+import mmap
+import struct
+from multiprocessing import resource_tracker, shared_memory
+
+
+class SharedMemoryRing:
+    """
+    A ring of fixed-size slots in a shared memory block, used as a side channel next to the socket for large payloads.
+    The producer writes a payload into the next slot and sends only a (slot, offset, length, sequence) descriptor through the socket.
+    The consumer turns the descriptor into a read-only `memoryview` of the mapping without copying.
+
+    Every slot starts with a header holding the sequence number of the payload in it.
+    A slot is overwritten when the producer wraps around to it, `view` compares the header with the descriptor
+    and raises instead of returning newer data. Views returned by `view` are only valid until then,
+    use `bytes(view)` to keep a payload longer.
+    The producer writes at most `step_budget` payloads per step, see `begin_step`, and sends the rest inline,
+    so a ring of `step_budget` slots holds every payload of a step.
+
+    :param name: Str, the name of the shared memory block. None to create a block with a generated name.
+    :param slot_count: Int, the number of slots.
+    :param slot_size: Int, the size of each slot in bytes, including the header.
+    :param create: Bool, True to create the block, False to attach to an existing block created by another process.
+    """
+
+    HEADER = struct.Struct("<Q")
+    # The (slot, offset, length, sequence) descriptor as it is written in a frame after the "shm" type.
+    DESCRIPTOR = struct.Struct("<4i")
+
+    def __init__(self, name: str = None, slot_count: int = 4, slot_size: int = 16 * 1024 * 1024, create: bool = True):
+        if slot_size <= self.HEADER.size:
+            raise ValueError(f"Slot size must be larger than the {self.HEADER.size} byte header, got {slot_size}")
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.created = create
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=slot_count * slot_size)
+        else:
+            try:
+                # Python 3.13+, the attaching process must not unlink the block at exit.
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Older versions register the block with the resource tracker of the attaching process too.
+                # Only a tracker started by this attach is our own, a running one may be shared with the creator,
+                # e.g. in the same process or a forked child, and unregistering would drop the creator's registration.
+                own_tracker = getattr(resource_tracker._resource_tracker, "_fd", None) is None
+                self.shm = shared_memory.SharedMemory(name=name)
+                if own_tracker:
+                    resource_tracker.unregister(self.shm._name, "shared_memory")
+        # A mapping of our own rather than `shm.buf`: views hold a reference to it and keep it mapped after `close`,
+        # where closing a mapping with exported views would raise BufferError.
+        if self.shm._fd >= 0:
+            self.mapping = mmap.mmap(self.shm._fd, self.shm.size)
+        else:
+            self.mapping = mmap.mmap(-1, self.shm.size, tagname=self.shm.name)
+        self.buffer = memoryview(self.mapping).toreadonly()
+        self.next_slot = 0
+        self.sequence = 0
+        self.step_budget = slot_count
+        self.step_writes = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def payload_size(self) -> int:
+        """
+        The largest payload a slot holds.
+        """
+        return self.slot_size - self.HEADER.size
+
+    def view(self, slot: int, offset: int, length: int, sequence: int) -> memoryview:
+        """
+        Get a read-only view of a payload in the ring.
+
+        :param slot: Int, the slot index.
+        :param offset: Int, the offset of the payload in the slot.
+        :param length: Int, the length of the payload in bytes.
+        :param sequence: Int, the sequence number of the payload.
+        :return: memoryview, the payload.
+        :raises ValueError: If the descriptor is out of range, or the slot was overwritten by a later payload.
+        """
+        if (
+            not 0 <= slot < self.slot_count
+            or offset < self.HEADER.size
+            or length < 0
+            or offset + length > self.slot_size
+        ):
+            raise ValueError(f"Invalid shared memory descriptor: slot {slot}, offset {offset}, length {length}")
+        start = slot * self.slot_size
+        current = self.HEADER.unpack_from(self.buffer, start)[0]
+        if current != sequence:
+            raise ValueError(
+                f"Shared memory slot {slot} was overwritten by payload {current} before payload {sequence} was read, "
+                f"the ring of {self.slot_count} slots is too small for the payloads in flight"
+            )
+        start += offset
+        return self.buffer[start: start + length]
+
+    def begin_step(self) -> None:
+        """
+        Start a new step of the producer, which resets the number of payloads it may write.
+        """
+        self.step_writes = 0
+
+    def write(self, data: bytes):
+        """
+        Write a payload into the next slot. Used by the producer side.
+
+        :param data: Bytes-like, the payload.
+        :return: Tuple, the (slot, offset, length, sequence) descriptor of the payload.
+            None if the step budget is used up or the payload does not fit in a slot, send it inline then.
+        """
+        length = len(data)
+        if length > self.payload_size or self.step_writes >= self.step_budget:
+            return None
+        slot = self.next_slot
+        self.next_slot = (self.next_slot + 1) % self.slot_count
+        self.step_writes += 1
+        # Sequence numbers run from 1 to the int32 maximum of the descriptor, 0 marks a slot being written.
+        self.sequence = self.sequence % 0x7FFFFFFF + 1
+        start = slot * self.slot_size
+        offset = self.HEADER.size
+        # Invalidate the slot before overwriting the payload, so a reader never accepts a half-written one.
+        self.HEADER.pack_into(self.mapping, start, 0)
+        self.mapping[start + offset: start + offset + length] = data
+        self.HEADER.pack_into(self.mapping, start, self.sequence)
+        return slot, offset, length, self.sequence
+
+    def close(self):
+        """
+        Close the mapping, and remove the block if this process created it.
+        The mapping stays alive while views into it are still referenced.
+        """
+        self.buffer.release()
+        self.mapping = None
+        self.shm.close()
+        if self.created:
+            self.shm.unlink()
@@ -0,0 +1,93 @@
+import copy
+from collections import OrderedDict
+
+# The keys of `attr.data` saved by `RCareWorld.Snapshot`, and the command of the attribute that puts each back in `Restore`.
+SNAPSHOT_FIELDS = OrderedDict([
+    ("position", "SetPosition"),
+    ("quaternion", "SetRotationQuaternion"),
+    ("velocity", "SetVelocity"),
+    ("angular_velocity", "SetAngularVelocity"),
+    ("joint_positions", "SetJointPositionDirectly"),
+    ("joint_velocities", "SetJointVelocity"),
+])
+
+
+class SnapshotStore:
+    """
+    Snapshots of the object states of `RCareWorld`, see `RCareWorld.Snapshot`.
+    It keeps the `capacity` most recently taken or restored snapshots and drops the least recently used one beyond that.
+
+    :param capacity: Int, the maximum number of snapshots.
+    """
+
+    def __init__(self, capacity: int = 8):
+        if capacity < 1:
+            raise ValueError(f"Snapshot capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.snapshots = OrderedDict()
+        self.next_handle = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self.snapshots
+
+    def capture(self, attrs: dict, ids: list = None) -> int:
+        """
+        Save the state of objects from their `data`.
+
+        :param attrs: Dict, the attributes of the environment, by object ID.
+        :param ids: List, the IDs of the objects to save. None for every object.
+        :return: Int, the snapshot handle.
+        """
+        state = OrderedDict()
+        for id in attrs if ids is None else ids:
+            data = attrs[id].data
+            fields = {key: copy.deepcopy(data[key]) for key in SNAPSHOT_FIELDS if key in data}
+            if len(fields) > 0:
+                state[id] = fields
+        return self.add(state)
+
+    def add(self, state: dict) -> int:
+        """
+        Add a snapshot, dropping the least recently used one if the store is full.
+
+        :param state: Dict, the saved fields of each object, by object ID.
+        :return: Int, the snapshot handle.
+        """
+        handle = self.next_handle
+        self.next_handle += 1
+        self.snapshots[handle] = state
+        while len(self.snapshots) > self.capacity:
+            self.snapshots.popitem(last=False)
+            self.evictions += 1
+        return handle
+
+    def get(self, handle: int) -> dict:
+        """
+        Get a snapshot, which makes it the most recently used one.
+
+        :param handle: Int, the snapshot handle.
+        :return: Dict, the saved fields of each object, by object ID.
+        :raises KeyError: If there is no such snapshot, or it was dropped.
+        """
+        if handle not in self.snapshots:
+            raise KeyError(f"Snapshot {handle} does not exist or was dropped, the store keeps {self.capacity} snapshots")
+        self.snapshots.move_to_end(handle)
+        return self.snapshots[handle]
+
+    def remove(self, handle: int) -> None:
+        """
+        Remove a snapshot.
+
+        :param handle: Int, the snapshot handle.
+        """
+        self.snapshots.pop(handle, None)
+
+    def clear(self) -> None:
+        """
+        Remove every snapshot.
+        """
+        self.snapshots.clear()
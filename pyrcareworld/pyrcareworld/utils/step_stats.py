@@ -0,0 +1,165 @@
+import json
+import os
+import time
+import numpy as np
+
+
+class StepStats:
+    """
+    Instrumentation of the steps of `RCareWorld`, enabled with `RCareWorld(stats=True)` and available as `env.stats`.
+
+    Every step is split into phases, with the cumulative time of each in `phases`:
+    "send" writes the queued commands and `StepStart`, "wait" lasts until the first frame of the step is received,
+    "receive" reads the other frames, "decode" is `receive_object` and "dispatch" is `_receive_data`, which includes `parse_message`.
+    `received` and `attr_types` hold the count, bytes, decode time and dispatch time of received frames per head and,
+    for "Instance" frames, per attribute type. `sent` holds the count and bytes of sent frames per head.
+    `step_latencies` holds the duration of every `step` call.
+
+    :param events: Bool, True to also record a timeline of the phases and frames for `export_chrome_trace`.
+    :param max_events: Int, the maximum number of timeline events to keep. Later events are dropped.
+    """
+
+    def __init__(self, events: bool = False, max_events: int = 1000000):
+        self.events_enabled = events
+        self.max_events = max_events
+        self.start = time.perf_counter()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clear every counter and the timeline.
+        """
+        self.phases = {"send": 0.0, "wait": 0.0, "receive": 0.0, "decode": 0.0, "dispatch": 0.0}
+        self.received = {}
+        self.attr_types = {}
+        self.sent = {}
+        self.step_latencies = []
+        self.events = []
+
+    def add_sent(self, head: str, size: int) -> None:
+        counter = self.sent.get(head)
+        if counter is None:
+            counter = self.sent[head] = {"count": 0, "bytes": 0}
+        counter["count"] += 1
+        counter["bytes"] += size
+
+    def add_phase(self, phase: str, start: float, end: float) -> None:
+        self.phases[phase] += end - start
+        if self.events_enabled:
+            self._add_event(phase, "phase", start, end)
+
+    def add_frame(self, objs: list, size: int, start: float, received: float, decoded: float, dispatched: float, first: bool) -> None:
+        """
+        Count a received frame.
+
+        :param objs: List, the decoded frame, empty if it was dropped by a collect filter.
+        :param size: Int, the frame size in bytes.
+        :param start: Float, `time.perf_counter()` before receiving the frame.
+        :param received: Float, after receiving it.
+        :param decoded: Float, after decoding it.
+        :param dispatched: Float, after dispatching it.
+        :param first: Bool, True for the first frame of a step, whose receive time is counted as "wait".
+        """
+        self.add_phase("wait" if first else "receive", start, received)
+        self.phases["decode"] += decoded - received
+        self.phases["dispatch"] += dispatched - decoded
+        head = objs[0] if len(objs) > 0 else "(filtered)"
+        self._add_frame_counter(self.received, head, size, decoded - received, dispatched - decoded)
+        name = head
+        if head == "Instance" and len(objs) > 2:
+            name = objs[2]
+            self._add_frame_counter(self.attr_types, name, size, decoded - received, dispatched - decoded)
+        if self.events_enabled:
+            self._add_event(f"decode {name}", "decode", received, decoded, {"bytes": size})
+            if dispatched > decoded:
+                self._add_event(f"dispatch {name}", "dispatch", decoded, dispatched)
+
+    def _add_frame_counter(self, counters: dict, key: str, size: int, decode_time: float, dispatch_time: float) -> None:
+        counter = counters.get(key)
+        if counter is None:
+            counter = counters[key] = {"count": 0, "bytes": 0, "decode_time": 0.0, "dispatch_time": 0.0}
+        counter["count"] += 1
+        counter["bytes"] += size
+        counter["decode_time"] += decode_time
+        counter["dispatch_time"] += dispatch_time
+
+    def add_step(self, start: float, end: float) -> None:
+        self.step_latencies.append(end - start)
+        if self.events_enabled:
+            self._add_event("step", "step", start, end)
+
+    def _add_event(self, name: str, category: str, start: float, end: float, args: dict = None) -> None:
+        if len(self.events) >= self.max_events:
+            return
+        self.events.append((name, category, start, end, args))
+
+    def latency_percentile(self, q: float) -> float:
+        """
+        Get a percentile of the step latency.
+
+        :param q: Float, the percentile, between 0 and 100.
+        :return: Float, the latency in seconds, 0 if no step was counted.
+        """
+        if len(self.step_latencies) == 0:
+            return 0.0
+        return float(np.percentile(self.step_latencies, q))
+
+    def latency_histogram(self, bins: int = 20) -> tuple:
+        """
+        Get a histogram of the step latency.
+
+        :param bins: Int, the number of bins.
+        :return: Tuple, the counts and the bin edges in seconds, as returned by `np.histogram`.
+        """
+        return np.histogram(self.step_latencies, bins=bins)
+
+    def summary(self) -> str:
+        """
+        Format the counters as a table.
+
+        :return: Str, the table.
+        """
+        lines = [
+            f"steps: {len(self.step_latencies)}, "
+            f"p50 {self.latency_percentile(50) * 1e3:.3f}ms, p99 {self.latency_percentile(99) * 1e3:.3f}ms",
+            "phases: " + ", ".join(f"{phase} {seconds * 1e3:.1f}ms" for phase, seconds in self.phases.items()),
+            f"{'received':>24} {'count':>8} {'bytes':>12} {'decode':>10} {'dispatch':>10}",
+        ]
+        for title, counters in [("head", self.received), ("attr type", self.attr_types)]:
+            for key, counter in sorted(counters.items(), key=lambda i: -i[1]["decode_time"] - i[1]["dispatch_time"]):
+                lines.append(
+                    f"{f'{title} {key}':>24} {counter['count']:>8} {counter['bytes']:>12} "
+                    f"{counter['decode_time'] * 1e3:>8.1f}ms {counter['dispatch_time'] * 1e3:>8.1f}ms"
+                )
+        lines.append(f"{'sent':>24} {'count':>8} {'bytes':>12}")
+        for head, counter in self.sent.items():
+            lines.append(f"{f'head {head}':>24} {counter['count']:>8} {counter['bytes']:>12}")
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path: str) -> None:
+        """
+        Write the timeline as Chrome trace-event JSON, which chrome://tracing and https://ui.perfetto.dev open.
+        Needs `events=True`.
+
+        :param path: Str, the JSON file.
+        """
+        pid = os.getpid()
+        threads = {"step": 0, "phase": 1, "decode": 2, "dispatch": 2}
+        trace_events = []
+        for name, category, start, end, args in self.events:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.start) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": pid,
+                "tid": threads[category],
+            }
+            if args is not None:
+                event["args"] = args
+            trace_events.append(event)
+        for name, tid in [("step", 0), ("phases", 1), ("frames", 2)]:
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,143 @@
+import multiprocessing as mp
+import socket
+import struct
+import time
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+from pyrcareworld.utils.frame_trace import FrameTrace, TRACE_RECEIVED
+
+
+def frame_head(data) -> str:
+    """
+    Decode the head of a frame ("Env", "Instance", "StepEnd", ...) in either wire protocol version.
+
+    :param data: Bytes-like, the frame payload.
+    :return: Str, the head.
+    """
+    if data[4] == 3:
+        # Protocol version 2: the single-byte code of "string", then the string.
+        length = struct.unpack_from("<i", data, 5)[0]
+        return str(data[9: 9 + length], "utf-8")
+    length = struct.unpack_from("<i", data, 14)[0]
+    return str(data[18: 18 + length], "utf-8")
+
+
+class TraceReplayPlayer:
+    """
+    Stand-in for the Unity player that feeds the frames of a trace recorded with `RCareWorld(trace_file=...)`
+    back to a new `RCareWorld` in editor mode, at full speed.
+    The frames the player sent during each step of the recording are sent again once the new environment starts
+    that step. What the new environment sends is only read to find the start of each step, so it may call other
+    commands than the recorded session. It should be created with the same wire options (protocol version, delta
+    state, ...) as the recorded one. After the last recorded step, every step is answered with `StepEnd` alone.
+
+    Example::
+
+        player = TraceReplayPlayer("episode.trace", port=5004)
+        player.start()
+        env = RCareWorld(executable_file="@editor", port=5004)
+        for _ in range(player.count_steps()):
+            env.step()
+
+    :param path: Str, the trace file.
+    :param port: Int, the port `RCareWorld` listens on.
+    :param transport: Str, "tcp" or "unix", see `RFUniverseCommunicator`.
+    :param socket_path: Str, the Unix domain socket path. None for the default path of `port`.
+    :param connect_timeout: Float, the time in seconds to keep retrying to connect.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            port: int = 5004,
+            transport: str = "tcp",
+            socket_path: str = None,
+            connect_timeout: float = 30,
+    ):
+        self.path = path
+        self.port = port
+        self.transport = transport
+        self.socket_path = socket_path
+        self.connect_timeout = connect_timeout
+        self.process = None
+
+    def count_steps(self) -> int:
+        """
+        Count the steps in the trace, not including the `StepEnd` sent on connection.
+
+        :return: Int, the number of steps.
+        """
+        trace = FrameTrace(self.path)
+        steps = sum(1 for _, direction, frame in trace if direction == TRACE_RECEIVED and frame_head(frame) == "StepEnd")
+        trace.close()
+        return max(steps - 1, 0)
+
+    def start(self) -> mp.Process:
+        """
+        Run the player in a daemon process, so that it does not share the GIL with the code under test.
+
+        :return: multiprocessing.Process, the player process.
+        """
+        self.process = mp.Process(target=self.run, daemon=True)
+        self.process.start()
+        return self.process
+
+    def join(self, timeout: float = None) -> None:
+        """
+        Wait for the player process to exit, which it does once `RCareWorld` closes the connection.
+
+        :param timeout: Float, the time in seconds to wait, None to wait forever.
+        """
+        if self.process is not None:
+            self.process.join(timeout)
+
+    def run(self) -> None:
+        """
+        Connect to `RCareWorld` and replay the trace until the connection is closed.
+        """
+        communicator = RFUniverseCommunicator(
+            proc_type="editor", port=self.port, batch_send=True, transport=self.transport, socket_path=self.socket_path
+        )
+        communicator.client = self._connect(communicator)
+        communicator.connected = True
+        trace = FrameTrace(self.path)
+        step_end = None
+        try:
+            for _, direction, frame in trace:
+                if direction != TRACE_RECEIVED:
+                    continue
+                communicator.send_bytes(frame)
+                if frame_head(frame) == "StepEnd":
+                    step_end = bytes(frame)
+                    communicator.flush()
+                    self._wait_step_start(communicator)
+            while step_end is not None:
+                communicator.send_bytes(step_end)
+                communicator.flush()
+                self._wait_step_start(communicator)
+        except (AssertionError, ConnectionError, OSError):
+            pass
+        finally:
+            communicator.client.close()
+            trace.close()
+
+    def _wait_step_start(self, communicator: RFUniverseCommunicator) -> None:
+        while True:
+            data = communicator.receive_bytes()
+            if data is not None and len(data) > 0 and frame_head(data) == "StepStart":
+                return
+
+    def _connect(self, communicator: RFUniverseCommunicator) -> socket.socket:
+        deadline = time.time() + self.connect_timeout
+        while True:
+            try:
+                if self.transport == "unix":
+                    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    client.connect(communicator.socket_path)
+                else:
+                    client = socket.create_connection(("localhost", self.port))
+                    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return client
+            except OSError:
+                if time.time() > deadline:
+                    raise
+                time.sleep(0.05)
@@ -0,0 +1,30 @@
+import socket
+import pytest
+from pyrcareworld.utils.mock_unity_player import MockUnityPlayer
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def mock_player():
+    """
+    Start a MockUnityPlayer on a free port, e.g. `player = mock_player(controllers=2)`, then connect with
+    `RCareWorld(executable_file="@editor", port=player.port)`. The players are stopped after the test.
+    """
+    players = []
+
+    def start(**kwargs) -> MockUnityPlayer:
+        player = MockUnityPlayer(port=free_port(), **kwargs)
+        player.start()
+        players.append(player)
+        return player
+
+    yield start
+    for player in players:
+        player.join(10)
+        if player.process.is_alive():
+            player.process.kill()
@@ -0,0 +1,42 @@
+import asyncio
+import subprocess
+import sys
+import pytest
+from conftest import free_port
+from pyrcareworld.utils.async_rfuniverse_communicator import AsyncRFUniverseCommunicator
+
+# Connects, sends the first StepEnd, hands its socket to a child that keeps it open, and exits with code 3.
+CRASHING_PLAYER = """
+import socket, subprocess, sys
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+player = RFUniverseCommunicator(proc_type="editor")
+player.client = socket.create_connection(("localhost", {port}))
+player.connected = True
+player.send_object("StepEnd")
+subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)"], pass_fds=[player.client.fileno()])
+sys.exit(3)
+"""
+
+
+async def run_communicator(communicator: AsyncRFUniverseCommunicator, steps: int):
+    try:
+        await asyncio.wait_for(communicator.online(), 10)
+        for _ in range(steps):
+            await asyncio.wait_for(communicator.sync_step(), 10)
+    finally:
+        communicator.close()
+
+
+def test_player_exits_before_connecting():
+    communicator = AsyncRFUniverseCommunicator(port=free_port(), proc_type="editor")
+    communicator.player_process = subprocess.Popen([sys.executable, "-c", "import sys; sys.exit(3)"])
+    with pytest.raises(ConnectionError, match="code 3 before connecting"):
+        asyncio.run(run_communicator(communicator, 0))
+
+
+def test_player_exits_while_stepping():
+    port = free_port()
+    communicator = AsyncRFUniverseCommunicator(port=port, proc_type="editor")
+    communicator.player_process = subprocess.Popen([sys.executable, "-c", CRASHING_PLAYER.format(port=port)])
+    with pytest.raises(ConnectionError, match="code 3"):
+        asyncio.run(run_communicator(communicator, 1))
@@ -0,0 +1,55 @@
+import pytest
+from pyrcareworld.envs.base_env import RCareWorld
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "pipelined"])
+def env(request, mock_player):
+    player = mock_player(controllers=2)
+    env = RCareWorld(executable_file="@editor", port=player.port, pipelined=request.param)
+    # Filter on receive, like a player that does not advertise collect_filter.
+    env._player_collect_filter = False
+    yield env
+    env.close()
+
+
+def settle(env: RCareWorld) -> None:
+    # Step until the results of the commands sent so far are in `attrs`, pipelined steps lag one behind.
+    env.step()
+    if env.pipelined:
+        env.step()
+
+
+def test_filter_on_receive(env):
+    settle(env)
+    env.Subscribe(1000, ["joint_positions"])
+    settle(env)
+    robot, other = env.attrs[1000], env.attrs[1001]
+    robot_joints, other_joints = list(robot.data["joint_positions"]), list(other.data["joint_positions"])
+    settle(env)
+    assert list(robot.data["joint_positions"]) != robot_joints
+    assert list(other.data["joint_positions"]) == other_joints
+
+    # An object sent a command in the step is decoded whole, as its frame may be the response.
+    other.SetPosition([5.0, 0.0, 0.0])
+    settle(env)
+    assert list(other.data["position"]) == [5.0, 0.0, 0.0]
+    assert list(other.data["joint_positions"]) != other_joints
+
+    # A new object gets its first data.
+    mesh = env.LoadMesh("mesh.obj", id=10000)
+    settle(env)
+    assert "position" in mesh.data
+
+
+def test_subscribe_during_step_async(mock_player):
+    player = mock_player(controllers=2)
+    env = RCareWorld(executable_file="@editor", port=player.port)
+    try:
+        env.step_async()
+        with pytest.raises(RuntimeError):
+            env.Subscribe(1000, ["joint_positions"])
+        env.step_wait()
+        assert env.subscriptions == {}
+        assert env.communicator.collect_filter is None
+    finally:
+        env.close()
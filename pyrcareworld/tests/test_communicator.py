@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from pyrcareworld.utils.rfuniverse_communicator import RFUniverseCommunicator
+
+
+@pytest.mark.parametrize("zero_copy", [False, True])
+@pytest.mark.parametrize("frame_type", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize("size", [16, 1024])
+def test_read_array_writability(zero_copy, frame_type, size):
+    # Compressed and async frames are bytes, plain ones a bytearray and zero-copy ones a memoryview.
+    communicator = RFUniverseCommunicator(proc_type="editor", zero_copy=zero_copy, zero_copy_threshold=1024)
+    array = np.arange(size // 4, dtype=np.float32)
+    datas = bytearray()
+    communicator.write_object(datas, array)
+    frame = frame_type(datas)
+    communicator.read_offset = 0
+    result = communicator.read_object(frame)
+    np.testing.assert_array_equal(result, array)
+    # Only large arrays of zero-copy mode are read-only, everything else can be edited in place.
+    if zero_copy and size >= communicator.zero_copy_threshold:
+        assert not result.flags.writeable
+    else:
+        assert result.flags.writeable
+        result[0] = -1
+    if zero_copy and size < communicator.zero_copy_threshold:
+        assert not np.shares_memory(result, np.frombuffer(frame, dtype=np.uint8))
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.uint32, np.uint64])
+def test_typed_array_int_range(dtype):
+    communicator = RFUniverseCommunicator(proc_type="editor")
+    communicator.typed_arrays = True
+    array = np.array([0, 2 ** 31 - 1], dtype=dtype)
+    datas = bytearray()
+    communicator.write_object(datas, array)
+    communicator.read_offset = 0
+    result = communicator.read_object(datas)
+    assert result.dtype == np.int32
+    np.testing.assert_array_equal(result, array)
+    with pytest.raises(OverflowError):
+        communicator.write_object(bytearray(), np.array([2 ** 31], dtype=dtype))
+    if np.issubdtype(dtype, np.signedinteger):
+        with pytest.raises(OverflowError):
+            communicator.write_object(bytearray(), np.array([-2 ** 31 - 1], dtype=dtype))
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+from pyrcareworld.utils.frame_trace import FrameTrace, FrameTraceWriter, TRACE_RECEIVED, TRACE_SENT
+
+FRAMES = [(TRACE_SENT, b"step"), (TRACE_RECEIVED, bytes(range(200))), (TRACE_RECEIVED, b"x" * 1000)]
+
+
+def read(path: str) -> list:
+    trace = FrameTrace(path)
+    frames = [(direction, bytes(frame)) for _, direction, frame in trace]
+    trace.close()
+    return frames
+
+
+def test_write_and_append(tmp_path):
+    path = str(tmp_path / "trace.bin")
+    # A small chunk size, so that the mapping grows while recording.
+    writer = FrameTraceWriter(path, chunk_size=64)
+    for direction, data in FRAMES:
+        writer.write(direction, memoryview(data))
+    writer.close()
+    size = os.path.getsize(path)
+    assert read(path) == FRAMES
+
+    writer = FrameTraceWriter(path, chunk_size=64)
+    writer.write(TRACE_SENT, b"more")
+    writer.close()
+    assert read(path) == FRAMES + [(TRACE_SENT, b"more")]
+    assert os.path.getsize(path) == size + len(b"more") + 13
+
+
+def test_unclosed_trace(tmp_path):
+    # A process that dies while recording leaves the zero tail of the mapping after its records.
+    path = str(tmp_path / "trace.bin")
+    code = (
+        "import os\n"
+        "from pyrcareworld.utils.frame_trace import FrameTraceWriter\n"
+        f"writer = FrameTraceWriter({path!r})\n"
+        f"for direction, data in {FRAMES!r}:\n"
+        "    writer.write(direction, data)\n"
+        "os._exit(0)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=60)
+    assert os.path.getsize(path) == 64 * 1024 * 1024
+    assert read(path) == FRAMES
+
+    writer = FrameTraceWriter(path)
+    writer.write(TRACE_SENT, b"more")
+    writer.close()
+    assert read(path) == FRAMES + [(TRACE_SENT, b"more")]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+gym = pytest.importorskip("gymnasium")
+
+from pyrcareworld.envs.gym_wrapper_env import RCareWorldGymWrapper
+
+ROBOT = 1000
+
+
+class ReachEnv(RCareWorldGymWrapper):
+    # Implements the hooks of gym_step_async and gym_step_wait.
+
+    def __init__(self, port: int):
+        super().__init__(executable_file="@editor", port=port, check_version=False)
+        self.env_step()
+        self.robot = self.attrs[ROBOT]
+
+    def apply_action(self, action):
+        self.robot.SetJointPosition(action)
+
+    def get_step_result(self):
+        observation = np.array(self.robot.data["joint_positions"])
+        return observation, 0.0, False, False, {}
+
+
+class LegacyEnv(ReachEnv):
+    # Overrides step, as subclasses written before gym_step_async do.
+
+    def step(self, action):
+        self.apply_action(action)
+        self.env_step()
+        return self.get_step_result()
+
+
+def test_gym_step_async_wait(mock_player):
+    player = mock_player(controllers=1)
+    env = ReachEnv(player.port)
+    try:
+        issued = env.issued_step
+        env.gym_step_async(np.zeros(7))
+        with pytest.raises(RuntimeError):
+            env.robot.SetJointPosition(np.zeros(7))
+        observation, reward, terminated, truncated, info = env.gym_step_wait()
+        assert observation.shape == (7,)
+        assert env.observed_step == env.issued_step == issued + 1
+    finally:
+        env.close()
+
+
+def test_base_step_async_signature(mock_player):
+    player = mock_player(controllers=1)
+    env = ReachEnv(player.port)
+    try:
+        issued = env.issued_step
+        env.step_async(2)
+        assert env.step_wait() == issued + 2
+    finally:
+        env.close()
+
+
+def test_subclass_step(mock_player):
+    player = mock_player(controllers=1)
+    env = LegacyEnv(player.port)
+    try:
+        issued = env.issued_step
+        observation, _, _, _, _ = env.step(np.zeros(7))
+        assert observation.shape == (7,)
+        assert env.issued_step == issued + 1
+    finally:
+        env.close()
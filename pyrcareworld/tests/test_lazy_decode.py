@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from pyrcareworld.envs.base_env import RCareWorld
+
+SCENE = dict(controllers=2, cameras=1, image_size=(32, 32), cloths=1, particles=100, digits=1, digit_size=(24, 32))
+SUBSCRIPTIONS = {1000: ["joint_positions", "position"], 2000: ["width", "rgb"], 3000: None}
+
+
+def same(a, b) -> bool:
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(same(a[key], b[key]) for key in a)
+    if isinstance(a, (memoryview, bytes)):
+        return bytes(a) == bytes(b)
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(i, j) for i, j in zip(a, b))
+    return a == b
+
+
+@pytest.mark.parametrize("protocol_version", [1, 2])
+@pytest.mark.parametrize(
+    "options, subscribe",
+    [
+        ({}, False),
+        ({"delta_state": True}, False),
+        ({}, True),
+        ({"shared_memory": True}, False),
+        ({"shared_memory": True}, True),
+    ],
+    ids=["plain", "delta_state", "collect_filter", "shared_memory", "shared_memory_collect_filter"],
+)
+def test_lazy_matches_eager(mock_player, protocol_version, options, subscribe):
+    envs = []
+    try:
+        for lazy_decode in [False, True]:
+            player = mock_player(**SCENE)
+            env = RCareWorld(
+                executable_file="@editor", port=player.port, protocol_version=protocol_version,
+                lazy_decode=lazy_decode, **options,
+            )
+            envs.append(env)
+            if subscribe:
+                for id, fields in SUBSCRIPTIONS.items():
+                    env.Subscribe(id, fields)
+        for _ in range(3):
+            for env in envs:
+                env.step()
+            eager, lazy = envs
+            assert list(eager.attrs) == list(lazy.attrs)
+            for id in eager.attrs:
+                assert same(eager.attrs[id].data, lazy.attrs[id].data), id
+    finally:
+        for env in envs:
+            env.close()
@@ -0,0 +1,87 @@
+import pytest
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.envs.pool import RCareWorldPool
+
+ROBOT = 1000
+
+
+def make_pool(mock_player, count: int, **kwargs) -> RCareWorldPool:
+    players = [mock_player(controllers=1) for _ in range(count)]
+    envs = [RCareWorld(executable_file="@editor", port=player.port, stats=True) for player in players]
+    return RCareWorldPool(envs, **kwargs)
+
+
+@pytest.mark.parametrize("threads", [None, 0])
+def test_step_gather(mock_player, threads):
+    pool = make_pool(mock_player, 3, threads=threads)
+    try:
+        issued = [env.issued_step for env in pool]
+        pool.step(2)
+        assert [env.observed_step for env in pool] == [i + 2 for i in issued]
+        assert pool.gather(ROBOT, "joint_positions").shape == (3, 7)
+    finally:
+        pool.close()
+
+
+def test_step_records_stats(mock_player):
+    pool = make_pool(mock_player, 2)
+    try:
+        for env in pool:
+            env.stats.reset()
+        pool.step()
+        pool.step(fast_forward=True, count=4)
+        assert [len(env.stats.step_latencies) for env in pool] == [2, 2]
+    finally:
+        pool.close()
+
+
+def test_reset_without_reset_fn(mock_player):
+    pool = make_pool(mock_player, 2)
+    try:
+        issued = [env.issued_step for env in pool]
+        with pytest.raises(ValueError):
+            pool.reset()
+        assert [env.issued_step for env in pool] == issued
+    finally:
+        pool.close()
+
+
+def test_partial_reset(mock_player):
+    reset = []
+    pool = make_pool(mock_player, 3, reset_fn=reset.append)
+    try:
+        issued = [env.issued_step for env in pool]
+        pool.reset([1])
+        assert reset == [pool[1]]
+        assert [env.issued_step for env in pool] == [issued[0], issued[1] + 1, issued[2]]
+    finally:
+        pool.close()
+
+
+def test_reset_skips_synced(mock_player):
+    # A reset_fn that steps the environment itself, as `Restore` does, must not cost another step.
+    def reset_fn(env):
+        if env is pool[0]:
+            env.step(simulate=False)
+
+    pool = make_pool(mock_player, 3, reset_fn=reset_fn)
+    try:
+        issued = [env.issued_step for env in pool]
+        pool.reset()
+        assert [env.issued_step for env in pool] == [i + 1 for i in issued]
+        assert [env.observed_step for env in pool] == [env.issued_step for env in pool]
+    finally:
+        pool.close()
+
+
+def test_step_rejects_step_in_flight(mock_player):
+    pool = make_pool(mock_player, 2)
+    try:
+        pool[1].step_async()
+        with pytest.raises(RuntimeError):
+            pool.step()
+        pool[1].step_wait()
+        pool.step()
+        assert pool[0].observed_step == pool[0].issued_step
+    finally:
+        pool.close()
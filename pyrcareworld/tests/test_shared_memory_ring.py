@@ -0,0 +1,148 @@
+import os
+import subprocess
+import sys
+import pytest
+from pyrcareworld.envs.base_env import RCareWorld
+from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing
+
+
+def run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+
+
+def test_attach_in_creator_process():
+    # The attach shares the creator's resource tracker, which must still unlink the block without warnings.
+    result = run(
+        "from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing\n"
+        "ring = SharedMemoryRing(slot_count=2, slot_size=1024)\n"
+        "attached = SharedMemoryRing(ring.name, 2, 1024, create=False)\n"
+        "slot = ring.write(b'abc')\n"
+        "assert bytes(attached.view(*slot)) == b'abc'\n"
+        "attached.close()\n"
+        "ring.close()\n"
+    )
+    assert result.returncode == 0, result.stderr
+    assert "KeyError" not in result.stderr
+    assert "leaked" not in result.stderr
+
+
+def test_attach_from_other_process():
+    # A process with its own resource tracker must not unlink the block when it exits.
+    ring = SharedMemoryRing(slot_count=2, slot_size=1024)
+    try:
+        slot = ring.write(b"abc")
+        result = run(
+            "from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing\n"
+            f"attached = SharedMemoryRing({ring.name!r}, 2, 1024, create=False)\n"
+            f"assert bytes(attached.view(*{slot!r})) == b'abc'\n"
+            "attached.close()\n"
+        )
+        assert result.returncode == 0, result.stderr
+        assert os.path.exists(f"/dev/shm/{ring.name}")
+    finally:
+        ring.close()
+    assert not os.path.exists(f"/dev/shm/{ring.name}")
+
+
+def test_overwritten_slot_raises():
+    ring = SharedMemoryRing(slot_count=2, slot_size=1024)
+    try:
+        # One payload per step, so the budget does not stop the producer from wrapping around.
+        first = ring.write(b"first")
+        ring.begin_step()
+        ring.write(b"second")
+        ring.begin_step()
+        third = ring.write(b"third")
+        with pytest.raises(ValueError, match="overwritten"):
+            ring.view(*first)
+        assert bytes(ring.view(*third)) == b"third"
+    finally:
+        ring.close()
+
+
+def test_step_budget():
+    ring = SharedMemoryRing(slot_count=4, slot_size=1024)
+    try:
+        ring.step_budget = 2
+        assert ring.write(b"a") is not None
+        assert ring.write(b"b") is not None
+        assert ring.write(b"c") is None
+        assert ring.write(b"x" * 1024) is None
+        ring.begin_step()
+        assert bytes(ring.view(*ring.write(b"d"))) == b"d"
+    finally:
+        ring.close()
+
+
+def test_close_with_live_views():
+    # Views outlive the ring without a BufferError at close or at exit.
+    result = run(
+        "from pyrcareworld.utils.shared_memory_ring import SharedMemoryRing\n"
+        "import numpy as np\n"
+        "ring = SharedMemoryRing(slot_count=2, slot_size=1024)\n"
+        "view = ring.view(*ring.write(b'abc'))\n"
+        "array = np.frombuffer(view, dtype=np.uint8)\n"
+        "ring.close()\n"
+        "assert bytes(view) == b'abc'\n"
+    )
+    assert result.returncode == 0, result.stderr
+    assert "BufferError" not in result.stderr
+    assert "Exception ignored" not in result.stderr
+
+
+@pytest.mark.parametrize("pipelined", [False, True])
+def test_env_shared_memory(mock_player, pipelined):
+    player = mock_player(controllers=0, cameras=6, image_size=(32, 32))
+    env = RCareWorld(
+        executable_file="@editor", port=player.port, shared_memory=True, shared_memory_slots=4,
+        shared_memory_slot_size=32 * 32 * 3 + 8, pipelined=pipelined,
+    )
+    try:
+        for _ in range(4):
+            env.step()
+        images = [env.attrs[2000 + i].data["rgb"] for i in range(6)]
+        # Each step puts as many images in the ring as it holds, in pipelined mode half of it, and the rest inline.
+        in_ring = sum(isinstance(image, memoryview) for image in images)
+        assert in_ring == (2 if pipelined else 4)
+        assert len({bytes(image) for image in images}) == 1
+    finally:
+        env.close()
+
+
+def test_env_shared_memory_not_advertised(mock_player):
+    player = mock_player(controllers=0, cameras=1, image_size=(32, 32), shared_memory=False)
+    env = RCareWorld(executable_file="@editor", port=player.port, shared_memory=True)
+    try:
+        env.step()
+        assert env.communicator.shared_memory is None
+        assert not isinstance(env.attrs[2000].data["rgb"], memoryview)
+    finally:
+        env.close()
+
+
+@pytest.mark.parametrize("protocol_version", [1, 2])
+@pytest.mark.parametrize("mode", ["lazy_decode", "collect_filter"])
+def test_env_shared_memory_skip(mock_player, protocol_version, mode):
+    # Lazy decoding and collect filters skip over "shm" descriptors without decoding them.
+    player = mock_player(controllers=1, cameras=1, image_size=(32, 32))
+    env = RCareWorld(
+        executable_file="@editor", port=player.port, shared_memory=True, protocol_version=protocol_version,
+        lazy_decode=mode == "lazy_decode",
+    )
+    try:
+        if mode == "collect_filter":
+            env._player_collect_filter = False
+            env.Subscribe(2000, ["width"])
+            env.Subscribe(1000, ["position"])
+        # The first frame of an object is not filtered, the second one skips the image.
+        env.step()
+        camera = env.attrs[2000].data
+        assert isinstance(camera["rgb"], memoryview)
+        assert len(camera["rgb"]) == 32 * 32 * 3
+        camera.pop("width")
+        env.attrs[1000].data.pop("position")
+        env.step()
+        assert env.attrs[2000].data["width"] == 32
+        assert list(env.attrs[1000].data["position"]) == [0.0, 0.0, 0.0]
+    finally:
+        env.close()
@@ -0,0 +1,53 @@
+from functools import partial
+import numpy as np
+import pytest
+
+gym = pytest.importorskip("gymnasium")
+pytest.importorskip("stable_baselines3")
+
+from pyrcareworld.envs.gym_wrapper_env import RCareWorldGymWrapper
+from pyrcareworld.utils.proc_wrapper import SubprocVecEnv, SharedMemorySubprocVecEnv
+
+ROBOT = 1000
+
+
+class ReachTask(RCareWorldGymWrapper):
+    # One agent that sets the joint positions of the robot, stepped by the vec env through gym_step_async and gym_step_wait.
+
+    def __init__(self, port: int, proc_id: int = 0):
+        super().__init__(executable_file="@editor", port=port, proc_id=proc_id, check_version=False)
+        self.observation_space = gym.spaces.Box(-np.inf, np.inf, (1, 7), np.float32)
+        self.action_space = gym.spaces.Box(-1, 1, (7,), np.float32)
+        self.split_steps = 0
+        self.env_step()
+
+    def apply_action(self, action):
+        self.attrs[ROBOT].SetJointPosition(list(action))
+        self.split_steps += 1
+
+    def get_step_result(self):
+        observation = np.array(self.attrs[ROBOT].data["joint_positions"], dtype=np.float32).reshape(1, 7)
+        return observation, np.zeros(1), np.zeros(1, bool), np.zeros(1, bool), [{}]
+
+    def reset(self):
+        self.env_step()
+        return self.get_step_result()[0]
+
+    def step(self, action):
+        raise AssertionError("The vec env must step through gym_step_async and gym_step_wait")
+
+
+@pytest.mark.parametrize("vec_env_type", [SubprocVecEnv, SharedMemorySubprocVecEnv])
+def test_vec_env_split_step(mock_player, vec_env_type):
+    player = mock_player(controllers=1)
+    vec_env = vec_env_type([partial(ReachTask, player.port)], start_method="fork", n_agents=1)
+    try:
+        vec_env.reset()
+        for _ in range(3):
+            vec_env.step_async(np.zeros((1, 7), dtype=np.float32))
+            observation, reward, done, info = vec_env.step_wait()
+        assert np.shape(observation)[-1] == 7
+        assert not done.any()
+        assert vec_env.get_attr("split_steps") == [3]
+    finally:
+        vec_env.close()